@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+"""
+  Headless benchmarks for the custom spreadsheet columns.
+
+  Runs CustomSpreadsheetColumns and the menu bulk paths against a synthetic project
+  built on the stub hiero/PySide2 modules in benchmarks/stubs, and writes a JSON
+  report that can be compared across commits:
+
+    python benchmarks/run_benchmarks.py --items 10000 --output before.json
+    python benchmarks/run_benchmarks.py --items 10000 --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+kBenchmarksDir = os.path.dirname(os.path.abspath(__file__))
+kRepoDir = os.path.dirname(kBenchmarksDir)
+sys.path.insert(0, os.path.join(kBenchmarksDir, 'stubs'))
+sys.path.insert(0, kRepoDir)
+
+import hiero.ui
+from PySide2 import QtCore
+
+# The registered benchmarks, in run order
+gBenchmarks = []
+
+def benchmark(name):
+  """
+    Register a function(context) -> number of calls as a benchmark
+  """
+  def register(function):
+    gBenchmarks.append((name, function))
+    return function
+  return register
+
+class _Palette(object):
+
+  def highlight(self):
+    return None
+
+class _Option(object):
+
+  def __init__(self, row):
+    self.rect = QtCore.QRect(0, row*20, 300, 20)
+    self.state = 0
+    self.palette = _Palette()
+
+class _Device(object):
+
+  def devicePixelRatioF(self):
+    return 1.0
+
+class _Painter(object):
+  _device = _Device()
+
+  def device(self):
+    return self._device
+
+  def save(self):
+    pass
+
+  def restore(self):
+    pass
+
+  def setClipRect(self, rect):
+    pass
+
+  def fillRect(self, rect, brush):
+    pass
+
+  def drawPixmap(self, rect, pixmap):
+    pass
+
+# Spreadsheet rows painted per frame by the cell benchmarks
+kRowsPerFrame = 50
+
+def _runTimers(pending):
+  while pending:
+    pending.pop(0)()
+
+class Context(object):
+
+  def __init__(self, project, columnSet):
+    from benchmarks import synthetic
+    self.project = project
+    self.columnSet = columnSet
+    self.columns = hiero.ui.customColumn
+    self.items = list(synthetic.allTrackItems(project))
+    self.painter = _Painter()
+    self.options = [_Option(row) for row in range(len(self.items))]
+
+  def cells(self):
+    """
+      Yield every (row, column, item), a frame of kRowsPerFrame rows at a time. Timers
+      started while a frame is painted run between frames, as they would in Qt.
+    """
+    numColumns = self.columns.numColumns()
+    pending = []
+    singleShot = QtCore.QTimer.singleShot
+    QtCore.QTimer.singleShot = staticmethod(lambda msec, callback: pending.append(callback))
+    try:
+      for row, item in enumerate(self.items):
+        if row % kRowsPerFrame == 0:
+          _runTimers(pending)
+        for column in range(numColumns):
+          yield row, column, item
+      _runTimers(pending)
+    finally:
+      QtCore.QTimer.singleShot = staticmethod(singleShot)
+
+@benchmark('getData.cold')
+def benchGetDataCold(context):
+  context.columns.rowCache.clear()
+  calls = 0
+  getData = context.columns.getData
+  for row, column, item in context.cells():
+    getData(row, column, item)
+    calls+=1
+  return calls
+
+@benchmark('getData.warm')
+def benchGetDataWarm(context):
+  calls = 0
+  getData = context.columns.getData
+  for row, column, item in context.cells():
+    getData(row, column, item)
+    calls+=1
+  return calls
+
+@benchmark('getTooltip')
+def benchGetTooltip(context):
+  calls = 0
+  getTooltip = context.columns.getTooltip
+  for row, column, item in context.cells():
+    getTooltip(row, column, item)
+    calls+=1
+  return calls
+
+@benchmark('paintCell')
+def benchPaintCell(context):
+  calls = 0
+  paintCell = context.columns.paintCell
+  painter = context.painter
+  for row, column, item in context.cells():
+    paintCell(row, column, item, painter, context.options[row])
+    calls+=1
+  return calls
+
+@benchmark('getBackground.cold')
+def benchGetBackgroundCold(context):
+  context.columns.mediaCache.clear()
+  calls = 0
+  getBackground = context.columns.getBackground
+  for row, column, item in context.cells():
+    getBackground(row, column, item)
+    calls+=1
+  return calls
+
+@benchmark('getBackground.warm')
+def benchGetBackgroundWarm(context):
+  calls = 0
+  getBackground = context.columns.getBackground
+  for row, column, item in context.cells():
+    getBackground(row, column, item)
+    calls+=1
+  return calls
+
+@benchmark('setStatus')
+def benchSetStatus(context):
+  statuses = list(context.columnSet.gStatusTags)
+  for index, item in enumerate(context.items):
+    item.setStatus(statuses[index % len(statuses)])
+  return len(context.items)
+
+@benchmark('SetStatusMenu.bulk')
+def benchSetStatusMenu(context):
+  import spreadsheet_engine
+  menu = spreadsheet_engine.SetStatusMenu()
+  menu.unregister()
+  menu._selection = context.items
+  menu.setStatusFromMenuSelection(list(context.columnSet.gStatusTags)[0])
+  return len(context.items)
+
+@benchmark('AssignArtistMenu.bulk')
+def benchAssignArtistMenu(context):
+  import spreadsheet_engine
+  menu = spreadsheet_engine.AssignArtistMenu()
+  menu.unregister()
+  menu._selection = context.items
+  menu.setArtistFromMenuSelection(context.columnSet.gArtistList[0]['artistName'])
+  return len(context.items)
+
+def gitCommit():
+  try:
+    return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=kRepoDir).strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+def run(options):
+  from benchmarks import synthetic
+  columnSet = __import__(options.column_set)
+  project = synthetic.buildProject(items=options.items, maxTags=options.max_tags,
+                                   missingMedia=options.missing_media, tracks=options.tracks,
+                                   seed=options.seed)
+  context = Context(project, columnSet)
+  selected = options.only.split(',') if options.only else None
+
+  results = {}
+  for name, function in gBenchmarks:
+    if selected and name not in selected:
+      continue
+    timings = []
+    calls = 0
+    for repeat in range(options.repeat):
+      start = timeit.default_timer()
+      calls = function(context)
+      timings.append(timeit.default_timer()-start)
+    best = min(timings)
+    results[name] = {'calls' : calls,
+                     'seconds' : timings,
+                     'best' : best,
+                     'median' : sorted(timings)[len(timings)//2],
+                     'perCallMicroseconds' : best/calls*1e6 if calls else 0.0}
+    print '%-24s %10.4fs %10.3fus/call  (%d calls)' % (name, best, results[name]['perCallMicroseconds'], calls)
+
+  return {'meta' : {'commit' : gitCommit(),
+                    'time' : time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'python' : platform.python_version(),
+                    'columnSet' : options.column_set,
+                    'items' : options.items,
+                    'maxTags' : options.max_tags,
+                    'missingMedia' : options.missing_media,
+                    'tracks' : options.tracks,
+                    'seed' : options.seed,
+                    'repeat' : options.repeat},
+          'results' : results}
+
+def compare(report, previousPath):
+  """
+    Print the ratio of each best time to the same benchmark in a previous report
+  """
+  with open(previousPath) as f:
+    previous = json.load(f)
+  print '\nCompared with %s (commit %s):' % (previousPath, previous['meta'].get('commit'))
+  for name, result in sorted(report['results'].items()):
+    before = previous['results'].get(name)
+    if not before or not before['best']:
+      print '%-24s %10s' % (name, 'new')
+      continue
+    print '%-24s %9.2fx' % (name, result['best']/before['best'])
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Headless benchmarks for the custom spreadsheet columns.')
+  parser.add_argument('--items', type=int, default=10000, help='TrackItems in the synthetic sequence')
+  parser.add_argument('--max-tags', type=int, default=30, help='Maximum tags per TrackItem')
+  parser.add_argument('--missing-media', type=float, default=0.1, help='Fraction of clips with missing media')
+  parser.add_argument('--tracks', type=int, default=1, help='Video tracks to spread the TrackItems over')
+  parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic project')
+  parser.add_argument('--repeat', type=int, default=3, help='Runs of each benchmark, the best is reported')
+  parser.add_argument('--column-set', default='custom_spreadsheet', help='Column set module to install')
+  parser.add_argument('--only', help='Comma separated benchmark names to run')
+  parser.add_argument('--output', help='Write the JSON report to this file')
+  parser.add_argument('--compare', help='A previous JSON report to compare against')
+  options = parser.parse_args(argv)
+
+  report = run(options)
+  if options.output:
+    with open(options.output, 'w') as f:
+      json.dump(report, f, indent=2, sort_keys=True)
+  if options.compare:
+    compare(report, options.compare)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,142 @@
+# Stand-in for PySide2.QtCore
+
+class _BoundSignal(object):
+
+  def __init__(self):
+    self._slots = []
+
+  def connect(self, slot):
+    self._slots.append(slot)
+
+  def disconnect(self, slot=None):
+    if slot is None:
+      self._slots = []
+    elif slot in self._slots:
+      self._slots.remove(slot)
+
+  def emit(self, *args):
+    for slot in list(self._slots):
+      slot(*args)
+
+class Signal(object):
+  """
+    Class attribute that gives each instance its own synchronously emitted signal
+  """
+
+  def __init__(self, *types):
+    self._attribute = '_signal%d' % id(self)
+
+  def __get__(self, instance, owner):
+    if instance is None:
+      return self
+    signal = instance.__dict__.get(self._attribute)
+    if signal is None:
+      signal = instance.__dict__[self._attribute] = _BoundSignal()
+    return signal
+
+class QObject(object):
+
+  def __init__(self, parent=None):
+    self._parent = parent
+
+  def sender(self):
+    return None
+
+class QRunnable(object):
+
+  def __init__(self):
+    pass
+
+  def run(self):
+    pass
+
+class QThreadPool(object):
+  """
+    Runs every job immediately on the calling thread, so timings are deterministic
+  """
+  _globalInstance = None
+
+  @classmethod
+  def globalInstance(cls):
+    if cls._globalInstance is None:
+      cls._globalInstance = cls()
+    return cls._globalInstance
+
+  def start(self, runnable, priority=0):
+    runnable.run()
+
+  def waitForDone(self, msecs=-1):
+    return True
+
+  def clear(self):
+    pass
+
+  def setMaxThreadCount(self, count):
+    pass
+
+class QTimer(QObject):
+  """
+    Repeating timers never fire on their own; call timeout.emit() to simulate a tick
+  """
+
+  def __init__(self, parent=None):
+    QObject.__init__(self, parent)
+    self.timeout = _BoundSignal()
+    self._active = False
+    self._interval = 0
+
+  def setInterval(self, msec):
+    self._interval = msec
+
+  def start(self, msec=None):
+    self._active = True
+
+  def stop(self):
+    self._active = False
+
+  def isActive(self):
+    return self._active
+
+  @staticmethod
+  def singleShot(msec, callback):
+    callback()
+
+class QSize(object):
+
+  def __init__(self, width=0, height=0):
+    self._width = width
+    self._height = height
+
+  def width(self):
+    return self._width
+
+  def height(self):
+    return self._height
+
+class QRect(object):
+
+  def __init__(self, x=0, y=0, width=0, height=0):
+    self._x, self._y, self._width, self._height = x, y, width, height
+
+  def x(self):
+    return self._x
+
+  def y(self):
+    return self._y
+
+  def width(self):
+    return self._width
+
+  def height(self):
+    return self._height
+
+  def translate(self, dx, dy):
+    self._x+=dx
+    self._y+=dy
+
+class Qt(object):
+  AlignLeft = 0x1
+  AlignCenter = 0x84
+  WindowModal = 1
+  DisplayRole = 0
+  UserRole = 0x100
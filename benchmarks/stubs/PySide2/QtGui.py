@@ -0,0 +1,54 @@
+# Stand-in for PySide2.QtGui
+
+class QColor(object):
+
+  def __init__(self, *rgba):
+    self.rgba = rgba
+
+class QPixmap(object):
+
+  def __init__(self, width=20, height=20):
+    self._width = width
+    self._height = height
+
+  def isNull(self):
+    return False
+
+  def width(self):
+    return self._width
+
+  def height(self):
+    return self._height
+
+  def setDevicePixelRatio(self, ratio):
+    pass
+
+class QIcon(object):
+
+  def __init__(self, source=None):
+    self._source = source
+
+  def pixmap(self, width, height=None):
+    return QPixmap(width, height if height is not None else width)
+
+  def paint(self, painter, rect, alignment=0):
+    pass
+
+class QStandardItem(object):
+
+  def __init__(self, *args):
+    self.args = args
+
+class QStandardItemModel(object):
+
+  def __init__(self, parent=None):
+    self._rows = []
+
+  def appendRow(self, item):
+    self._rows.append(item)
+
+  def rowCount(self):
+    return len(self._rows)
+
+  def clear(self):
+    self._rows = []
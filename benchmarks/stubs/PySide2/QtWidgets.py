@@ -0,0 +1,253 @@
+# Stand-in for PySide2.QtWidgets. Widgets record what is added to them and draw nothing.
+from .QtCore import _BoundSignal
+
+class QApplication(object):
+
+  @staticmethod
+  def instance():
+    return None
+
+  @staticmethod
+  def processEvents():
+    pass
+
+class QStyle(object):
+  State_Selected = 0x8000
+
+class QWidget(object):
+
+  def __init__(self, *args):
+    self._visible = False
+    self._enabled = True
+
+  def setObjectName(self, name):
+    self._objectName = name
+
+  def setWindowTitle(self, title):
+    self._windowTitle = title
+
+  def setVisible(self, visible):
+    self._visible = visible
+
+  def isVisible(self):
+    return self._visible
+
+  def findChildren(self, type):
+    return []
+
+  def setEnabled(self, enabled):
+    self._enabled = enabled
+
+  def setFocus(self):
+    self._focused = True
+
+  def hasFocus(self):
+    return getattr(self, '_focused', False)
+
+  def deleteLater(self):
+    self._deleted = True
+
+class QLabel(QWidget):
+
+  def setText(self, text):
+    self._text = text
+
+  def text(self):
+    return getattr(self, '_text', '')
+
+class QVBoxLayout(object):
+
+  def __init__(self, parent=None):
+    self._widgets = []
+
+  def addWidget(self, widget):
+    self._widgets.append(widget)
+
+  def addLayout(self, layout):
+    self._widgets.append(layout)
+
+class QHBoxLayout(QVBoxLayout):
+  pass
+
+class QPushButton(QWidget):
+
+  def __init__(self, *args):
+    QWidget.__init__(self)
+    self.clicked = _BoundSignal()
+
+class QTreeWidgetItem(object):
+
+  def __init__(self, parent=None, strings=()):
+    self._strings = list(strings)
+    self._children = []
+    if parent is not None:
+      parent._addChild(self)
+
+  def _addChild(self, child):
+    self._children.append(child)
+
+  def text(self, column):
+    return self._strings[column] if column < len(self._strings) else ''
+
+  def childCount(self):
+    return len(self._children)
+
+  def child(self, index):
+    return self._children[index]
+
+  def setExpanded(self, expanded):
+    pass
+
+class QTreeWidget(QWidget):
+
+  def __init__(self, *args):
+    QWidget.__init__(self)
+    self._topLevelItems = []
+
+  def _addChild(self, child):
+    self._topLevelItems.append(child)
+
+  def setHeaderLabels(self, labels):
+    pass
+
+  def clear(self):
+    self._topLevelItems = []
+
+  def topLevelItemCount(self):
+    return len(self._topLevelItems)
+
+  def topLevelItem(self, index):
+    return self._topLevelItems[index]
+
+class QLineEdit(QWidget):
+
+  def __init__(self, *args):
+    QWidget.__init__(self)
+    self.textChanged = _BoundSignal()
+    self._text = ''
+
+  def text(self):
+    return self._text
+
+  def setText(self, text):
+    self._text = text
+    self.textChanged.emit(text)
+
+  def setPlaceholderText(self, text):
+    self._placeholderText = text
+
+  def placeholderText(self):
+    return getattr(self, '_placeholderText', '')
+
+class QComboBox(QWidget):
+
+  def __init__(self, *args):
+    QWidget.__init__(self)
+    self.currentIndexChanged = _BoundSignal()
+    self._model = None
+    self._items = []
+
+  def addItem(self, *args):
+    self._items.append(args)
+
+  def setModel(self, model):
+    self._model = model
+
+  def model(self):
+    return self._model
+
+class QAction(object):
+
+  def __init__(self, text='', parent=None):
+    self._text = text
+    self._visible = True
+    self.triggered = _BoundSignal()
+
+  def text(self):
+    return self._text
+
+  def setIcon(self, icon):
+    pass
+
+  def setVisible(self, visible):
+    self._visible = visible
+
+  def isVisible(self):
+    return self._visible
+
+  def deleteLater(self):
+    self._deleted = True
+
+class QWidgetAction(QAction):
+
+  def setDefaultWidget(self, widget):
+    self._widget = widget
+
+class QMenu(QWidget):
+
+  def __init__(self, title='', parent=None):
+    QWidget.__init__(self)
+    self._title = title
+    self._actions = []
+    self._menuAction = QAction(title)
+    self.aboutToShow = _BoundSignal()
+
+  def title(self):
+    return self._title
+
+  def addAction(self, action):
+    self._actions.append(action)
+    return action
+
+  def addMenu(self, menu):
+    if isinstance(menu, basestring):
+      menu = QMenu(menu, self)
+    self._actions.append(menu)
+    return menu
+
+  def addSeparator(self):
+    pass
+
+  def removeAction(self, action):
+    if action in self._actions:
+      self._actions.remove(action)
+    elif isinstance(action, QAction):
+      self._actions = [a for a in self._actions if not (isinstance(a, QMenu) and a._menuAction is action)]
+
+  def menuAction(self):
+    return self._menuAction
+
+  def actions(self):
+    return list(self._actions)
+
+  def clear(self):
+    self._actions = []
+
+class QAbstractItemView(QWidget):
+
+  def __init__(self, *args):
+    QWidget.__init__(self)
+    self._model = None
+    self.updatedIndexes = []
+
+  def model(self):
+    return self._model
+
+  def setModel(self, model):
+    self._model = model
+
+  def viewport(self):
+    return self
+
+  def update(self, index=None):
+    if index is not None:
+      self.updatedIndexes.append(index)
+
+class QFileDialog(object):
+  pass
+
+class QMessageBox(object):
+  Information = 1
+
+class QProgressDialog(QWidget):
+  pass
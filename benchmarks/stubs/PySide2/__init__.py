@@ -0,0 +1,2 @@
+# Minimal stand-in for PySide2, for running the benchmarks headless. Widgets and painting
+# are inert, signals are called synchronously and the thread pool runs jobs immediately.
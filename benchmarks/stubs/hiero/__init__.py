@@ -0,0 +1 @@
+# Minimal stand-in for Nuke Studio's hiero package, for running the benchmarks headless.
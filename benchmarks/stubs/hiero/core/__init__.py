@@ -0,0 +1,248 @@
+# Stand-in for hiero.core with just enough of the Project/Sequence/Track/TrackItem/Tag
+# API for the custom spreadsheet columns. Everything is plain Python, so timings measure
+# the column code rather than Hiero's C++ bindings.
+import contextlib
+import itertools
+import os
+
+from . import events
+
+_guids = itertools.count()
+
+def _guid(prefix):
+  return '%s-%d' % (prefix, next(_guids))
+
+# Every Project made, as hiero.core.projects() returns the open ones
+_projects = []
+
+def projects():
+  return list(_projects)
+
+class Metadata(object):
+
+  def __init__(self):
+    self._values = {}
+
+  def hasKey(self, key):
+    return key in self._values
+
+  def value(self, key):
+    return self._values[key]
+
+  def setValue(self, key, value):
+    self._values[key] = value
+
+  def keys(self):
+    return list(self._values)
+
+class Tag(object):
+
+  def __init__(self, name, icon='icons:Tag.png'):
+    self._name = name
+    self._icon = icon
+    self._note = ''
+    self._metadata = Metadata()
+    self._guid = _guid('tag')
+
+  def name(self):
+    return self._name
+
+  def note(self):
+    return self._note
+
+  def setNote(self, note):
+    self._note = note
+
+  def icon(self):
+    return self._icon
+
+  def setIcon(self, icon):
+    self._icon = icon
+
+  def metadata(self):
+    return self._metadata
+
+  def guid(self):
+    return self._guid
+
+class MediaFileInfo(object):
+
+  def __init__(self, filename, startFrame=1001, endFrame=1100):
+    self._filename = filename
+    self._startFrame = startFrame
+    self._endFrame = endFrame
+
+  def filename(self):
+    return self._filename
+
+  def startFrame(self):
+    return self._startFrame
+
+  def endFrame(self):
+    return self._endFrame
+
+class MediaSource(object):
+
+  def __init__(self, fileinfos):
+    self._fileinfos = fileinfos
+
+  def fileinfos(self):
+    return list(self._fileinfos)
+
+  def isMediaPresent(self):
+    return all(os.path.exists(info.filename()) for info in self._fileinfos)
+
+class Clip(object):
+
+  def __init__(self, name, fileinfos):
+    self._name = name
+    self._mediaSource = MediaSource(fileinfos)
+    self._guid = _guid('clip')
+
+  def name(self):
+    return self._name
+
+  def mediaSource(self):
+    return self._mediaSource
+
+  def guid(self):
+    return self._guid
+
+class Project(object):
+
+  def __init__(self, name='Project', path=''):
+    self._name = name
+    self._path = path
+    self._sequences = []
+    self.undoBlocks = 0
+    _projects.append(self)
+
+  def name(self):
+    return self._name
+
+  def path(self):
+    return self._path
+
+  def sequences(self):
+    return list(self._sequences)
+
+  def close(self):
+    pass
+
+  def addSequence(self, sequence):
+    self._sequences.append(sequence)
+    sequence._project = self
+
+  @contextlib.contextmanager
+  def beginUndo(self, name):
+    self.undoBlocks+=1
+    yield
+
+class Sequence(object):
+
+  def __init__(self, name='Sequence', project=None):
+    self._name = name
+    self._videoTracks = []
+    self._audioTracks = []
+    self._guid = _guid('sequence')
+    self.editFinishedCount = 0
+    self._project = None
+    if project is not None:
+      project.addSequence(self)
+
+  def name(self):
+    return self._name
+
+  def guid(self):
+    return self._guid
+
+  def project(self):
+    return self._project
+
+  def videoTracks(self):
+    return list(self._videoTracks)
+
+  def audioTracks(self):
+    return list(self._audioTracks)
+
+  def addTrack(self, track):
+    if isinstance(track, AudioTrack):
+      self._audioTracks.append(track)
+    else:
+      self._videoTracks.append(track)
+    track._sequence = self
+
+  def editFinished(self):
+    self.editFinishedCount+=1
+
+class VideoTrack(object):
+
+  def __init__(self, name='Video 1'):
+    self._name = name
+    self._items = []
+    self._sequence = None
+    self._guid = _guid('track')
+
+  def name(self):
+    return self._name
+
+  def guid(self):
+    return self._guid
+
+  def items(self):
+    return list(self._items)
+
+  def addItem(self, item):
+    item._timelineIn = sum(other._duration for other in self._items)
+    self._items.append(item)
+    item._track = self
+
+  def parent(self):
+    return self._sequence
+
+class AudioTrack(VideoTrack):
+  pass
+
+class TrackItem(object):
+
+  def __init__(self, name, source):
+    self._name = name
+    self._source = source
+    self._tags = []
+    self._track = None
+    self._guid = _guid('trackitem')
+    self._timelineIn = 0
+    self._duration = 100
+
+  def name(self):
+    return self._name
+
+  def timelineIn(self):
+    return self._timelineIn
+
+  def timelineOut(self):
+    return self._timelineIn+self._duration-1
+
+  def guid(self):
+    return self._guid
+
+  def source(self):
+    return self._source
+
+  def parent(self):
+    return self._track
+
+  def sequence(self):
+    return self._track._sequence
+
+  def project(self):
+    return self.sequence().project()
+
+  def tags(self):
+    return list(self._tags)
+
+  def addTag(self, tag):
+    self._tags.append(tag)
+
+  def removeTag(self, tag):
+    self._tags.remove(tag)
@@ -0,0 +1,22 @@
+# Stand-in for hiero.core.events: handlers are recorded, and can be raised with sendEvent().
+
+class EventType(object):
+  kAfterProjectLoad = 'kAfterProjectLoad'
+  kBeforeProjectClose = 'kBeforeProjectClose'
+  kShutdown = 'kShutdown'
+  kContextChanged = 'kContextChanged'
+  kSelectionChanged = 'kSelectionChanged'
+
+_handlers = {}
+
+def registerInterest(eventType, handler):
+  _handlers.setdefault(eventType, []).append(handler)
+
+def unregisterInterest(eventType, handler):
+  handlers = _handlers.get(eventType, [])
+  if handler in handlers:
+    handlers.remove(handler)
+
+def sendEvent(eventType, event=None):
+  for handler in list(_handlers.get(eventType, [])):
+    handler(event)
@@ -0,0 +1,59 @@
+# Stand-in for hiero.ui. There are no windows, so refreshing the views is a no-op.
+
+customColumn = None
+
+_activeView = None
+
+def activeView():
+  return _activeView
+
+def setActiveView(view):
+  global _activeView
+  _activeView = view
+
+def activeSequence():
+  if _activeView is not None and hasattr(_activeView, 'sequence'):
+    return _activeView.sequence()
+  return None
+
+class TimelineEditor(object):
+
+  def __init__(self, sequence):
+    self._sequence = sequence
+    self._selection = []
+
+  def sequence(self):
+    return self._sequence
+
+  def selection(self):
+    return list(self._selection)
+
+  def setSelection(self, items):
+    self._selection = list(items)
+
+_timelineEditors = {}
+
+def getTimelineEditor(sequence):
+  editor = _timelineEditors.get(sequence.guid())
+  if editor is None:
+    editor = _timelineEditors[sequence.guid()] = TimelineEditor(sequence)
+  return editor
+
+def findMenuAction(name):
+  return None
+
+class WindowManager(object):
+
+  def __init__(self):
+    self._windows = []
+
+  def addWindow(self, window):
+    self._windows.append(window)
+
+  def windows(self):
+    return list(self._windows)
+
+_windowManager = WindowManager()
+
+def windowManager():
+  return _windowManager
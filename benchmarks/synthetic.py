@@ -0,0 +1,87 @@
+# Builds synthetic projects on the stub hiero.core for the benchmarks: thousands of
+# TrackItems with a random mix of plain, note, Status and Artist tags, and some missing media.
+import os
+import random
+import tempfile
+
+import hiero.core
+
+from spreadsheet_engine import config
+
+kTagNames = ('Approved', 'Retime', 'Roto', 'Paint', 'Comp', 'CG', 'Client Note', 'Hold', 'Final')
+kTagIcons = ('icons:TagGood.png', 'icons:TagBad.png', 'icons:TagNote.png', 'icons:TagComment.png')
+kNoteWords = ('roto', 'retime', 'paint out', 'rig removal', 'grade', 'match move', 'cleanup', 'sky replacement')
+
+def _mediaRoot():
+  root = os.path.join(tempfile.gettempdir(), 'custom_spreadsheet_benchmarks')
+  if not os.path.isdir(root):
+    os.makedirs(root)
+  present = os.path.join(root, 'present.1001.exr')
+  if not os.path.exists(present):
+    open(present, 'w').close()
+  return root
+
+def statusTag(status):
+  tag = hiero.core.Tag('Status', config.statusIcon(status))
+  tag.metadata().setValue('tag.status', status)
+  return tag
+
+def artistTag(artist):
+  tag = hiero.core.Tag('Artist', artist['artistIcon'])
+  tag.metadata().setValue('tag.artistID', str(artist['artistID']))
+  tag.metadata().setValue('tag.artistName', str(artist['artistName']))
+  tag.metadata().setValue('tag.artistDepartment', str(artist['artistDepartment']))
+  return tag
+
+def randomTags(rng, maxTags):
+  """
+    Return up to maxTags tags: mostly plain and note tags, with at most one Status and one Artist tag
+  """
+  tags = []
+  statuses = list(config.gStatusTags)
+  artists = list(config.gArtistList)
+  for index in range(rng.randint(0, maxTags)):
+    kind = rng.random()
+    if kind < 0.1 and statuses:
+      tags.append(statusTag(rng.choice(statuses)))
+      statuses = []
+    elif kind < 0.2 and artists:
+      tags.append(artistTag(rng.choice(artists)))
+      artists = []
+    else:
+      tag = hiero.core.Tag(rng.choice(kTagNames), rng.choice(kTagIcons))
+      if kind < 0.5:
+        tag.setNote('%s shot %d' % (rng.choice(kNoteWords), index))
+      tags.append(tag)
+  return tags
+
+def buildProject(items=10000, maxTags=30, missingMedia=0.1, tracks=1, sequences=1, seed=1):
+  """
+    Return a stub hiero.core.Project with the given number of TrackItems per sequence,
+    spread over the given number of video tracks
+  """
+  rng = random.Random(seed)
+  root = _mediaRoot()
+  project = hiero.core.Project('Benchmark')
+  for sequenceIndex in range(sequences):
+    sequence = hiero.core.Sequence('Sequence %d' % (sequenceIndex+1), project)
+    trackList = [hiero.core.VideoTrack('Video %d' % (index+1)) for index in range(tracks)]
+    for track in trackList:
+      sequence.addTrack(track)
+    for index in range(items):
+      if rng.random() < missingMedia:
+        filename = os.path.join(root, 'missing', 'shot%05d.%%04d.exr' % index)
+      else:
+        filename = os.path.join(root, 'present.%04d.exr')
+      clip = hiero.core.Clip('shot%05d' % index, [hiero.core.MediaFileInfo(filename)])
+      item = hiero.core.TrackItem('sh%05d' % (index*10), clip)
+      trackList[index % tracks].addItem(item)
+      for tag in randomTags(rng, maxTags):
+        item.addTag(tag)
+  return project
+
+def allTrackItems(project):
+  for sequence in project.sequences():
+    for track in sequence.videoTracks():
+      for item in track.items():
+        yield item
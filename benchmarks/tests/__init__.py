@@ -0,0 +1,37 @@
+# Behaviour tests of the spreadsheet engine, run on the same stub hiero/PySide2 modules
+# as the benchmarks:
+#
+#   python -m unittest discover -s benchmarks/tests -t .
+import os
+import sys
+
+kTestsDir = os.path.dirname(os.path.abspath(__file__))
+kBenchmarksDir = os.path.dirname(kTestsDir)
+sys.path.insert(0, os.path.join(kBenchmarksDir, 'stubs'))
+sys.path.insert(0, os.path.dirname(kBenchmarksDir))
+
+import hiero.core
+
+from spreadsheet_engine import (ArtistRegistry, config)
+
+# The Bid list and Artist roster the tests work from
+kBids = ['$100', '$500', '$1000', 'TBD']
+kArtists = [{'artistName':'John Smith', 'artistIcon':'icons:TagActor.png', 'artistDepartment':'3D', 'artistID':0},
+            {'artistName':'Claude Monet', 'artistIcon':'icons:TagActor.png', 'artistDepartment':'Comp', 'artistID':3}]
+
+def configure():
+  config.configure(kBids, ArtistRegistry(kArtists))
+
+def buildSequence(shotNames, project=None, name='Sequence 1'):
+  """
+    Return a stub Sequence with one video track holding a TrackItem per shot name
+  """
+  if project is None:
+    project = hiero.core.Project('Test')
+  sequence = hiero.core.Sequence(name, project)
+  track = hiero.core.VideoTrack('Video 1')
+  sequence.addTrack(track)
+  for shotName in shotNames:
+    clip = hiero.core.Clip(shotName, [hiero.core.MediaFileInfo('/missing/%s.%%04d.exr' % shotName)])
+    track.addItem(hiero.core.TrackItem(shotName, clip))
+  return sequence
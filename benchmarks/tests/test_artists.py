@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from benchmarks.synthetic import artistTag
+from benchmarks.tests import (buildSequence, kArtists)
+
+from spreadsheet_engine import (ArtistRegistry, RowCache, config)
+from spreadsheet_engine.artists import readRoster
+
+class RosterFileTest(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.path = os.path.join(self.directory, 'artists.json')
+    self.mtime = 1000000000
+    self.write(kArtists)
+    self.changes = []
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def write(self, artists, text=None):
+    with open(self.path, 'wb') as f:
+      f.write(text if text is not None else json.dumps({'artists':artists}))
+    # A new modification time, however quickly the file is rewritten
+    self.mtime+=10
+    os.utime(self.path, (self.mtime, self.mtime))
+
+  def open(self):
+    artistList = ArtistRegistry.fromFile(self.path)
+    self.assertEqual(artistList.names(), ['John Smith', 'Claude Monet'])
+    artistList.addListener(self.changes.append)
+    return artistList
+
+  def testReloadKeepsUnchangedRecords(self):
+    artistList = self.open()
+    kept = artistList.fromID(0)
+    moved = [dict(artist, artistDepartment='Lighting') if artist['artistID'] == 3 else artist for artist in kArtists]
+    self.write(moved+[{'artistName':'Frida Kahlo', 'artistIcon':'icons:TagActor.png', 'artistDepartment':'Comp',
+                       'artistID':5}])
+    artistList.checkForChanges()
+    self.assertEqual(self.changes[-1], set([3, 5]))
+    self.assertIs(artistList.fromID(0), kept)
+    self.assertEqual(artistList.fromID('3')['artistDepartment'], 'Lighting')
+
+    self.write(kArtists[:1])
+    artistList.checkForChanges()
+    self.assertEqual(self.changes[-1], set([3, 5]))
+    self.assertEqual(artistList.names(), ['John Smith'])
+
+  def testUnreadableFileKeepsTheRoster(self):
+    artistList = self.open()
+    version = artistList.version
+    # Caught mid-write
+    self.write(None, text='{"artists": [{"artistName"')
+    artistList.checkForChanges()
+    self.assertEqual(artistList.names(), ['John Smith', 'Claude Monet'])
+    self.assertEqual(artistList.version, version)
+    self.assertEqual(self.changes, [])
+
+  def testSQLiteRoster(self):
+    path = os.path.join(self.directory, 'artists.db')
+    connection = sqlite3.connect(path)
+    try:
+      with connection:
+        connection.execute('CREATE TABLE artists (artistName TEXT, artistIcon TEXT, artistDepartment TEXT, '
+                           'artistID INTEGER)')
+        connection.executemany('INSERT INTO artists VALUES (?, ?, ?, ?)',
+                               [(a['artistName'], a['artistIcon'], a['artistDepartment'], a['artistID'])
+                                for a in kArtists])
+    finally:
+      connection.close()
+    self.assertEqual([artist.asDict() for artist in readRoster(path)], kArtists)
+
+class InvalidateArtistsTest(unittest.TestCase):
+
+  def testOnlyTheChangedArtistsRows(self):
+    config.configure(['$100'], ArtistRegistry(kArtists))
+    items = buildSequence(['sh010', 'sh020', 'sh030']).videoTracks()[0].items()
+    items[0].addTag(artistTag(config.gArtistList.fromID(0)))
+    items[1].addTag(artistTag(config.gArtistList.fromID(3)))
+    rowCache = RowCache()
+    changed = []
+    rowCache.addListener(changed.append)
+    rows = [rowCache.row(item) for item in items]
+    rowCache.invalidateArtists(set([3]))
+    self.assertEqual(changed, [items[1]])
+    self.assertIs(rowCache.cached(items[0]), rows[0])
+    self.assertIsNone(rowCache.cached(items[1]))
+    self.assertIs(rowCache.cached(items[2]), rows[2])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from benchmarks.synthetic import artistTag
+from benchmarks.tests import (buildSequence, configure, kArtists)
+
+import hiero.core
+
+from spreadsheet_engine import (ArtistRegistry, config, gRowCache)
+from spreadsheet_engine.artisttags import propagateRoster
+from spreadsheet_engine.startup import _rosterChanged
+
+def movedRoster(department):
+  # kArtists with Claude Monet (ID 3) moved to another department
+  return [dict(artist, artistDepartment=department) if artist['artistID'] == 3 else artist for artist in kArtists]
+
+class PropagateRosterTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.project = hiero.core.Project('Test')
+    self.items = buildSequence(['sh010', 'sh020', 'sh030'], self.project).videoTracks()[0].items()
+    self.items[0].addTag(artistTag(config.gArtistList.fromID(3)))
+    self.items[1].addTag(artistTag(config.gArtistList.fromID(0)))
+    # An Artist no longer in the roster
+    self.items[2].addTag(artistTag({'artistName':'Frida Kahlo', 'artistIcon':'icons:TagActor.png',
+                                    'artistDepartment':'Comp', 'artistID':5}))
+
+  def department(self, item):
+    return item.tagSummary(cached=False).artistTag.metadata().value('tag.artistDepartment')
+
+  def testRewritesStaleTags(self):
+    self.assertEqual(gRowCache.row(self.items[0]).department, 'Comp')
+    artistList = ArtistRegistry(movedRoster('Lighting'))
+    self.assertEqual(propagateRoster(self.project, artistList), 1)
+    self.assertEqual(self.project.undoBlocks, 1)
+    self.assertEqual(self.department(self.items[0]), 'Lighting')
+    self.assertEqual(gRowCache.row(self.items[0]).department, 'Lighting')
+    self.assertEqual(self.department(self.items[2]), 'Comp')
+    # Nothing left to do the second time
+    self.assertEqual(propagateRoster(self.project, artistList), 0)
+    self.assertEqual(self.project.undoBlocks, 1)
+
+  def testOnlyTheGivenArtists(self):
+    artistList = ArtistRegistry(movedRoster('Lighting'))
+    self.assertEqual(propagateRoster(self.project, artistList, artistIDs=set([0])), 0)
+    self.assertEqual(self.department(self.items[0]), 'Comp')
+
+  def testRosterReload(self):
+    config.gArtistList.addListener(_rosterChanged)
+    try:
+      self.assertEqual(gRowCache.row(self.items[0]).department, 'Comp')
+      config.gArtistList.reload(movedRoster('Lighting'))
+    finally:
+      config.gArtistList.removeListener(_rosterChanged)
+    self.assertEqual(self.department(self.items[0]), 'Lighting')
+    self.assertEqual(gRowCache.row(self.items[0]).department, 'Lighting')
+
+if __name__ == '__main__':
+  unittest.main()
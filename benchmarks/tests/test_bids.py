@@ -0,0 +1,54 @@
+import unittest
+
+from benchmarks.tests import configure
+
+from spreadsheet_engine import (ArtistRegistry, BidRegistry, bidValue, config)
+from spreadsheet_engine.bids import kDefaultStatusIcon
+
+class BidRegistryTest(unittest.TestCase):
+
+  def testNumericOrder(self):
+    registry = BidRegistry(['TBD', '$1,200', '$300', 'Hold', '$50'])
+    self.assertEqual(list(registry), ['$50', '$300', '$1,200', 'TBD', 'Hold'])
+    self.assertEqual([registry.index(status) for status in registry], [0, 1, 2, 3, 4])
+    self.assertEqual(registry.value('$1,200'), 1200)
+    self.assertEqual(registry.value('TBD'), None)
+
+  def testAddAndRemoveKeepOrder(self):
+    registry = BidRegistry({'$500':'icons:a.png', '$100':'icons:b.png'})
+    version = registry.version
+    registry.add('$250')
+    registry['$1000'] = 'icons:c.png'
+    self.assertEqual(list(registry), ['$100', '$250', '$500', '$1000'])
+    self.assertTrue(registry.version > version)
+    registry.remove('$250')
+    self.assertEqual(list(registry), ['$100', '$500', '$1000'])
+    self.assertEqual(registry['$1000'], 'icons:c.png')
+    self.assertEqual(registry.icon('$5'), kDefaultStatusIcon)
+    self.assertEqual(registry.index('$5'), None)
+
+  def testBidValue(self):
+    self.assertEqual(bidValue('$1,350'), 1350)
+    self.assertEqual(bidValue(' 99.5 '), 99)
+    for status in ('', None, 'TBD', 'inf', '1e400', 'nan'):
+      self.assertEqual(bidValue(status), None)
+
+class ConfigureTest(unittest.TestCase):
+
+  def tearDown(self):
+    configure()
+
+  def testSharesTheRegistry(self):
+    # As custom_spreadsheet.py does, then overridden as its comment describes
+    statusTags = BidRegistry({'$100':'icons:a.png'})
+    config.configure(statusTags, ArtistRegistry([]))
+    statusTags['For Client'] = 'forClient.png'
+    self.assertIs(config.gStatusTags, statusTags)
+    self.assertEqual(config.statusIcon('For Client'), 'forClient.png')
+
+  def testWrapsDictionaries(self):
+    config.configure({'$200':'icons:a.png', '$1000':'icons:b.png'}, ArtistRegistry([]))
+    self.assertEqual(list(config.gStatusTags), ['$200', '$1000'])
+
+if __name__ == '__main__':
+  unittest.main()
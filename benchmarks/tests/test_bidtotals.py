@@ -0,0 +1,69 @@
+import unittest
+
+from benchmarks.synthetic import (artistTag, statusTag)
+from benchmarks.tests import (buildSequence, configure)
+
+import hiero.core
+
+from spreadsheet_engine import (BidTotals, config)
+from spreadsheet_engine.bidtotals import kUnassigned
+
+class BidTotalsTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.sequence = buildSequence(['sh010', 'sh020', 'sh030'])
+    self.track = self.sequence.videoTracks()[0]
+    self.items = self.track.items()
+    self.items[0].addTag(statusTag('$500'))
+    self.items[1].addTag(statusTag('$1000'))
+    self.items[1].addTag(artistTag(config.gArtistList.fromID(3)))
+    self.bidTotals = BidTotals()
+
+  def summary(self):
+    totals = self.bidTotals.totals(self.sequence)
+    return (totals.total, totals.bidShots, totals.shots,
+            dict((name, breakdown.total) for name, breakdown in totals.byDepartment.items()))
+
+  def delete(self, item):
+    # As on the timeline, which changes no tags
+    self.track._items.remove(item)
+    item._track = None
+
+  def testTotals(self):
+    self.assertEqual(self.summary(), (1500, 2, 3, {'Comp':1000, kUnassigned:500}))
+
+  def testTagChanges(self):
+    self.summary()
+    self.items[2].setStatus('$100')
+    self.items[0].setStatus('TBD')
+    self.assertEqual(self.summary(), (1100, 2, 3, {'Comp':1000, kUnassigned:100}))
+
+  def testDeletedShots(self):
+    self.summary()
+    self.delete(self.items[1])
+    self.assertEqual(self.summary(), (500, 1, 2, {kUnassigned:500}))
+    # Deleted after its tags changed
+    self.items[0].setStatus('$100')
+    self.delete(self.items[0])
+    self.assertEqual(self.summary(), (0, 0, 1, {kUnassigned:0}))
+
+  def testSplitShots(self):
+    self.summary()
+    # A razor cut leaves the original shot and adds one carrying copies of its tags
+    added = hiero.core.TrackItem('sh010_b', self.items[0].source())
+    added.addTag(statusTag('$500'))
+    self.track.addItem(added)
+    self.assertEqual(self.summary(), (2000, 3, 4, {'Comp':1000, kUnassigned:1000}))
+
+  def testAudioShotsAreNotCounted(self):
+    self.summary()
+    audio = hiero.core.AudioTrack('Audio 1')
+    self.sequence.addTrack(audio)
+    item = hiero.core.TrackItem('sh010_audio', self.items[0].source())
+    audio.addItem(item)
+    item.setStatus('$1000')
+    self.assertEqual(self.summary(), (1500, 2, 3, {'Comp':1000, kUnassigned:500}))
+
+if __name__ == '__main__':
+  unittest.main()
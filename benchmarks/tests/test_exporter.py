@@ -0,0 +1,77 @@
+import csv
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from collections import OrderedDict
+
+from benchmarks.synthetic import (artistTag, statusTag)
+from benchmarks.tests import (buildSequence, configure)
+
+import hiero.core
+
+from spreadsheet_engine import (ColumnRegistry, config, exportProject, exportRows, gRowCache)
+from spreadsheet_engine.columns import (ArtistColumn, BidColumn, DepartmentColumn)
+
+class ExportProjectTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    gRowCache.clear()
+    self.directory = tempfile.mkdtemp()
+    self.project = hiero.core.Project('Test')
+    items = buildSequence(['sh010', 'sh020'], self.project).videoTracks()[0].items()
+    buildSequence(['sh030'], self.project, name='Sequence 2')
+    items[0].addTag(statusTag('$500'))
+    items[1].addTag(artistTag(config.gArtistList.fromID(3)))
+    self.columns = ColumnRegistry([BidColumn(), ArtistColumn(), DepartmentColumn()])
+    self.expected = [['Sequence 1', 'Video 1', 'sh010', '$500', '--', '--'],
+                     ['Sequence 1', 'Video 1', 'sh020', '--', 'Claude Monet', 'Comp'],
+                     ['Sequence 2', 'Video 1', 'sh030', '--', '--', '--']]
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def export(self, name, progress=None):
+    path = os.path.join(self.directory, name)
+    return path, exportProject(self.project, path, self.columns, progress)
+
+  def testExportRows(self):
+    rows = list(exportRows(self.project, self.columns))
+    self.assertEqual(list(rows[0]), ['Sequence', 'Track', 'Shot', 'Bid', 'Artist', 'Department'])
+    self.assertEqual([list(row.values()) for row in rows], self.expected)
+    # Exporting reads the tags without filling the row cache
+    self.assertEqual(gRowCache.stats()['size'], 0)
+
+  def testFormats(self):
+    path, written = self.export('shots.csv')
+    self.assertEqual(written, 3)
+    with open(path, 'rb') as f:
+      self.assertEqual(list(csv.reader(f))[1:], self.expected)
+
+    path, written = self.export('shots.jsonl')
+    with open(path) as f:
+      self.assertEqual([list(json.loads(line, object_pairs_hook=OrderedDict).values()) for line in f], self.expected)
+
+    path, written = self.export('shots.db')
+    connection = sqlite3.connect(path)
+    try:
+      self.assertEqual([list(row) for row in connection.execute('SELECT * FROM shots')], self.expected)
+    finally:
+      connection.close()
+
+    self.assertRaises(ValueError, self.export, 'shots.xls')
+
+  def testProgressCanCancel(self):
+    calls = []
+    def progress(sequencesDone, sequenceCount, rowsWritten):
+      calls.append((sequencesDone, sequenceCount, rowsWritten))
+      return False
+    path, written = self.export('shots.csv', progress)
+    self.assertEqual(written, 2)
+    self.assertEqual(calls, [(1, 2, 2)])
+
+if __name__ == '__main__':
+  unittest.main()
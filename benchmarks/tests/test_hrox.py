@@ -0,0 +1,80 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from spreadsheet_engine import (ArtistRegistry, hroxRows, iterHroxTrackItems)
+
+kProject = '''<?xml version="1.0" encoding="UTF-8"?>
+<Project name="Test">
+  <Sequence name="Seq A">
+    <VideoTrack name="Video 1">
+      <TrackItem name="sh010" guid="item-1">
+        <Tag name="Status" icon="icons:status/TagReadyToStart.png" guid="tag-1">
+          <Set title="tag"><Value name="status" value="$500"/></Set>
+        </Tag>
+        <Tag name="Artist" icon="icons:TagActor.png" guid="tag-2">
+          <Set domainroot="tag">
+            <Value name="artistID" value="3"/>
+            <Value name="tag.artistName" value="Claude Monet"/>
+            <Value name="artistDepartment" value="Lighting"/>
+          </Set>
+        </Tag>
+        <Tag name="Retime" icon="icons:TagNote.png" note="speed ramp" guid="tag-3"/>
+        <TrackItem name="linked" guid="item-linked"/>
+      </TrackItem>
+      <TrackItem name="sh020" guid="item-2"/>
+    </VideoTrack>
+    <AudioTrack name="Audio 1">
+      <TrackItem name="dialogue" guid="item-3">
+        <Tag name="Note" guid="tag-4"><Set title="tag"><Value name="note" value="levels"/></Set></Tag>
+      </TrackItem>
+    </AudioTrack>
+  </Sequence>
+</Project>
+'''
+
+class HroxTest(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.path = os.path.join(self.directory, 'test.hrox')
+    with open(self.path, 'wb') as f:
+      f.write(kProject)
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def testTrackItems(self):
+    items = list(iterHroxTrackItems(self.path))
+    self.assertEqual([(item.sequenceName, item.trackName, item.name(), item.guid()) for item in items],
+                     [('Seq A', 'Video 1', 'sh010', 'item-1'), ('Seq A', 'Video 1', 'sh020', 'item-2'),
+                      ('Seq A', 'Audio 1', 'dialogue', 'item-3')])
+    tags = items[0].tags()
+    self.assertEqual([(tag.name(), tag.guid()) for tag in tags], [('Status', 'tag-1'), ('Artist', 'tag-2'),
+                                                                  ('Retime', 'tag-3')])
+    self.assertEqual(tags[0].metadata().value('tag.status'), '$500')
+    self.assertEqual(sorted(tags[1].metadata().keys()), ['tag.artistDepartment', 'tag.artistID', 'tag.artistName'])
+    self.assertEqual(tags[2].note(), 'speed ramp')
+    self.assertEqual(items[2].tags()[0].note(), 'levels')
+
+  def testRows(self):
+    rows = list(hroxRows(self.path))
+    self.assertEqual(rows[0].values(), ['Seq A', 'Video 1', 'sh010', '$500', '3', 'Claude Monet', 'Lighting',
+                                        'speed ramp'])
+    self.assertEqual(rows[1].values(), ['Seq A', 'Video 1', 'sh020', '--', '--', '--', '--', ''])
+
+    # With a roster, the Artist comes from it; the department is still the one in the tag
+    roster = ArtistRegistry([{'artistName':'C. Monet', 'artistIcon':'', 'artistDepartment':'Comp', 'artistID':3}])
+    self.assertEqual(list(hroxRows(self.path, roster))[0]['Artist'], 'C. Monet')
+    self.assertEqual(list(hroxRows(self.path, roster))[0]['Department'], 'Lighting')
+
+  def testCompressed(self):
+    compressed = gzip.open(self.path+'.gz', 'wb')
+    compressed.write(kProject)
+    compressed.close()
+    self.assertEqual([row.values() for row in hroxRows(self.path+'.gz')], [row.values() for row in hroxRows(self.path)])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.tests import (buildSequence, configure)
+
+from spreadsheet_engine import (gRowCache, importAssignments)
+
+class ImportAssignmentsTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    gRowCache.clear()
+    self.sequence = buildSequence(['sh010', 'sh020', 'sh030'])
+    self.items = dict((item.name(), item) for item in self.sequence.videoTracks()[0].items())
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def importText(self, fileName, text):
+    path = os.path.join(self.directory, fileName)
+    with open(path, 'wb') as f:
+      f.write(text)
+    return importAssignments(path, self.sequence)
+
+  def testErrorRows(self):
+    report = self.importText('bids.jsonl', '\n'.join(['{"shot": "sh010", "bid": "$500"}',
+                                                      '{not json',
+                                                      '5',
+                                                      '{"shot": "sh999", "bid": "$500"}',
+                                                      '{"shot": "sh020", "bid": "$7"}',
+                                                      '{"shot": "sh020", "artist": "Nobody"}',
+                                                      '',
+                                                      '{"Shot": "sh030", "Bid": "1000", "Artist": "3"}']))
+    self.assertEqual((report.rows, report.applied, report.unmatchedCount, report.invalidCount), (7, 2, 1, 4))
+    self.assertEqual(report.unmatched, [(4, 'sh999')])
+    self.assertEqual([lineNumber for lineNumber, reason in report.invalid], [2, 3, 5, 6])
+    self.assertEqual(self.items['sh010'].status(), '$500')
+    self.assertEqual(self.items['sh020'].status(), None)
+    self.assertEqual(self.items['sh030'].status(), '$1000')
+    self.assertEqual(self.items['sh030'].artist()['artistName'], 'Claude Monet')
+    self.assertTrue(report.summary().startswith('7 rows read, 2 applied, 1 unmatched, 4 invalid.'))
+
+  def testJSONArray(self):
+    report = self.importText('bids.json', '[{"shot": "sh010", "bid": "$100"}, 5, {"shot": oops}, {"shot": "sh020"}]')
+    self.assertEqual((report.rows, report.applied, report.invalidCount), (3, 1, 2))
+    self.assertEqual([lineNumber for lineNumber, reason in report.invalid], [2, 3])
+    self.assertEqual(self.items['sh010'].status(), '$100')
+
+  def testCSVHeaders(self):
+    report = self.importText('bids.csv', 'Shot,Bid,Artist\nsh010,$500,John Smith\nsh020,,\n')
+    self.assertEqual((report.rows, report.applied, report.invalidCount), (2, 2, 0))
+    self.assertEqual(self.items['sh010'].status(), '$500')
+    self.assertEqual(self.items['sh010'].artist()['artistID'], 0)
+
+    report = self.importText('names.csv', 'Name,Bid\nsh010,$100\nsh020,$100\n')
+    self.assertEqual((report.rows, report.applied, report.invalidCount), (1, 0, 1))
+    self.assertEqual(report.invalid, [(1, 'no shot column in the header')])
+    self.assertEqual(self.items['sh010'].status(), '$500')
+
+if __name__ == '__main__':
+  unittest.main()
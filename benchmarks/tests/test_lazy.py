@@ -0,0 +1,106 @@
+import unittest
+
+from benchmarks.synthetic import statusTag
+from benchmarks.tests import (buildSequence, configure)
+
+from PySide2 import QtCore
+
+from spreadsheet_engine import (LazyValues, RowCache, VisibleRows, lazy)
+from spreadsheet_engine.columns import Column
+
+class CountingColumn(Column):
+  expensive = True
+  placeholder = '...'
+
+  def __init__(self):
+    Column.__init__(self, 'Counting')
+    self.calls = []
+
+  def data(self, rowData, item):
+    self.calls.append(item.name())
+    return '%s %s' % (item.name(), rowData.status)
+
+class CustomColumns(object):
+
+  def __init__(self, columns):
+    self.columns = columns
+
+  def numColumns(self):
+    return len(self.columns)
+
+class LazyValuesTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.items = buildSequence(['sh%03d' % (10*shot) for shot in range(1, 41)]).videoTracks()[0].items()
+    self.column = CountingColumn()
+    self.customColumns = CustomColumns([self.column])
+    self.visibleRows = VisibleRows()
+    self.rowCache = RowCache()
+    self.lazyValues = LazyValues(self.visibleRows, self.rowCache)
+    self.pending = []
+    self.refreshed = []
+    self.singleShot = QtCore.QTimer.singleShot
+    self.refreshCells = lazy.views.refreshCells
+    QtCore.QTimer.singleShot = staticmethod(lambda msec, callback: self.pending.append(callback))
+    lazy.views.refreshCells = lambda cells, numColumns: self.refreshed.extend(cells)
+
+  def tearDown(self):
+    QtCore.QTimer.singleShot = staticmethod(self.singleShot)
+    lazy.views.refreshCells = self.refreshCells
+
+  def runTimers(self):
+    while self.pending:
+      self.pending.pop(0)()
+
+  def scrollTo(self, rows):
+    # The visible range is published at the end of the frame that painted it
+    for row in rows:
+      self.visibleRows.touch(row)
+    self.runTimers()
+
+  def paint(self, rows):
+    for row in rows:
+      self.visibleRows.touch(row)
+    values = [self.lazyValues.data(self.customColumns, row, 0, self.items[row]) for row in rows]
+    self.runTimers()
+    return values
+
+  def testVisibleRowsComputedStraightAway(self):
+    self.scrollTo([0, 1])
+    self.assertEqual(self.paint([0, 1]), ['sh010 None', 'sh020 None'])
+    self.assertEqual(self.column.calls, ['sh010', 'sh020'])
+    self.assertEqual(self.refreshed, [])
+
+  def testOtherRowsQueuedNearestFirst(self):
+    self.scrollTo([0])
+    self.paint([0])
+    # Rows past the visible range and its margin show the placeholder
+    far = [39, 20, 30]
+    self.assertEqual([self.lazyValues.data(self.customColumns, row, 0, self.items[row]) for row in far],
+                     ['...']*3)
+    self.assertEqual(self.column.calls, ['sh010'])
+    self.runTimers()
+    self.assertEqual(self.column.calls, ['sh010', 'sh210', 'sh310', 'sh400'])
+    self.assertEqual(self.refreshed, [(20, 0), (30, 0), (39, 0)])
+    self.assertEqual([self.lazyValues.data(self.customColumns, row, 0, self.items[row]) for row in far],
+                     ['sh400 None', 'sh210 None', 'sh310 None'])
+
+  def testTagChangesDropTheValues(self):
+    self.scrollTo([0])
+    self.paint([0])
+    self.items[0].addTag(statusTag('$500'))
+    self.rowCache.invalidate(self.items[0])
+    self.assertEqual(self.paint([0]), ['sh010 $500'])
+
+    # Edits made in Hiero's UI are caught when the visible row is checked
+    self.items[0]._tags.append(statusTag('$1000'))
+    self.rowCache.revalidate()
+    self.assertEqual(self.paint([0]), ['sh010 $1000'])
+
+    self.rowCache.clear()
+    self.paint([0])
+    self.assertEqual(self.column.calls, ['sh010']*4)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.tests import buildSequence
+
+import hiero.core
+
+from spreadsheet_engine import media
+from spreadsheet_engine.media import (MediaPresenceCache, frameFilename)
+
+class DeferredThreadPool(object):
+  """
+    Holds the probe jobs until run(), as a real thread pool would until they finish
+  """
+
+  def __init__(self):
+    self.jobs = []
+
+  def start(self, job, priority=0):
+    self.jobs.append(job)
+
+  def run(self):
+    jobs, self.jobs = self.jobs, []
+    for job in jobs:
+      job.run()
+
+class FrameFilenameTest(unittest.TestCase):
+
+  def testPadding(self):
+    self.assertEqual(frameFilename('/a/shot.%04d.exr', 1001), '/a/shot.1001.exr')
+    self.assertEqual(frameFilename('/a/shot.####.exr', 7), '/a/shot.0007.exr')
+    self.assertEqual(frameFilename('/a/shot.mov', 1001), '/a/shot.mov')
+    self.assertEqual(frameFilename('/a/100%.%d.exr', 1), '/a/100%.%d.exr')
+
+class MediaPresenceCacheTest(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    open(os.path.join(self.directory, 'present.1001.exr'), 'w').close()
+    self.sequence = buildSequence([])
+    self.track = self.sequence.videoTracks()[0]
+    self.pool = DeferredThreadPool()
+    self.cache = MediaPresenceCache(self.pool)
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def addShot(self, name, clip):
+    item = hiero.core.TrackItem(name, clip)
+    self.track.addItem(item)
+    return item
+
+  def clip(self, name):
+    return hiero.core.Clip(name, [hiero.core.MediaFileInfo(os.path.join(self.directory, name+'.%04d.exr'))])
+
+  def testPendingUntilProbed(self):
+    present = self.addShot('sh010', self.clip('present'))
+    missing = self.addShot('sh020', self.clip('missing'))
+    self.assertIs(self.cache.isMediaPresent(present), None)
+    self.assertIs(self.cache.isMediaPresent(missing), None)
+    self.assertEqual(len(self.pool.jobs), 1)
+    self.pool.run()
+    self.assertIs(self.cache.isMediaPresent(present), True)
+    self.assertIs(self.cache.isMediaPresent(missing), False)
+    self.assertEqual(self.pool.jobs, [])
+
+  def testClipsAreProbedOnceAndInBatches(self):
+    clip = self.clip('present')
+    for index in range(3):
+      self.addShot('sh%03d' % index, clip)
+    for index in range(media.kMediaProbeBatchSize+1):
+      self.addShot('other%03d' % index, self.clip('other%03d' % index))
+    self.cache.scanSequence(self.sequence)
+    self.assertEqual([len(job._work) for job in self.pool.jobs], [media.kMediaProbeBatchSize, 2])
+    # Already scanned, and still pending
+    self.cache.scanSequence(self.sequence)
+    self.cache.isMediaPresent(self.track.items()[0])
+    self.assertEqual(len(self.pool.jobs), 2)
+
+  def testProbedAgainAfterTTLOrRescan(self):
+    item = self.addShot('sh010', self.clip('present'))
+    self.cache.isMediaPresent(item)
+    self.pool.run()
+    self.cache.isMediaPresent(item)
+    self.assertEqual(self.pool.jobs, [])
+
+    clip = self.cache._items[item.guid()]
+    clip.probedAt-=media.kMediaProbeTTL+1
+    # The old result is shown while the new probe runs
+    self.assertIs(self.cache.isMediaPresent(item), True)
+    self.assertEqual(len(self.pool.jobs), 1)
+    self.pool.run()
+
+    os.remove(os.path.join(self.directory, 'present.1001.exr'))
+    self.cache.rescan()
+    self.pool.run()
+    self.assertIs(self.cache.isMediaPresent(item), False)
+
+  def testRestoredResults(self):
+    item = self.addShot('sh010', self.clip('missing'))
+    filenames = (os.path.join(self.directory, 'missing.1001.exr'),)
+    self.cache.restore([(filenames, True, 1.0)])
+    # Shown straight away, and probed again as the sequence is scanned
+    self.assertIs(self.cache.isMediaPresent(item), True)
+    self.pool.run()
+    self.assertIs(self.cache.isMediaPresent(item), False)
+    self.assertEqual([present for _, present, _ in self.cache.results([item.guid()])], [False])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from benchmarks.tests import (buildSequence, configure, kArtists)
+
+from PySide2 import QtWidgets
+
+from spreadsheet_engine import (ExportColumnsAction, config)
+from spreadsheet_engine.menus import AssignArtistMenu
+
+class AssignArtistMenuTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.menu = AssignArtistMenu()
+
+  def tearDown(self):
+    self.menu.unregister()
+
+  def show(self):
+    self.menu.aboutToShow.emit()
+    for menu in self.menu._departmentMenus:
+      menu.aboutToShow.emit()
+
+  def testSearchHasFocus(self):
+    self.show()
+    self.assertTrue(self.menu._searchField.hasFocus())
+
+  def testRosterChangeDeletesOldMenusAndActions(self):
+    self.show()
+    oldMenus = list(self.menu._departmentMenus)
+    moved = self.menu._artistActions[3][1]
+    kept = self.menu._artistActions[0][1]
+    config.gArtistList.reload([dict(artist, artistDepartment='Lighting') if artist['artistID'] == 3 else artist
+                               for artist in kArtists])
+    self.show()
+    self.assertTrue(all(getattr(menu, '_deleted', False) for menu in oldMenus))
+    self.assertTrue(getattr(moved, '_deleted', False))
+    self.assertFalse(getattr(kept, '_deleted', False))
+    self.assertEqual([menu.title() for menu in self.menu._departmentMenus], ['3D', 'Lighting'])
+
+class ContextMenuActionTest(unittest.TestCase):
+
+  def setUp(self):
+    self.action = ExportColumnsAction()
+
+  def tearDown(self):
+    self.action.unregister()
+
+  def show(self, sequence):
+    class View(object):
+      def sequence(self):
+        return sequence
+    class Event(object):
+      sender = View()
+      menu = QtWidgets.QMenu()
+    self.action.eventHandler(Event)
+    return Event.menu._actions
+
+  def testOnlyOfferedWithASequence(self):
+    self.assertEqual(self.show(None), [])
+    sequence = buildSequence(['sh010'])
+    self.assertEqual(self.show(sequence), [self.action])
+    self.assertIs(self.action.sequence(), sequence)
+
+if __name__ == '__main__':
+  unittest.main()
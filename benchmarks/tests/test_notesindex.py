@@ -0,0 +1,78 @@
+import unittest
+
+from benchmarks.tests import (buildSequence, configure)
+
+import hiero.core
+from PySide2 import QtCore
+
+from spreadsheet_engine import (NotesIndex, gRowCache, notesindex)
+
+def noteTag(name, note):
+  tag = hiero.core.Tag(name)
+  tag.setNote(note)
+  return tag
+
+class NotesIndexTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.project = hiero.core.Project('Test')
+    self.sequence = buildSequence(['sh010', 'sh020', 'sh030'], self.project)
+    self.other = buildSequence(['sh040'], self.project, name='Sequence 2')
+    self.items = self.sequence.videoTracks()[0].items()+self.other.videoTracks()[0].items()
+    self.items[0].addTag(noteTag('Retime', 'speed ramp into the rotoscope work'))
+    self.items[1].addTag(noteTag('Roto', 'hair detail'))
+    self.items[3].addTag(noteTag('Paint', 'remove the speed sign'))
+    self.index = NotesIndex()
+
+  def names(self, text, sequence=None):
+    return sorted(item.name() for item in self.index.search(text, sequence))
+
+  def testSearch(self):
+    self.index.setProject(self.project)
+    self.assertEqual(self.names('speed'), ['sh010', 'sh040'])
+    # Words match the tag names too, and longer words they start
+    self.assertEqual(self.names('roto'), ['sh010', 'sh020'])
+    self.assertEqual(self.names('SPEED ramp'), ['sh010'])
+    self.assertEqual(self.names('speed', self.other), ['sh040'])
+    self.assertEqual(self.names('nothing'), [])
+    self.assertEqual(self.names('  '), [])
+
+  def testTagChanges(self):
+    self.index.setProject(self.project)
+    self.items[2].addTag(noteTag('Hold', 'client call'))
+    self.assertEqual(self.names('client'), ['sh030'])
+    self.items[1].removeTag(self.items[1].tags()[0])
+    self.assertEqual(self.names('hair'), [])
+    self.assertEqual(self.index.stats()['dirty'], 0)
+
+  def testRebuiltAfterAnUndo(self):
+    self.index.setProject(self.project)
+    # An undo changes the tags without notifying each shot
+    self.items[2]._tags.append(noteTag('Hold', 'client call'))
+    self.assertEqual(self.names('client'), [])
+    gRowCache.clear()
+    self.assertEqual(self.names('client'), ['sh030'])
+
+  def testIndexedInTimeSlices(self):
+    pending = []
+    singleShot = QtCore.QTimer.singleShot
+    sliceSeconds = notesindex.kIndexSliceSeconds
+    QtCore.QTimer.singleShot = staticmethod(lambda msec, callback: pending.append(callback))
+    notesindex.kIndexSliceSeconds = -1
+    try:
+      self.index.setProject(self.project)
+      # One shot per idle step
+      pending.pop()()
+      self.assertTrue(self.index.isBuilding())
+      self.assertEqual(len(pending), 1)
+      # A search finishes the indexing first
+      self.assertEqual(self.names('speed'), ['sh010', 'sh040'])
+      self.assertFalse(self.index.isBuilding())
+      pending.pop()()
+    finally:
+      QtCore.QTimer.singleShot = staticmethod(singleShot)
+      notesindex.kIndexSliceSeconds = sliceSeconds
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from benchmarks.synthetic import (artistTag, statusTag)
+from benchmarks.tests import (buildSequence, configure)
+
+import hiero.core
+
+from spreadsheet_engine import (ShotQuery, ShotQueryEngine, QueryError, config)
+from spreadsheet_engine.query import ShotQueryPanel
+
+class ShotQueryParseTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+
+  def testConditions(self):
+    query = ShotQuery.parse('bid>=800 department:Comp unassigned "artist:Claude Monet" tag:retime media:missing')
+    self.assertEqual(query.minBid, 800)
+    self.assertEqual(query.maxBid, None)
+    self.assertEqual(query.department, 'Comp')
+    self.assertTrue(query.unassigned)
+    self.assertEqual(query.artist, 'Claude Monet')
+    self.assertEqual(query.tags, ['retime'])
+    self.assertIs(query.mediaPresent, False)
+
+  def testBidRanges(self):
+    query = ShotQuery.parse('bid>100 bid<=$1000 bid<2000')
+    self.assertEqual((query.minBid, query.maxBid), (101, 1000))
+    query = ShotQuery.parse('BID=$500')
+    self.assertEqual((query.minBid, query.maxBid), (500, 500))
+    self.assertTrue(ShotQuery.parse('nobid').noBid)
+    self.assertIs(ShotQuery.parse('media:present').mediaPresent, True)
+
+  def testErrors(self):
+    for text in ('bid>>3', 'bid>=inf', 'bid<1e400', 'bid', 'colour:red', 'artist:', 'media:lost', 'retime',
+                 '"artist:Claude'):
+      self.assertRaises(QueryError, ShotQuery.parse, text)
+
+class ShotQueryEngineTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.sequence = buildSequence(['sh010', 'sh020', 'sh030'])
+    self.track = self.sequence.videoTracks()[0]
+    self.items = self.track.items()
+    self.items[0].setStatus('$500')
+    self.items[1].setStatus('$1000')
+    self.items[1].addTag(artistTag(config.gArtistList.fromID(3)))
+    self.engine = ShotQueryEngine()
+
+  def names(self, text):
+    return sorted(item.name() for item in self.engine.run(text, self.sequence))
+
+  def testIndexedConditions(self):
+    self.assertEqual(self.names('bid>=500'), ['sh010', 'sh020'])
+    self.assertEqual(self.names('bid>500 department:comp'), ['sh020'])
+    self.assertEqual(self.names('nobid unassigned'), ['sh030'])
+
+  def testTagChanges(self):
+    self.assertEqual(self.names('bid>=1000'), ['sh020'])
+    self.items[2].setStatus('$1000')
+    self.items[1].setStatus('$100')
+    self.assertEqual(self.names('bid>=1000'), ['sh030'])
+    # $100 had no shots until now, so the sorted Bid values are rebuilt
+    self.assertEqual(self.names('bid<=100'), ['sh020'])
+
+  def testShotsAddedAndDeleted(self):
+    self.assertEqual(self.names('bid>=500'), ['sh010', 'sh020'])
+    # Deleted on the timeline, which changes no tags
+    self.track._items.remove(self.items[0])
+    self.items[0]._track = None
+    added = hiero.core.TrackItem('sh040', self.items[0].source())
+    self.track.addItem(added)
+    added.addTag(statusTag('$800'))
+    self.assertEqual(self.names('bid>=500'), ['sh020', 'sh040'])
+
+  def testPlaceholderParses(self):
+    # The example shown in the empty query field works as typed
+    example = ShotQueryPanel(self.engine)._queryField.placeholderText()
+    self.assertTrue(example.startswith('e.g. '))
+    ShotQuery.parse(example[len('e.g. '):])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,66 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.synthetic import (artistTag, statusTag)
+from benchmarks.tests import (buildSequence, configure)
+
+import hiero.core
+
+from spreadsheet_engine import (ArtistRegistry, config, reportProjects)
+from spreadsheet_engine.report import (configureWorker, summaryPath, workerConfig)
+
+class ReportProjectsTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.directory = tempfile.mkdtemp()
+    self.projects = {}
+    for name in ('a', 'b', 'c'):
+      project = hiero.core.Project(name)
+      items = buildSequence([name+'010', name+'020'], project).videoTracks()[0].items()
+      items[0].addTag(statusTag('$500'))
+      items[1].addTag(artistTag(config.gArtistList.fromID(3)))
+      self.projects['/shows/%s.hrox' % name] = project
+    self._openProject = getattr(hiero.core, 'openProject', None)
+    hiero.core.openProject = self.openProject
+
+  def tearDown(self):
+    hiero.core.openProject = self._openProject
+    shutil.rmtree(self.directory)
+
+  def openProject(self, path):
+    if path not in self.projects:
+      raise IOError('No such project: %s' % path)
+    return self.projects[path]
+
+  def report(self, processes):
+    path = os.path.join(self.directory, 'report%d.csv' % processes)
+    paths = sorted(self.projects)+['/shows/missing.hrox']
+    summaries = reportProjects(paths, path, processes=processes)
+    with open(path, 'rb') as f:
+      rows = sorted(tuple(row) for row in csv.reader(f))
+    return summaries, rows
+
+  def testInProcessAndPooledMatch(self):
+    summaries, rows = self.report(1)
+    self.assertEqual([summary['Shots'] for summary in summaries], [2, 2, 2, 0])
+    self.assertIn('IOError', summaries[-1]['Error'])
+    self.assertEqual(len(rows), 7)
+    self.assertIn(('a', 'Sequence 1', 'Video 1', 'a010', '$500', '--', '--', '--'), [row[:8] for row in rows])
+    self.assertIn(('b', 'Sequence 1', 'Video 1', 'b020', '--', '3', 'Claude Monet', 'Comp'), [row[:8] for row in rows])
+    self.assertEqual(self.report(3)[1], rows)
+    self.assertTrue(os.path.exists(summaryPath(os.path.join(self.directory, 'report3.csv'))))
+
+  def testWorkerConfig(self):
+    # What a spawned worker process is given, applied over a different configuration
+    statusTags, artists = workerConfig()
+    config.configure(['$1'], ArtistRegistry([]))
+    configureWorker(statusTags, artists)
+    self.assertEqual(list(config.gStatusTags), ['$100', '$500', '$1000', 'TBD'])
+    self.assertEqual(config.gArtistList.fromID(3)['artistDepartment'], 'Comp')
+
+if __name__ == '__main__':
+  unittest.main()
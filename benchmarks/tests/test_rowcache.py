@@ -0,0 +1,62 @@
+import unittest
+
+from benchmarks.synthetic import statusTag
+from benchmarks.tests import (buildSequence, configure)
+
+import hiero.core
+
+from spreadsheet_engine import RowCache
+
+class RowCacheTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.items = buildSequence(['sh010', 'sh020']).videoTracks()[0].items()
+    self.rowCache = RowCache()
+    self.changed = []
+    self.rowCache.addListener(self.changed.append)
+
+  def testHitsUntilInvalidated(self):
+    item = self.items[0]
+    first = self.rowCache.row(item)
+    self.assertIs(self.rowCache.row(item), first)
+    item.addTag(statusTag('$500'))
+    self.rowCache.invalidate(item)
+    self.assertEqual(self.changed, [item])
+    self.assertEqual(self.rowCache.row(item).status, '$500')
+    self.assertEqual(self.rowCache.stats()['misses'], 2)
+    self.assertEqual(self.rowCache.stats()['hits'], 1)
+
+  def testRevalidateCatchesEditsMadeInTheUI(self):
+    item = self.items[0]
+    self.rowCache.row(item)
+    # Hiero's UI adds the tag without going through Python
+    item._tags.append(statusTag('$500'))
+    self.assertEqual(self.rowCache.row(item).status, None)
+    self.rowCache.revalidate()
+    self.assertEqual(self.rowCache.row(item).status, '$500')
+    self.assertEqual(self.changed, [item])
+
+    # The Tag dialog edits the metadata of the existing tag
+    item.tags()[0].metadata().setValue('tag.status', '$1000')
+    self.rowCache.revalidate()
+    self.assertEqual(self.rowCache.row(item).status, '$1000')
+
+  def testRevalidatedRowsAreCheckedNotHits(self):
+    for item in self.items:
+      self.rowCache.row(item)
+    self.rowCache.revalidate()
+    for item in self.items:
+      self.rowCache.row(item)
+      self.rowCache.row(item)
+    stats = self.rowCache.stats()
+    self.assertEqual((stats['misses'], stats['checks'], stats['hits']), (2, 2, 2))
+
+  def testClearNotifiesOnce(self):
+    self.rowCache.row(self.items[0])
+    self.rowCache.clear()
+    self.assertEqual(self.changed, [None])
+    self.assertIsNone(self.rowCache.cached(self.items[0]))
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,42 @@
+import copy
+import unittest
+
+from benchmarks.tests import buildSequence
+
+import hiero.core
+
+from spreadsheet_engine import (iterTrackItems, peekTrackItems)
+
+class IterTrackItemsTest(unittest.TestCase):
+
+  def setUp(self):
+    self.sequence = buildSequence(['sh010', 'sh020', 'sh030'])
+    self.track = self.sequence.videoTracks()[0]
+    self.items = self.track.items()
+
+  def testEachShotOnce(self):
+    first = self.items[0]
+    # A second Python wrapper of the same shot, as Hiero can hand out
+    wrapper = copy.copy(self.items[1])
+    selection = [first, self.track, wrapper, self.track, self.sequence, 'not a shot']
+    self.assertEqual([item.name() for item in iterTrackItems(selection)], ['sh010', 'sh020', 'sh030'])
+
+  def testTracksAndSequences(self):
+    other = hiero.core.VideoTrack('Video 2')
+    self.sequence.addTrack(other)
+    other.addItem(hiero.core.TrackItem('sh040', None))
+    audio = hiero.core.AudioTrack('Audio 1')
+    self.sequence.addTrack(audio)
+    audio.addItem(hiero.core.TrackItem('audio', None))
+    # A sequence covers its video tracks only; an audio track selected directly is walked
+    self.assertEqual([item.name() for item in iterTrackItems([self.sequence])], ['sh010', 'sh020', 'sh030', 'sh040'])
+    self.assertEqual([item.name() for item in iterTrackItems([audio, other])], ['audio', 'sh040'])
+
+  def testPeek(self):
+    self.assertEqual(peekTrackItems([]), (None, None))
+    first, items = peekTrackItems([self.items[2], self.track])
+    self.assertEqual(first.name(), 'sh030')
+    self.assertEqual([item.name() for item in items], ['sh030', 'sh010', 'sh020'])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,131 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from benchmarks.synthetic import (artistTag, statusTag)
+from benchmarks.tests import (buildSequence, configure)
+
+import hiero.core
+
+from spreadsheet_engine import (MediaPresenceCache, RowCache, SidecarCache, config)
+from spreadsheet_engine.sidecar import sidecarPath
+
+class SidecarCacheTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.directory = tempfile.mkdtemp()
+    self.project = self.buildProject('a')
+    self.items = self.project.sequences()[0].videoTracks()[0].items()
+    self.sidecars = []
+
+  def tearDown(self):
+    for sidecar in self.sidecars:
+      sidecar.unregister()
+    shutil.rmtree(self.directory)
+
+  def buildProject(self, name):
+    project = hiero.core.Project(name, os.path.join(self.directory, name+'.hrox'))
+    items = buildSequence(['%s%03d' % (name, index) for index in range(10)], project).videoTracks()[0].items()
+    items[0].addTag(statusTag('$500'))
+    items[0].addTag(artistTag(config.gArtistList.fromID(3)))
+    note = hiero.core.Tag('Retime')
+    note.setNote('speed ramp')
+    items[1].addTag(note)
+    return project
+
+  def open(self, *projects):
+    # A fresh row cache and sidecar, as after restarting Nuke Studio
+    rowCache = RowCache()
+    sidecar = SidecarCache(rowCache, MediaPresenceCache())
+    sidecar.register()
+    self.sidecars.append(sidecar)
+    for project in projects:
+      sidecar.load(project)
+    return rowCache, sidecar
+
+  def storedGuids(self, project):
+    connection = sqlite3.connect(sidecarPath(project))
+    try:
+      return set(guid for guid, in connection.execute('SELECT guid FROM rows'))
+    finally:
+      connection.close()
+
+  def testRoundTrip(self):
+    rowCache, sidecar = self.open(self.project)
+    built = [rowCache.row(item) for item in self.items]
+    sidecar.flush()
+    self.assertEqual(self.storedGuids(self.project), set(item.guid() for item in self.items))
+
+    restoredCache, _ = self.open(self.project)
+    for item, rowData in zip(self.items, built):
+      restored = restoredCache.cached(item)
+      self.assertIsNotNone(restored)
+      # Restored, then attached to its tags by the check, not rebuilt
+      self.assertIsNot(restored, rowData)
+      self.assertEqual(restored.tagGuids, rowData.tagGuids)
+      self.assertEqual((restored.status, restored.artistID, restored.department, restored.tagNames, restored.notes,
+                        restored.iconPaths),
+                       (rowData.status, rowData.artistID, rowData.department, rowData.tagNames, rowData.notes,
+                        rowData.iconPaths))
+    self.assertEqual(restoredCache.cached(self.items[0]).artist['artistName'], 'Claude Monet')
+    self.assertEqual(restoredCache.stats()['misses'], 0)
+
+  def testEditsInTheUIAfterRestore(self):
+    rowCache, sidecar = self.open(self.project)
+    for item in self.items:
+      rowCache.row(item)
+    sidecar.flush()
+
+    restoredCache, _ = self.open(self.project)
+    item = self.items[2]
+    self.assertEqual(restoredCache.row(item).status, None)
+    # Hiero's UI adds the tag without going through Python
+    item._tags.append(statusTag('$500'))
+    restoredCache.revalidate()
+    self.assertEqual(restoredCache.row(item).status, '$500')
+
+  def testChangedTagsInvalidate(self):
+    rowCache, sidecar = self.open(self.project)
+    for item in self.items:
+      rowCache.row(item)
+    sidecar.flush()
+
+    # Edited while the project was closed
+    note = hiero.core.Tag('Hold')
+    note.setNote('client call')
+    self.items[3].addTag(note)
+    restoredCache, restored = self.open(self.project)
+    self.assertIsNone(restoredCache.cached(self.items[3]))
+    self.assertIsNotNone(restoredCache.cached(self.items[4]))
+
+    # The rebuilt row is written back, and restored next time
+    self.assertEqual(restoredCache.row(self.items[3]).notes, 'client call')
+    restored.flush()
+    nextCache, _ = self.open(self.project)
+    self.assertEqual(nextCache.cached(self.items[3]).notes, 'client call')
+
+  def testProjectsKeepTheirOwnRows(self):
+    other = self.buildProject('b')
+    otherItems = other.sequences()[0].videoTracks()[0].items()
+    rowCache, sidecar = self.open(self.project, other)
+    for item in self.items+otherItems:
+      rowCache.row(item)
+    sidecar.flush()
+    self.assertEqual(self.storedGuids(self.project), set(item.guid() for item in self.items))
+    self.assertEqual(self.storedGuids(other), set(item.guid() for item in otherItems))
+
+    class Event(object):
+      sender = self.project
+    sidecar.projectClosing(Event())
+    otherItems[0].addTag(statusTag('$100'))
+    rowCache.invalidate(otherItems[0])
+    rowCache.row(otherItems[0])
+    sidecar.flush()
+    restoredCache, _ = self.open(other)
+    self.assertEqual(restoredCache.cached(otherItems[0]).status, '$100')
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from benchmarks.tests import (buildSequence, configure)
+
+from spreadsheet_engine import RowCache
+from spreadsheet_engine.media import MediaPresenceCache
+from spreadsheet_engine.warmup import (CacheWarmer, distanceOrder)
+
+class DistanceOrderTest(unittest.TestCase):
+
+  def testVisibleRowsFirst(self):
+    self.assertEqual(distanceOrder(8, 3, 4), [3, 4, 5, 2, 6, 1, 7, 0])
+
+  def testEmpty(self):
+    self.assertEqual(distanceOrder(0, 0, 49), [])
+
+  def testRangePastTheEnd(self):
+    self.assertEqual(distanceOrder(3, 10, 20), [2, 1, 0])
+    self.assertEqual(distanceOrder(5, 3, 20), [3, 4, 2, 1, 0])
+
+class CacheWarmerTest(unittest.TestCase):
+
+  def setUp(self):
+    configure()
+    self.rowCache = RowCache()
+    self.warmer = CacheWarmer(self.rowCache, MediaPresenceCache())
+    self.finished = []
+    self.warmer.finished.connect(self.finished.append)
+
+  def testWarmsEveryRow(self):
+    sequence = buildSequence(['sh%03d' % index for index in range(20)])
+    self.warmer.start(sequence, 5, 9)
+    for item in sequence.videoTracks()[0].items():
+      self.assertIsNotNone(self.rowCache.cached(item))
+    self.assertEqual(self.finished, [sequence])
+
+  def testEmptySequence(self):
+    sequence = buildSequence([])
+    self.warmer.start(sequence)
+    self.assertEqual(self.finished, [sequence])
+
+  def testShorterSequenceThanTheVisibleRows(self):
+    sequence = buildSequence(['sh010', 'sh020'])
+    self.warmer.start(sequence, 40, 90)
+    self.assertEqual(self.rowCache.stats()['size'], 2)
+
+if __name__ == '__main__':
+  unittest.main()
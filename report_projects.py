@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+  Headless Bid and Artist report across many projects.
+
+  Reads the Bid, Artist, Department and Notes of every shot in each project, using
+  the Bids and Artist roster of custom_spreadsheet.py, in a pool of worker processes,
+  and merges them into one CSV, JSON Lines or SQLite report with per-project timings.
+  Only hiero.core is used, so no menus, panels or other UI are built. Run it with the
+  Python of Nuke Studio / Hiero in terminal mode, e.g.
+
+    Nuke --studio -t report_projects.py --output weekly.db /shows/*/editorial/*.hrox
+"""
+import argparse
+import sys
+
+# The studio's Bids and Artist roster; without Hiero's UI no columns are installed
+import custom_spreadsheet
+import spreadsheet_engine
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Report the Bids and Artists of the shots of many projects')
+  parser.add_argument('projects', nargs='+', help='.hrox project files')
+  parser.add_argument('--output', required=True, help='report file: .csv, .jsonl/.json or .db/.sqlite')
+  parser.add_argument('--processes', type=int, default=None, help='worker processes (default: one per CPU)')
+  parser.add_argument('--roster', default=None, help='Artist roster file to use instead of the built-in one')
+  args = parser.parse_args(argv)
+
+  artistList = custom_spreadsheet.gArtistList
+  if args.roster:
+    artistList = spreadsheet_engine.ArtistRegistry.fromFile(args.roster)
+  spreadsheet_engine.config.configure(custom_spreadsheet.gStatusTags, artistList)
+
+  def progress(projectsDone, projectCount, summary):
+    status = summary['Error'] or '%d shots' % summary['Shots']
+    print '[%d/%d] %s: %s in %ss' % (projectsDone, projectCount, summary['Project'], status, summary['Seconds'])
+
+  summaries = spreadsheet_engine.reportProjects(args.projects, args.output, processes=args.processes,
+                                                progress=progress)
+  print 'Wrote %d shots from %d projects to %s' % (sum(summary['Shots'] for summary in summaries),
+                                                   len(summaries), args.output)
+  return 1 if any(summary['Error'] for summary in summaries) else 0
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,51 @@
+# Shared engine for the custom Spreadsheet columns and the 'Set Bid'/'Assign Artist' menus.
+# A column set (e.g. custom_spreadsheet.py) builds its Columns, Bid list and Artist
+# roster, and hands them to install().
+from .artists import Artist, ArtistRegistry, readRoster
+from .bids import bidValue, Bid, BidRegistry
+from .hrox import HroxTag, HroxTrackItem, iterHroxTrackItems, hroxRows
+from .rowcache import RowData, RowCache, gRowCache
+from .tags import TagSummary
+from . import config
+from . import values
+
+# The modules above do not need Hiero, so the .hrox reader also runs outside Nuke Studio
+try:
+  import hiero.core
+  kHieroAvailable = True
+except ImportError:
+  kHieroAvailable = False
+
+# hiero.ui can only be imported when Nuke Studio runs with its UI. In terminal mode (-t)
+# just the modules that need no more than hiero.core are loaded, so a headless report
+# builds no menus, panels, timers or Qt objects.
+try:
+  import hiero.ui
+  kHieroUIAvailable = True
+except ImportError:
+  kHieroUIAvailable = False
+
+if kHieroAvailable:
+  from . import trackitem
+  from .report import shotRows, projectRows, reportProjects
+  from .selection import iterTrackItems, peekTrackItems
+
+if kHieroUIAvailable:
+  from .artisttags import ArtistTagIndex, propagateRoster, UpdateArtistTagsAction
+  from .columns import (Column, TagsColumn, NotesColumn, BidColumn, ArtistColumn, DepartmentColumn,
+                        ColumnRegistry, CustomSpreadsheetColumns)
+  from .bidtotals import BidTotals, gBidTotals, BidTotalsPanel
+  from .batch import EditBatch, setStatusBulk, setArtistBulk
+  from .exporter import exportProject, exportRows, ExportColumnsAction
+  from .icons import IconCache, gIconCache
+  from .importer import importAssignments, ImportReport, ImportBidsAction
+  from .incremental import IncrementalIndex
+  from .lazy import VisibleRows, gVisibleRows, LazyValues, gLazyValues
+  from .media import MediaPresenceCache, gMediaCache, RescanMediaAction
+  from .notesindex import NotesIndex, gNotesIndex, NotesSearchPanel
+  from .menus import titleStringTriggeredAction, SetStatusMenu, AssignArtistMenu
+  from .query import ShotQuery, QueryError, ShotQueryEngine, gShotQueryEngine, ShotQueryPanel
+  from .sidecar import SidecarCache, gSidecarCache
+  from .startup import install
+  from .warmup import CacheWarmer, gCacheWarmer
+  from . import instrument
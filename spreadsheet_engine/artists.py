@@ -0,0 +1,241 @@
+# The artist roster: compact Artist records, indexed by ID and name, optionally loaded
+# from a JSON or SQLite file and reloaded when the file changes.
+import json
+import os
+import sqlite3
+import time
+
+# Seconds between checks of a roster file's modification time
+kRosterCheckInterval = 2.0
+
+# File extensions read as SQLite databases, with an 'artists' table; anything else is read as JSON
+kSQLiteExtensions = ('.db', '.sqlite', '.sqlite3')
+
+class Artist(object):
+  """
+    A compact artist record. Supports artist['artistName'] style access, so code
+    written against the old list of dictionaries keeps working.
+  """
+  __slots__ = ('artistName', 'artistIcon', 'artistDepartment', 'artistID')
+
+  def __init__(self, artistName, artistIcon, artistDepartment, artistID):
+    self.artistName = artistName
+    self.artistIcon = artistIcon
+    self.artistDepartment = artistDepartment
+    self.artistID = int(artistID)
+
+  def __getitem__(self, key):
+    if key not in self.__slots__:
+      raise KeyError(key)
+    return getattr(self, key)
+
+  def __contains__(self, key):
+    return key in self.__slots__
+
+  def get(self, key, default=None):
+    if key not in self.__slots__:
+      return default
+    return getattr(self, key)
+
+  def keys(self):
+    return list(self.__slots__)
+
+  def asDict(self):
+    return dict((key, getattr(self, key)) for key in self.__slots__)
+
+  def __repr__(self):
+    return 'Artist(%r)' % self.asDict()
+
+def _text(value):
+  if isinstance(value, unicode):
+    return value.encode('utf-8')
+  return value
+
+def readRoster(path):
+  """
+    Return the Artist records of a roster file: a JSON array of artist objects (or an
+    object with an 'artists' array), or a SQLite database with an 'artists' table
+    with artistName, artistIcon, artistDepartment and artistID columns
+  """
+  if os.path.splitext(path)[1].lower() in kSQLiteExtensions:
+    connection = sqlite3.connect(path)
+    try:
+      rows = connection.execute('SELECT artistName, artistIcon, artistDepartment, artistID FROM artists ORDER BY rowid').fetchall()
+    finally:
+      connection.close()
+    return [Artist(*[_text(value) for value in row]) for row in rows]
+
+  with open(path, 'rb') as f:
+    artists = json.load(f)
+  if isinstance(artists, dict):
+    artists = artists['artists']
+  return [Artist(**dict((str(key), _text(value)) for key, value in artist.items())) for artist in artists]
+
+class ArtistRegistry(object):
+  """
+    The ordered artist roster, indexed by artistID and artistName for O(1) lookups.
+    Iterates like the old list of dictionaries, and append() accepts either a
+    dictionary or an Artist. version is bumped on every change, so views of the
+    roster can tell when to rebuild.
+
+    A registry made with fromFile() reads its file on first use, and re-reads it when
+    its modification time changes (checked at most every kRosterCheckInterval seconds).
+    Unchanged Artists keep their records, and listeners added with addListener() are
+    called with the set of artistIDs that were added, changed or removed.
+  """
+
+  def __init__(self, artists=(), path=None):
+    self._artists = []
+    self._byID = {}
+    self._byName = {}
+    self._version = 0
+    self._listeners = []
+    self._path = path
+    self._mtime = None
+    self._nextCheck = 0.0
+    self.extend(artists)
+
+  @classmethod
+  def fromFile(cls, path):
+    """
+      Return a registry backed by a JSON or SQLite roster file
+    """
+    return cls(path=path)
+
+  @property
+  def version(self):
+    self._sync()
+    return self._version
+
+  @property
+  def path(self):
+    return self._path
+
+  def addListener(self, listener):
+    if listener not in self._listeners:
+      self._listeners.append(listener)
+
+  def removeListener(self, listener):
+    if listener in self._listeners:
+      self._listeners.remove(listener)
+
+  def checkForChanges(self):
+    """
+      Re-read the roster file now if it has changed, e.g. from a timer
+    """
+    self._nextCheck = 0.0
+    self._sync()
+
+  def _sync(self):
+    if self._path is None:
+      return
+    now = time.time()
+    if now < self._nextCheck:
+      return
+    self._nextCheck = now+kRosterCheckInterval
+    try:
+      mtime = os.path.getmtime(self._path)
+    except OSError:
+      return
+    if mtime == self._mtime:
+      return
+    try:
+      artists = readRoster(self._path)
+    except (IOError, ValueError, KeyError, TypeError, sqlite3.Error) as e:
+      # Possibly caught mid-write: keep the current roster and try again at the next check
+      print 'Could not read the Artist roster %s: %s' % (self._path, e)
+      return
+    self._mtime = mtime
+    self.reload(artists)
+
+  def reload(self, artists):
+    """
+      Replace the roster, keeping the records of unchanged Artists. Returns the set of
+      artistIDs that were added, changed or removed.
+    """
+    records = []
+    byID = {}
+    byName = {}
+    changed = set()
+    for artist in artists:
+      if not isinstance(artist, Artist):
+        artist = Artist(**artist)
+      existing = self._byID.get(artist.artistID)
+      if existing is not None and existing.asDict() == artist.asDict():
+        artist = existing
+      else:
+        changed.add(artist.artistID)
+      records.append(artist)
+      byID[artist.artistID] = artist
+      byName[artist.artistName] = artist
+    changed.update(artistID for artistID in self._byID if artistID not in byID)
+    if not changed and records == self._artists:
+      return changed
+
+    self._artists = records
+    self._byID = byID
+    self._byName = byName
+    self._version+=1
+    for listener in self._listeners:
+      listener(changed)
+    return changed
+
+  def append(self, artist):
+    if not isinstance(artist, Artist):
+      artist = Artist(**artist)
+    existing = self._byID.get(artist.artistID)
+    if existing is not None:
+      # An artist with the same ID replaces the old record in place
+      self._artists[self._artists.index(existing)] = artist
+      if self._byName.get(existing.artistName) is existing:
+        del self._byName[existing.artistName]
+    else:
+      self._artists.append(artist)
+    self._byID[artist.artistID] = artist
+    self._byName[artist.artistName] = artist
+    self._version+=1
+
+  def extend(self, artists):
+    for artist in artists:
+      self.append(artist)
+
+  def remove(self, artist):
+    artist = self._byID[int(artist['artistID'])]
+    self._artists.remove(artist)
+    del self._byID[artist.artistID]
+    if self._byName.get(artist.artistName) is artist:
+      del self._byName[artist.artistName]
+    self._version+=1
+
+  def fromID(self, artistID):
+    """
+      Return the Artist with the given ID, or None. Accepts the string IDs stored in tag metadata.
+    """
+    self._sync()
+    try:
+      return self._byID.get(int(artistID))
+    except (TypeError, ValueError):
+      return None
+
+  def fromName(self, artistName):
+    """
+      Return the Artist with the given name, or None
+    """
+    self._sync()
+    return self._byName.get(artistName)
+
+  def names(self):
+    self._sync()
+    return [artist.artistName for artist in self._artists]
+
+  def __iter__(self):
+    self._sync()
+    return iter(self._artists)
+
+  def __len__(self):
+    self._sync()
+    return len(self._artists)
+
+  def __getitem__(self, index):
+    self._sync()
+    return self._artists[index]
@@ -0,0 +1,77 @@
+# Propagation of Artist roster changes into the Artist tags of a project. An Artist tag
+# carries a copy of the artist's name, department and icon from when it was assigned,
+# so renames and department moves in the roster are written back to the tags by this job,
+# run for the changed Artists on each roster reload and for all of them from a menu action.
+from PySide2 import QtWidgets
+
+from . import config
+from .batch import (EditBatch, sequenceEdited)
+from .menus import ContextMenuAction
+from .rowcache import gRowCache
+from .tags import artistTagValues
+
+class ArtistTagIndex(object):
+  """
+    The Artist tags of a project by artist ID: {artistID: [(TrackItem, tag)]}, built
+    from one walk over the shots of every sequence
+  """
+
+  def __init__(self, project):
+    self.project = project
+    self.byArtistID = {}
+    for sequence in project.sequences():
+      for track in sequence.videoTracks():
+        for item in track.items():
+          summary = item.tagSummary(cached=False)
+          if summary.artistTag is not None:
+            self.byArtistID.setdefault(summary.artistID, []).append((item, summary.artistTag))
+
+  def staleTags(self, artistList, artistIDs=None):
+    """
+      Yield (TrackItem, tag, artist) for each Artist tag whose copied values differ from
+      its record in artistList. artistIDs limits the check to those artists.
+    """
+    for artistID, entries in self.byArtistID.items():
+      artist = artistList.fromID(artistID)
+      if artist is None or (artistIDs is not None and artist['artistID'] not in artistIDs):
+        continue
+      values = artistTagValues(artist)
+      icon = artist['artistIcon']
+      for item, tag in entries:
+        M = tag.metadata()
+        if tag.icon() != icon or any(not M.hasKey(key) or M.value(key) != value for key, value in values):
+          yield item, tag, artist
+
+def propagateRoster(project, artistList=None, artistIDs=None):
+  """
+    Rewrite the Artist tags of a project whose name, department or icon no longer match
+    the roster (config.gArtistList by default), in one undo step with one refresh per
+    sequence. Tags of artists no longer in the roster are left alone. Returns the
+    number of tags rewritten.
+  """
+  if artistList is None:
+    artistList = config.gArtistList
+  stale = list(ArtistTagIndex(project).staleTags(artistList, artistIDs))
+  if not stale:
+    return 0
+
+  with project.beginUndo("Update Artist Tags"):
+    with EditBatch():
+      for item, tag, artist in stale:
+        tag.setIcon(artist['artistIcon'])
+        for key, value in artistTagValues(artist):
+          tag.metadata().setValue(key, value)
+        gRowCache.invalidate(item)
+        sequenceEdited(item.sequence())
+  return len(stale)
+
+class UpdateArtistTagsAction(ContextMenuAction):
+
+  needsSequence = True
+
+  def __init__(self):
+      ContextMenuAction.__init__(self, "Update Artist Tags")
+
+  def run(self):
+    count = propagateRoster(self.sequence().project())
+    QtWidgets.QMessageBox.information(None, "Update Artist Tags", "Updated %d Artist tags from the roster." % count)
@@ -0,0 +1,69 @@
+# Batched tag edits, so bulk Bid/Artist changes refresh each sequence once instead of once per shot.
+
+# The stack of active EditBatch contexts
+_gBatches = []
+
+class EditBatch(object):
+  """
+    Context manager that defers sequence().editFinished() until the outermost batch
+    exits, then calls it once per affected sequence. Nest it inside
+    project.beginUndo(), so the refresh belongs to the same undo step:
+
+      with project.beginUndo("Set Bid"):
+        with EditBatch():
+          for shot in shots:
+            shot.setStatus('$350')
+  """
+
+  def __init__(self):
+    self._sequences = {}
+
+  def __enter__(self):
+    _gBatches.append(self)
+    return self
+
+  def __exit__(self, excType, excValue, traceback):
+    _gBatches.remove(self)
+    if _gBatches:
+      # Hand our sequences to the enclosing batch
+      _gBatches[-1]._sequences.update(self._sequences)
+    else:
+      for sequence in self._sequences.values():
+        sequence.editFinished()
+    self._sequences.clear()
+    return False
+
+  def add(self, sequence):
+    self._sequences[sequence.guid()] = sequence
+
+def sequenceEdited(sequence):
+  """
+    Tell Hiero a sequence was edited: now, or when the active EditBatch exits
+  """
+  if sequence is None:
+    return
+  if _gBatches:
+    _gBatches[-1].add(sequence)
+  else:
+    sequence.editFinished()
+
+def setStatusBulk(items, status):
+  """
+    Set the Status of many TrackItems, refreshing each affected sequence once
+  """
+  with EditBatch():
+    for item in items:
+      item.setStatus(status)
+
+def setArtistBulk(items, artist):
+  """
+    Assign an Artist (record, name or ID) to many TrackItems, refreshing each affected sequence once
+  """
+  with EditBatch():
+    for item in items:
+      if isinstance(artist, basestring):
+        item.setArtistByName(artist)
+      elif isinstance(artist, (int, long)):
+        item.setArtistByID(artist)
+      else:
+        item.updateArtistTag(artist)
@@ -0,0 +1,156 @@
+# The Bid list: Bid strings in numeric order, with their values and icons precomputed.
+
+# The icon used for Bids given as a plain list, with no icon of their own
+kDefaultStatusIcon = 'icons:status/TagReadyToStart.png'
+
+# Parsed values by Bid string, so each distinct string is only parsed once
+_gBidValues = {}
+
+def bidValue(status):
+  """
+    Return the integer value of a Bid string such as '$1,350', or None if it is not a number
+  """
+  if not status:
+    return None
+  try:
+    return _gBidValues[status]
+  except KeyError:
+    pass
+  try:
+    value = int(float(status.replace('$', '').replace(',', '').strip()))
+  except (ValueError, OverflowError):
+    # OverflowError for 'inf' or '1e400'
+    value = None
+  _gBidValues[status] = value
+  return value
+
+class Bid(object):
+  """
+    A compact Bid record: the Bid string, its numeric value (None if not a number),
+    its icon and its position in the BidRegistry
+  """
+  __slots__ = ('status', 'value', 'icon', 'index')
+
+  def __init__(self, status, icon=kDefaultStatusIcon):
+    self.status = status
+    self.value = bidValue(status)
+    self.icon = icon
+    self.index = None
+
+  def __repr__(self):
+    return 'Bid(%r, %r)' % (self.status, self.icon)
+
+class BidRegistry(object):
+  """
+    The Bid list, kept in numeric order whatever order the Bids were given in, with
+    O(1) lookups from Bid string to value, icon and index and back. Bids that are
+    not numbers follow the numeric ones, in the order they were added. Iterates over
+    the Bid strings like the old gStatusTags list, and accepts a {'Status':'Icon.png'}
+    dictionary, a list of Bid strings, or a list of (status, icon) pairs. version is
+    bumped on every change, so views of the list can tell when to rebuild.
+  """
+
+  def __init__(self, bids=()):
+    self._bids = []
+    self._byStatus = {}
+    self._serial = 0
+    self.version = 0
+    self.update(bids)
+
+  def add(self, status, icon=kDefaultStatusIcon):
+    """
+      Add a Bid, or change the icon of an existing one
+    """
+    self._add(status, icon)
+    self._reindex()
+
+  def update(self, bids):
+    """
+      Add the Bids of a dictionary, list of strings or list of (status, icon) pairs
+    """
+    if isinstance(bids, BidRegistry):
+      bids = [(bid.status, bid.icon) for bid in bids.bids()]
+    elif isinstance(bids, dict):
+      bids = bids.items()
+    for bid in bids:
+      if isinstance(bid, basestring):
+        self._add(bid, kDefaultStatusIcon)
+      else:
+        self._add(*bid)
+    self._reindex()
+
+  def remove(self, status):
+    bid = self._byStatus.pop(status)
+    self._bids.remove(bid)
+    self._reindex()
+
+  def _add(self, status, icon):
+    bid = self._byStatus.get(status)
+    if bid is not None:
+      bid.icon = icon
+      return
+    bid = self._byStatus[status] = Bid(status, icon)
+    self._serial+=1
+    bid.index = self._serial
+    self._bids.append(bid)
+
+  def _reindex(self):
+    # Numeric Bids first, by value; the rest in the order they were added
+    self._bids.sort(key=lambda bid: (bid.value is None, bid.value, bid.index))
+    for index, bid in enumerate(self._bids):
+      bid.index = index
+    self.version+=1
+
+  def bid(self, status):
+    """
+      Return the Bid record of a Bid string, or None
+    """
+    return self._byStatus.get(status)
+
+  def bids(self):
+    return list(self._bids)
+
+  def value(self, status):
+    """
+      Return the numeric value of a Bid string, or None
+    """
+    bid = self._byStatus.get(status)
+    if bid is None:
+      return bidValue(status)
+    return bid.value
+
+  def icon(self, status):
+    """
+      Return the icon path of a Bid string, or the default Status icon
+    """
+    bid = self._byStatus.get(status)
+    if bid is None:
+      return kDefaultStatusIcon
+    return bid.icon
+
+  def index(self, status):
+    """
+      Return the position of a Bid string in the list, or None
+    """
+    bid = self._byStatus.get(status)
+    if bid is None:
+      return None
+    return bid.index
+
+  def __setitem__(self, status, icon):
+    self.add(status, icon)
+
+  def __getitem__(self, key):
+    # gStatusTags['$100'] gives the icon, as the old dictionary did; gStatusTags[0] the first Bid
+    if isinstance(key, basestring):
+      return self._byStatus[key].icon
+    return self._bids[key].status
+
+  def __contains__(self, status):
+    return status in self._byStatus
+
+  def __iter__(self):
+    return iter([bid.status for bid in self._bids])
+
+  def __len__(self):
+    return len(self._bids)
@@ -0,0 +1,151 @@
+# Running Bid totals per sequence, artist and department, and a panel showing them.
+# A sequence is scanned once, then kept up to date from the tag changes reported by
+# the row cache and the guids of its shots, so asking for the totals does not
+# re-read the tags of every shot.
+import hiero.core
+import hiero.ui
+from PySide2 import (QtCore, QtWidgets)
+
+from . import config
+from .incremental import IncrementalIndex
+from .rowcache import gRowCache
+
+# The name used for shots with no Artist assigned
+kUnassigned = '--'
+
+class Totals(object):
+  """
+    A Bid total and the number of shots (and of shots with a Bid) it covers
+  """
+  __slots__ = ('total', 'shots', 'bidShots')
+
+  def __init__(self):
+    self.total = 0
+    self.shots = 0
+    self.bidShots = 0
+
+  def add(self, bid, sign):
+    self.shots+=sign
+    if bid is not None:
+      self.total+=sign*bid
+      self.bidShots+=sign
+
+class SequenceTotals(Totals):
+  """
+    The Totals of a sequence, broken down by artist name and by department
+  """
+  __slots__ = ('byArtist', 'byDepartment')
+
+  def __init__(self):
+    Totals.__init__(self)
+    self.byArtist = {}
+    self.byDepartment = {}
+
+  def addShot(self, contribution, sign):
+    bid, artistName, department = contribution
+    self.add(bid, sign)
+    for key, breakdown in ((artistName, self.byArtist), (department, self.byDepartment)):
+      totals = breakdown.get(key)
+      if totals is None:
+        totals = breakdown[key] = Totals()
+      totals.add(bid, sign)
+      if totals.shots == 0:
+        del breakdown[key]
+
+def contribution(item):
+  """
+    Return the (bid, artist name, department) a TrackItem adds to the totals
+  """
+  rowData = gRowCache.row(item)
+  bid = config.gStatusTags.value(rowData.status)
+  artist = rowData.artist
+  if artist is None:
+    return (bid, kUnassigned, kUnassigned)
+  return (bid, artist['artistName'], rowData.department or kUnassigned)
+
+class BidTotals(IncrementalIndex):
+  """
+    Bid totals of each sequence that has been asked for, kept up to date as an
+    IncrementalIndex. Listeners are told whenever the totals may have changed.
+  """
+
+  def __init__(self, rowCache=gRowCache):
+    IncrementalIndex.__init__(self, rowCache)
+    self._listeners = []
+
+  def addListener(self, listener):
+    """
+      listener() is called whenever the totals may have changed
+    """
+    self._listeners.append(listener)
+
+  def removeListener(self, listener):
+    if listener in self._listeners:
+      self._listeners.remove(listener)
+
+  def totals(self, sequence):
+    """
+      Return the SequenceTotals of a sequence, scanning it the first time
+    """
+    return self.lookup(sequence)
+
+  def newSequence(self):
+    return SequenceTotals()
+
+  def derive(self, item):
+    return contribution(item)
+
+  def apply(self, totals, guid, item, shot, sign):
+    totals.addShot(shot, sign)
+
+  def _tagsChanged(self, item):
+    IncrementalIndex._tagsChanged(self, item)
+    for listener in self._listeners:
+      listener()
+
+gBidTotals = BidTotals()
+
+# Dockable panel showing the Bid totals of the active sequence
+class BidTotalsPanel(QtWidgets.QWidget):
+
+  def __init__(self, bidTotals=gBidTotals):
+    QtWidgets.QWidget.__init__(self)
+    self.setObjectName('customSpreadsheet.BidTotals')
+    self.setWindowTitle('Bid Totals')
+    self._bidTotals = bidTotals
+    self._refreshScheduled = False
+
+    layout = QtWidgets.QVBoxLayout(self)
+    self._summary = QtWidgets.QLabel()
+    layout.addWidget(self._summary)
+    self._tree = QtWidgets.QTreeWidget()
+    self._tree.setHeaderLabels(['Name', 'Shots', 'Bid'])
+    layout.addWidget(self._tree)
+
+    bidTotals.addListener(self.scheduleRefresh)
+    hiero.core.events.registerInterest(hiero.core.events.EventType.kContextChanged, self.scheduleRefresh)
+
+  def scheduleRefresh(self, *args):
+    # Coalesce the refreshes of a bulk edit into one, and skip them while hidden
+    if self._refreshScheduled or not self.isVisible():
+      return
+    self._refreshScheduled = True
+    QtCore.QTimer.singleShot(200, self.refresh)
+
+  def showEvent(self, event):
+    self.refresh()
+
+  def refresh(self):
+    self._refreshScheduled = False
+    self._tree.clear()
+    sequence = hiero.ui.activeSequence()
+    if sequence is None:
+      self._summary.setText('No active sequence')
+      return
+    totals = self._bidTotals.totals(sequence)
+    self._summary.setText('%s: $%d over %d of %d shots' % (sequence.name(), totals.total, totals.bidShots, totals.shots))
+    for title, breakdown in (('Artists', totals.byArtist), ('Departments', totals.byDepartment)):
+      parent = QtWidgets.QTreeWidgetItem(self._tree, [title])
+      for name in sorted(breakdown):
+        QtWidgets.QTreeWidgetItem(parent, [name, str(breakdown[name].shots), '$%d' % breakdown[name].total])
+      parent.setExpanded(True)
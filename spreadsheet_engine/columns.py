@@ -0,0 +1,370 @@
+# Custom Spreadsheet columns: the Column hooks, the built-in columns, and the
+# CustomSpreadsheetColumns engine that Hiero calls back into.
+import hiero.core
+import hiero.ui
+from PySide2 import (QtCore, QtWidgets, QtGui)
+
+from . import lazy
+from . import media
+from . import values
+from .batch import (setStatusBulk, setArtistBulk)
+from .editormodels import (gBidModel, gArtistModel)
+from .icons import gIconCache
+from .rowcache import gRowCache
+from .selection import peekTrackItems
+
+# The background of cells whose source media is missing
+kMissingMediaColour = QtGui.QColor(80, 20, 20)
+
+class Column(object):
+  """
+    A custom Spreadsheet column. Override the hooks you need and register the column
+    with a ColumnRegistry. Every hook is given the cached RowData of the TrackItem,
+    so a column should read its values from rowData rather than walking item.tags().
+    An expensive column's data() is only called for rows on or near the screen; other
+    rows show its placeholder until the value has been computed in the background.
+  """
+  name = None
+  cellType = 'readonly'
+  expensive = False
+  placeholder = ''
+
+  def __init__(self, name=None, cellType=None):
+    if name is not None:
+      self.name = name
+    if cellType is not None:
+      self.cellType = cellType
+
+  def data(self, rowData, item):
+    """
+      Return the text in a cell
+    """
+    return ""
+
+  def tooltip(self, rowData, item):
+    """
+      Return the tooltip for a cell
+    """
+    return ""
+
+  def icon(self, rowData, item):
+    """
+      Return the icon for a cell, or None
+    """
+    return None
+
+  def paint(self, rowData, item, painter, option):
+    """
+      Paint a cell. Return True if the cell was painted, or False to continue
+      with the default cell painting.
+    """
+    return False
+
+  def createEditor(self, item, view):
+    """
+      Create an editing widget for a cell. Read-only columns get a hidden, disabled label.
+    """
+    if self.cellType == 'readonly':
+      cle = QtWidgets.QLabel()
+      cle.setEnabled(False)
+      cle.setVisible(False)
+      return cle
+    return None
+
+class TagsColumn(Column):
+  name = 'Tags'
+
+  def data(self, rowData, item):
+    return values.tagsText(rowData.tagNames)
+
+  def tooltip(self, rowData, item):
+    return str(rowData.tagNames)
+
+  def paint(self, rowData, item, painter, option):
+    if len(rowData.tagNames) == 0:
+      return False
+    if option.state & QtWidgets.QStyle.State_Selected:
+      painter.fillRect(option.rect, option.palette.highlight())
+    iconSize = gIconCache.size
+    r = QtCore.QRect(option.rect.x(), option.rect.y()+(option.rect.height()-iconSize)/2, iconSize, iconSize)
+    painter.save()
+    painter.setClipRect(option.rect)
+    for iconPath in rowData.iconPaths:
+      gIconCache.paint(painter, r, iconPath)
+      r.translate(r.width()+2, 0)
+    painter.restore()
+    return True
+
+class NotesColumn(Column):
+  name = 'Notes'
+  expensive = True
+
+  def data(self, rowData, item):
+    return rowData.notes
+
+  def tooltip(self, rowData, item):
+    return str(rowData.notes)
+
+class BidColumn(Column):
+  name = 'Bid'
+  cellType = 'dropdown'
+
+  def data(self, rowData, item):
+    return values.bidText(rowData.status)
+
+  def createEditor(self, item, view):
+    cb = QtWidgets.QComboBox()
+    cb.setModel(gBidModel.model())
+    cb.currentIndexChanged.connect(lambda index: self.statusChanged(cb.currentText()))
+    return cb
+
+  def statusChanged(self, status):
+    """
+      This method is called when Shot Status widget changes index.
+    """
+    view = hiero.ui.activeView()
+    firstItem, selection = peekTrackItems(view.selection())
+    if firstItem is None:
+      return
+    project = firstItem.project()
+    with project.beginUndo("Set Status"):
+      # A string of '--' characters denotes clear the status
+      if status != '--':
+        setStatusBulk(selection, status)
+      else:
+        for trackItem in selection:
+          statusTag = trackItem.tagSummary(cached=False).statusTag
+          if statusTag:
+            trackItem.removeTag(statusTag)
+
+class ArtistColumn(Column):
+  name = 'Artist'
+  cellType = 'dropdown'
+
+  def data(self, rowData, item):
+    return values.artistText(rowData.artist)
+
+  def icon(self, rowData, item):
+    if rowData.artist:
+      return gIconCache.icon(rowData.artist['artistIcon'])
+    return None
+
+  def createEditor(self, item, view):
+    cb = QtWidgets.QComboBox()
+    cb.setModel(gArtistModel.model())
+    cb.currentIndexChanged.connect(lambda index: self.artistNameChanged(cb.currentText()))
+    return cb
+
+  def artistNameChanged(self, name):
+    """
+      This method is called when Artist widget changes index.
+    """
+    view = hiero.ui.activeView()
+    firstItem, selection = peekTrackItems(view.selection())
+    if firstItem is None:
+      return
+    project = firstItem.project()
+    with project.beginUndo("Assign Artist"):
+      # A string of '--' denotes clear the assignee...
+      if name != '--':
+        setArtistBulk(selection, name)
+      else:
+        for trackItem in selection:
+          artistTag = trackItem.tagSummary(cached=False).artistTag
+          if artistTag:
+            trackItem.removeTag(artistTag)
+
+class DepartmentColumn(Column):
+  name = 'Department'
+
+  def data(self, rowData, item):
+    # Read from the Artist tag, which roster reloads and the propagation job keep up to date
+    return values.departmentText(rowData.department)
+
+class ColumnRegistry(object):
+  """
+    The ordered set of Columns shown in the Spreadsheet. Each time a column is
+    registered, the column hooks are resolved into index->handler tables, so the
+    per-cell callbacks are a single list lookup.
+  """
+
+  def __init__(self, columns=()):
+    self._columns = list(columns)
+    self._resolve()
+
+  def register(self, column, index=None):
+    """
+      Add a Column, at the end or at a given index
+    """
+    if index is None:
+      self._columns.append(column)
+    else:
+      self._columns.insert(index, column)
+    self._resolve()
+
+  def unregister(self, name):
+    """
+      Remove the Column with the given name
+    """
+    self._columns = [column for column in self._columns if column.name != name]
+    self._resolve()
+
+  def column(self, name):
+    for column in self._columns:
+      if column.name == name:
+        return column
+    return None
+
+  def _resolve(self):
+    columns = self._columns
+    self.names = [column.name for column in columns]
+    self.dataHandlers = [column.data for column in columns]
+    self.tooltipHandlers = [column.tooltip for column in columns]
+    self.iconHandlers = [column.icon for column in columns]
+    self.paintHandlers = [column.paint for column in columns]
+    self.editorHandlers = [column.createEditor for column in columns]
+    self.expensive = [column.expensive for column in columns]
+
+  def __iter__(self):
+    return iter(self._columns)
+
+  def __len__(self):
+    return len(self._columns)
+
+  def __getitem__(self, index):
+    return self._columns[index]
+
+# The Custom Spreadsheet Columns
+class CustomSpreadsheetColumns(QtCore.QObject):
+  """
+    A class defining custom columns for Spreadsheet view. This has a similar, but
+    slightly simplified, interface to the QAbstractItemModel and QItemDelegate classes.
+    The cell callbacks dispatch straight to the handlers of the ColumnRegistry.
+  """
+
+  # The cache of tag-derived row values, call rowCache.stats() to check it is working
+  rowCache = gRowCache
+
+  # The background-probed media presence of each source clip
+  mediaCache = media.gMediaCache
+
+  # The rows painted in the last frame, and the background-computed expensive cells
+  visibleRows = lazy.gVisibleRows
+  lazyValues = lazy.gLazyValues
+
+  def __init__(self, columns=()):
+    QtCore.QObject.__init__(self)
+    self.currentView = hiero.ui.activeView()
+    if not isinstance(columns, ColumnRegistry):
+      columns = ColumnRegistry(columns)
+    self.columns = columns
+
+  def numColumns(self):
+    """
+      Return the number of custom columns in the spreadsheet view
+    """
+    return len( self.columns )
+
+  def columnName(self, column):
+    """
+      Return the name of a custom column
+    """
+    return self.columns.names[column]
+
+  def getTagsString(self,item):
+    """
+      Convenience method for returning all the Tag names of an item as a string
+    """
+    return ','.join(self.rowCache.row(item).tagNames)
+
+  def getNotes(self,item):
+    """
+      Convenience method for returning all the Notes in a Tag as a string
+    """
+    return self.rowCache.row(item).notes
+
+  def getData(self, row, column, item):
+    """
+      Return the data in a cell
+    """
+    self.visibleRows.touch(row)
+    if self.columns.expensive[column]:
+      return self.lazyValues.data(self, row, column, item)
+    return self.columns.dataHandlers[column](self.rowCache.row(item), item)
+
+  def getTooltip(self, row, column, item):
+    """
+      Return the tooltip for a cell
+    """
+    return self.columns.tooltipHandlers[column](self.rowCache.row(item), item)
+
+  def getBackground(self, row, column, item):
+    """
+      Return the background colour for a cell
+    """
+    present = self.mediaCache.isMediaPresent(item)
+    if present is None:
+      return media.kMediaPendingColour
+    if not present:
+      return kMissingMediaColour
+    return None
+
+  def getForeground(self, row, column, item):
+    """
+      Return the foreground colour for a cell
+    """
+    return None
+
+  def getFont(self, row, column, item):
+    """
+      Return the font for a cell
+    """
+    return None
+
+  def setData(self, row, column, item, data):
+    """
+      Set the data in a cell - unused in this example
+    """
+
+    return None
+
+  def getIcon(self, row, column, item):
+    """
+      Return the icon for a cell
+    """
+    return self.columns.iconHandlers[column](self.rowCache.row(item), item)
+
+  def getSizeHint(self, row, column, item):
+    """
+      Return the size hint for a cell
+    """
+
+    return QtCore.QSize(20, 20)
+
+  def paintCell(self, row, column, item, painter, option):
+    """
+      Paint a custom cell. Return True if the cell was painted, or False to continue
+      with the default cell painting.
+    """
+    return self.columns.paintHandlers[column](self.rowCache.row(item), item, painter, option)
+
+  def createEditor(self, row, column, item, view):
+    """
+      Create an editing widget for a custom cell
+    """
+    self.currentView = view
+    return self.columns.editorHandlers[column](item, view)
+
+  def setModelData(self, row, column, item, editor):
+    return False
+
+
+  def dropMimeData(self, row, column, item, data, items):
+    """
+      Handle a drag and drop operation - adds a Dragged Tag to the shot
+    """
+    for thing in items:
+      if isinstance(thing,hiero.core.Tag):
+        item.addTag(thing)
+    self.rowCache.invalidate(item)
+    return None
@@ -0,0 +1,30 @@
+# The Bid list and Artist roster the engine works from. These are set by
+# spreadsheet_engine.install() from the column set being loaded, e.g.
+# custom_spreadsheet.py or matt_custom_spreadsheet.py, or by configure() in scripts
+# that run without Hiero's UI.
+from .artists import ArtistRegistry
+from .bids import BidRegistry
+
+# The BidRegistry of Status strings, in numeric order
+gStatusTags = BidRegistry()
+
+# The ArtistRegistry of assignable Artists
+gArtistList = ArtistRegistry()
+
+def statusIcon(status):
+  """
+    Return the icon path for a Status string
+  """
+  return gStatusTags.icon(status)
+
+def configure(statusTags, artistList):
+  """
+    Make statusTags (a BidRegistry, dictionary or list) and the ArtistRegistry
+    artistList the Bid list and Artist roster the engine works from
+  """
+  global gStatusTags
+  global gArtistList
+  if not isinstance(statusTags, BidRegistry):
+    statusTags = BidRegistry(statusTags)
+  gStatusTags = statusTags
+  gArtistList = artistList
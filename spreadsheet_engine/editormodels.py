@@ -0,0 +1,57 @@
+# Shared item models for the Bid and Artist combobox editors. Each editor attaches to
+# the shared model instead of building its own items (and icons) every time.
+from PySide2 import QtGui
+
+from . import config
+from .icons import gIconCache
+
+class ChoiceModel(object):
+  """
+    A lazily built QStandardItemModel of editor choices: a blank entry, the choices,
+    and '--' (clear). It is rebuilt only when signature() changes.
+  """
+
+  def __init__(self, choices, signature):
+    self._choices = choices
+    self._signature = signature
+    self._model = None
+    self._built = None
+
+  def model(self):
+    """
+      Return the shared model, rebuilding it if its source list has changed
+    """
+    signature = self._signature()
+    if self._model is None or signature != self._built:
+      self._model = self._build()
+      self._built = signature
+    return self._model
+
+  def invalidate(self):
+    self._model = None
+
+  def _build(self):
+    model = QtGui.QStandardItemModel()
+    model.appendRow(QtGui.QStandardItem(''))
+    for text, icon in self._choices():
+      if icon:
+        model.appendRow(QtGui.QStandardItem(gIconCache.icon(icon), text))
+      else:
+        model.appendRow(QtGui.QStandardItem(text))
+    model.appendRow(QtGui.QStandardItem('--'))
+    return model
+
+def _bidChoices():
+  return [(status, config.statusIcon(status)) for status in config.gStatusTags]
+
+def _bidSignature():
+  return (id(config.gStatusTags), config.gStatusTags.version)
+
+def _artistChoices():
+  return [(artist['artistName'], None) for artist in config.gArtistList]
+
+def _artistSignature():
+  return (id(config.gArtistList), config.gArtistList.version)
+
+gBidModel = ChoiceModel(_bidChoices, _bidSignature)
+gArtistModel = ChoiceModel(_artistChoices, _artistSignature)
@@ -0,0 +1,100 @@
+# Streaming export of the custom column values of every shot in a project, to CSV,
+# JSON Lines or SQLite. Rows are generated one TrackItem at a time and written as they
+# are produced, so memory use does not grow with the size of the project.
+import os
+from collections import OrderedDict
+
+import hiero.ui
+from PySide2 import (QtCore, QtWidgets)
+
+from .menus import ContextMenuAction
+from .rowcache import (RowData, gRowCache)
+from .values import kShotFields
+from .writers import (kRowWriters, trackItems)
+
+# Rows written between calls to the progress callback, so a large sequence can be cancelled
+kProgressRows = 500
+
+def rowValues(item, columns):
+  """
+    Return the values of every column for a TrackItem, exactly as getData shows them.
+    Uses the cached RowData when there is one, but does not add to the cache.
+  """
+  rowData = gRowCache.cached(item) or RowData(item)
+  return [handler(rowData, item) for handler in columns.dataHandlers]
+
+def sequenceRows(sequence, columns):
+  """
+    Yield an OrderedDict of shot fields and column values per TrackItem of a sequence
+  """
+  sequenceName = sequence.name()
+  for track, item in trackItems(sequence):
+    row = OrderedDict(zip(kShotFields, (sequenceName, track.name(), item.name())))
+    row.update(zip(columns.names, rowValues(item, columns)))
+    yield row
+
+def exportRows(project, columns):
+  """
+    Yield the rows of every sequence of a project
+  """
+  for sequence in project.sequences():
+    for row in sequenceRows(sequence, columns):
+      yield row
+
+def exportProject(project, path, columns=None, progress=None):
+  """
+    Write the custom column values of every shot in a project to path. The format is
+    picked from the extension: .csv, .jsonl/.json (JSON Lines) or .db/.sqlite.
+    columns defaults to the ColumnRegistry of the installed custom columns.
+    progress(sequencesDone, sequenceCount, rowsWritten) is called every kProgressRows
+    rows and after each sequence, and the export stops early if it returns False.
+    Returns the number of rows written.
+  """
+  if columns is None:
+    columns = hiero.ui.customColumn.columns
+  writerClass = kRowWriters.get(os.path.splitext(path)[1].lower())
+  if writerClass is None:
+    raise ValueError('Unsupported export format: %s' % path)
+
+  sequences = project.sequences()
+  writer = writerClass(path, list(kShotFields)+list(columns.names))
+  rowsWritten = 0
+  try:
+    for index, sequence in enumerate(sequences):
+      for row in sequenceRows(sequence, columns):
+        writer.write(row)
+        rowsWritten+=1
+        if progress is not None and rowsWritten % kProgressRows == 0:
+          if progress(index, len(sequences), rowsWritten) is False:
+            return rowsWritten
+      if progress is not None and progress(index+1, len(sequences), rowsWritten) is False:
+        break
+  finally:
+    writer.close()
+  return rowsWritten
+
+# 'Export Custom Columns...' action for the Timeline and Spreadsheet right-click menus
+class ExportColumnsAction(ContextMenuAction):
+
+  needsSequence = True
+
+  def __init__(self):
+      ContextMenuAction.__init__(self, "Export Custom Columns...")
+
+  def run(self):
+    path, _ = QtWidgets.QFileDialog.getSaveFileName(None, "Export Custom Columns", "",
+                                                    "CSV (*.csv);;JSON Lines (*.jsonl);;SQLite (*.db)")
+    if not path:
+      return
+    project = self.sequence().project()
+    dialog = QtWidgets.QProgressDialog("Exporting custom columns...", "Cancel", 0, len(project.sequences()))
+    dialog.setWindowModality(QtCore.Qt.WindowModal)
+
+    def progress(sequencesDone, sequenceCount, rowsWritten):
+      dialog.setValue(sequencesDone)
+      dialog.setLabelText("Exported %d shots" % rowsWritten)
+      QtWidgets.QApplication.processEvents()
+      return not dialog.wasCanceled()
+
+    exportProject(project, path, progress=progress)
+    dialog.close()
@@ -0,0 +1,229 @@
+# Hiero-free reader of the shots and their Bid and Artist tags in a .hrox project file,
+# for reports and CI checks that run without Nuke Studio. The XML is streamed with
+# iterparse and each element is dropped once read, so memory use stays bounded on
+# projects of hundreds of MB. Rows are built with the same RowData and value formatting
+# as the Spreadsheet columns, so they match what the Spreadsheet shows.
+#
+#   python -m spreadsheet_engine.hrox project.hrox [--output shots.csv]
+import argparse
+import csv
+import gzip
+import json
+import sys
+from collections import OrderedDict
+
+try:
+  import xml.etree.cElementTree as ElementTree
+except ImportError:
+  import xml.etree.ElementTree as ElementTree
+
+from .artists import ArtistRegistry
+from .rowcache import RowData
+from .tags import (kArtistIDKey, kArtistNameKey, kArtistDepartmentKey)
+from .values import (kShotFields, reportValues)
+from .writers import utf8
+
+# Metadata key of a tag's note
+kNoteKey = 'tag.note'
+
+# The elements read from a .hrox: the containers a shot is found in, the shot, and its tags
+kSequenceElement = 'Sequence'
+kTrackElements = ('VideoTrack', 'AudioTrack')
+kTrackItemElement = 'TrackItem'
+kTagElement = 'Tag'
+kSetElement = 'Set'
+
+def _localName(tag):
+  # Element tags may carry a {namespace} prefix
+  return tag.rpartition('}')[2]
+
+def _objectName(element):
+  return element.get('name') or element.get('objName') or ''
+
+class HroxMetadata(object):
+  """
+    The metadata of a tag read from a .hrox, with the hasKey()/value() of hiero.core.Metadata
+  """
+  __slots__ = ('_values',)
+
+  def __init__(self):
+    self._values = {}
+
+  def hasKey(self, key):
+    return key in self._values
+
+  def value(self, key):
+    return self._values[key]
+
+  def setValue(self, key, value):
+    self._values[key] = value
+
+  def keys(self):
+    return self._values.keys()
+
+class HroxTag(object):
+  """
+    A tag read from a .hrox, with the name()/note()/icon()/guid()/metadata() of hiero.core.Tag
+  """
+  __slots__ = ('_name', '_icon', '_note', '_guid', '_metadata')
+
+  def __init__(self, name, icon='', note=None, guid=''):
+    self._name = name
+    self._guid = guid
+    self._icon = icon
+    self._note = note
+    self._metadata = HroxMetadata()
+
+  def name(self):
+    return self._name
+
+  def icon(self):
+    return self._icon
+
+  def guid(self):
+    return self._guid
+
+  def note(self):
+    if self._note is not None:
+      return self._note
+    if self._metadata.hasKey(kNoteKey):
+      return self._metadata.value(kNoteKey)
+    return ''
+
+  def metadata(self):
+    return self._metadata
+
+class HroxTrackItem(object):
+  """
+    A shot read from a .hrox: its sequence, track, name, guid and tags, with the
+    TrackItem methods RowData needs. Artists are looked up in artistList when given;
+    otherwise the artist record is the one copied into the Artist tag.
+  """
+
+  def __init__(self, sequenceName, trackName, name, guid, artistList=None):
+    self.sequenceName = sequenceName
+    self.trackName = trackName
+    self._name = name
+    self._guid = guid
+    self._tags = []
+    self._artistList = artistList
+
+  def name(self):
+    return self._name
+
+  def guid(self):
+    return self._guid
+
+  def tags(self):
+    return self._tags
+
+  def addTag(self, tag):
+    self._tags.append(tag)
+
+  def getArtistFromID(self, artistID):
+    if self._artistList is not None:
+      return self._artistList.fromID(artistID)
+    for tag in self._tags:
+      M = tag.metadata()
+      if M.hasKey(kArtistIDKey) and M.value(kArtistIDKey) == artistID:
+        return {'artistID': artistID,
+                'artistName': M.value(kArtistNameKey) if M.hasKey(kArtistNameKey) else str(artistID),
+                'artistDepartment': M.value(kArtistDepartmentKey) if M.hasKey(kArtistDepartmentKey) else None,
+                'artistIcon': tag.icon()}
+    return None
+
+def _open(path):
+  # Projects may be saved gzip-compressed
+  with open(path, 'rb') as f:
+    compressed = f.read(2) == '\x1f\x8b'
+  return gzip.open(path, 'rb') if compressed else open(path, 'rb')
+
+def iterHroxTrackItems(path, artistList=None):
+  """
+    Yield a HroxTrackItem, with its tags, for each shot of a .hrox, in file order.
+    Tag metadata is read from the Set/Value elements of each Tag; a value named
+    without a domain, e.g. 'artistID', gets that of its Set, e.g. 'tag.artistID'.
+  """
+  sequenceName = trackName = ''
+  item = tag = None
+  itemElement = tagElement = None
+  domains = []
+  parents = []
+  with _open(path) as f:
+    for event, element in ElementTree.iterparse(f, events=('start', 'end')):
+      name = _localName(element.tag)
+      if event == 'start':
+        parents.append(element)
+        if name == kSequenceElement:
+          sequenceName = _objectName(element)
+        elif name in kTrackElements:
+          trackName = _objectName(element)
+        elif name == kTrackItemElement and item is None:
+          item = HroxTrackItem(sequenceName, trackName, _objectName(element), element.get('guid', ''), artistList)
+          itemElement = element
+        elif name == kTagElement and item is not None and tag is None:
+          tag = HroxTag(_objectName(element), element.get('icon', ''), element.get('note'), element.get('guid', ''))
+          tagElement = element
+        elif name == kSetElement:
+          domains.append(element.get('domainroot') or element.get('title') or 'tag')
+        continue
+
+      # Each element is read at its end, then detached from its parent so the tree never grows
+      parents.pop()
+      if element is tagElement:
+        item.addTag(tag)
+        tag = tagElement = None
+      elif element is itemElement:
+        yield item
+        item = itemElement = None
+      elif tag is not None and element.get('value') is not None and _objectName(element):
+        key = _objectName(element)
+        if '.' not in key:
+          key = '%s.%s' % (domains[-1] if domains else 'tag', key)
+        tag.metadata().setValue(key, element.get('value'))
+      elif name == kSetElement and domains:
+        domains.pop()
+      element.clear()
+      if parents:
+        parents[-1].remove(element)
+
+def hroxRows(path, artistList=None):
+  """
+    Yield an OrderedDict of the shot fields and report values (values.kReportFields)
+    of each shot of a .hrox, formatted as the Spreadsheet columns show them
+  """
+  for item in iterHroxTrackItems(path, artistList):
+    row = OrderedDict(zip(kShotFields, (item.sequenceName, item.trackName, item.name())))
+    row.update(reportValues(RowData(item)))
+    yield row
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='List the Bids and Artists of the shots of .hrox projects')
+  parser.add_argument('projects', nargs='+', help='.hrox project files')
+  parser.add_argument('--output', default=None, help='.csv or .jsonl file (default: CSV to stdout)')
+  parser.add_argument('--roster', default=None, help='Artist roster file to look Artists up in')
+  args = parser.parse_args(argv)
+
+  artistList = ArtistRegistry.fromFile(args.roster) if args.roster else None
+  output = open(args.output, 'wb') if args.output else sys.stdout
+  jsonLines = bool(args.output) and args.output.lower().endswith(('.jsonl', '.json'))
+  writer = None
+  try:
+    for path in args.projects:
+      for shotRow in hroxRows(path, artistList):
+        row = OrderedDict([('Project', path)])
+        row.update(shotRow)
+        if jsonLines:
+          output.write(json.dumps(row)+'\n')
+          continue
+        if writer is None:
+          writer = csv.writer(output)
+          writer.writerow(row.keys())
+        writer.writerow([utf8(value) for value in row.values()])
+  finally:
+    if output is not sys.stdout:
+      output.close()
+  return 0
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,85 @@
+# Process-wide cache of the Tag, Status and Artist icons, pre-rasterised at the cell size.
+from collections import OrderedDict
+
+from PySide2 import (QtGui, QtWidgets)
+
+# The icon size used in the Spreadsheet cells, menus and editors
+kIconSize = 20
+
+# Upper bound on the memory held by cached pixmaps
+kIconCacheMaxBytes = 16*1024*1024
+
+class IconCache(object):
+  """
+    An LRU cache of icons, keyed by icon path and device pixel ratio. Each icon is
+    rasterised once at kIconSize, so painting a cell is a single drawPixmap. The
+    least recently used pixmaps are dropped once maxBytes is exceeded.
+  """
+
+  def __init__(self, size=kIconSize, maxBytes=kIconCacheMaxBytes):
+    self.size = size
+    self.maxBytes = maxBytes
+    self._entries = OrderedDict()
+    self._bytes = 0
+    self.hits = 0
+    self.misses = 0
+
+  def pixmap(self, path, devicePixelRatio=None):
+    """
+      Return the QPixmap of an icon path, sized for a cell at the given device pixel ratio
+    """
+    return self._entry(path, devicePixelRatio)[0]
+
+  def icon(self, path, devicePixelRatio=None):
+    """
+      Return a QIcon of an icon path, e.g. for menus and combobox editors
+    """
+    return self._entry(path, devicePixelRatio)[1]
+
+  def paint(self, painter, rect, path):
+    """
+      Paint the icon of a path into rect, at the pixel ratio of the painter's device
+    """
+    pixmap = self.pixmap(path, painter.device().devicePixelRatioF())
+    if not pixmap.isNull():
+      painter.drawPixmap(rect, pixmap)
+
+  def clear(self):
+    self._entries.clear()
+    self._bytes = 0
+
+  def stats(self):
+    return {'hits' : self.hits,
+            'misses' : self.misses,
+            'size' : len(self._entries),
+            'bytes' : self._bytes}
+
+  def _entry(self, path, devicePixelRatio):
+    if devicePixelRatio is None:
+      app = QtWidgets.QApplication.instance()
+      devicePixelRatio = app.devicePixelRatio() if app else 1.0
+    key = (path, devicePixelRatio)
+    entry = self._entries.pop(key, None)
+    if entry is not None:
+      # Re-inserting moves the entry to the most recently used end
+      self._entries[key] = entry
+      self.hits+=1
+      return entry
+    self.misses+=1
+    entry = self._rasterise(path, devicePixelRatio)
+    self._entries[key] = entry
+    self._bytes+=entry[2]
+    while self._bytes > self.maxBytes and len(self._entries) > 1:
+      _, evicted = self._entries.popitem(last=False)
+      self._bytes-=evicted[2]
+    return entry
+
+  def _rasterise(self, path, devicePixelRatio):
+    pixels = int(round(self.size*devicePixelRatio))
+    pixmap = QtGui.QIcon(path).pixmap(pixels, pixels)
+    if not pixmap.isNull():
+      pixmap.setDevicePixelRatio(devicePixelRatio)
+    icon = QtGui.QIcon(pixmap)
+    return (pixmap, icon, pixmap.width()*pixmap.height()*4)
+
+gIconCache = IconCache()
@@ -0,0 +1,217 @@
+# Bulk import of Bids and Artist assignments from CSV or JSON files.
+# Rows are streamed from the file and applied as they are read, so memory use does
+# not grow with the size of the file.
+import csv
+import json
+import os
+
+from PySide2 import QtWidgets
+
+from . import config
+from .batch import EditBatch
+from .menus import ContextMenuAction
+
+# Field names of an import row, matched case-insensitively, e.g. a CSV header of: Shot,Bid,Artist
+kShotField = 'shot'
+kBidField = 'bid'
+kArtistField = 'artist'
+
+# Number of unmatched/invalid rows kept in an ImportReport, the rest are only counted
+kMaxReportedRows = 100
+
+# Bytes read at a time when streaming a JSON array
+kJSONChunkSize = 64*1024
+
+def _iterJSONArray(fileobj, firstChunk):
+  """
+    Yield the objects of a top-level JSON array without loading the whole file
+  """
+  decoder = json.JSONDecoder()
+  buf = firstChunk.lstrip()[1:]
+  eof = False
+  while True:
+    buf = buf.lstrip().lstrip(',').lstrip()
+    if buf.startswith(']'):
+      return
+    try:
+      obj, end = decoder.raw_decode(buf)
+    except ValueError:
+      if eof:
+        raise ValueError('Truncated JSON array')
+      chunk = fileobj.read(kJSONChunkSize)
+      eof = not chunk
+      buf+=chunk
+      continue
+    yield obj
+    buf = buf[end:]
+
+def _jsonRow(lineNumber, obj):
+  if not isinstance(obj, dict):
+    return lineNumber, None, 'not a JSON object'
+  return lineNumber, dict((key.strip().lower(), value) for key, value in obj.items()), None
+
+def readRows(path):
+  """
+    Yield (lineNumber, row dictionary, error) from a CSV file, a JSON array of objects
+    or JSON Lines (one object per line). lineNumber is the index of the row in a JSON
+    array. Field names are lower-cased. A row that cannot be read has a row of None
+    and the reason as its error; the rest of the file is still read, except after a
+    malformed element of a JSON array, or a CSV header without a shot column.
+  """
+  if os.path.splitext(path)[1].lower() == '.csv':
+    with open(path, 'rb') as f:
+      reader = csv.DictReader(f)
+      fieldNames = [name.strip().lower() for name in reader.fieldnames or ()]
+      if kShotField not in fieldNames:
+        yield 1, None, 'no %s column in the header' % kShotField
+        return
+      reader.fieldnames = fieldNames
+      for row in reader:
+        yield reader.line_num, row, None
+    return
+
+  with open(path, 'rb') as f:
+    firstChunk = f.read(kJSONChunkSize)
+    if firstChunk.lstrip().startswith('['):
+      rowNumber = 0
+      try:
+        for obj in _iterJSONArray(f, firstChunk):
+          rowNumber+=1
+          yield _jsonRow(rowNumber, obj)
+      except ValueError as e:
+        yield rowNumber+1, None, 'not valid JSON (%s), the rest of the file was skipped' % e
+      return
+    f.seek(0)
+    for lineNumber, line in enumerate(f):
+      line = line.strip()
+      if not line:
+        continue
+      try:
+        obj = json.loads(line)
+      except ValueError as e:
+        yield lineNumber+1, None, 'not valid JSON (%s)' % e
+        continue
+      yield _jsonRow(lineNumber+1, obj)
+
+def shotIndex(sequence):
+  """
+    Return a {shot name: [TrackItems]} index of the video tracks of a sequence
+  """
+  index = {}
+  for track in sequence.videoTracks():
+    for item in track.items():
+      index.setdefault(item.name(), []).append(item)
+  return index
+
+def _value(row, field):
+  value = row.get(field)
+  if value is None:
+    return ''
+  if isinstance(value, unicode):
+    value = value.encode('utf-8')
+  return str(value).strip()
+
+def _status(value):
+  if value in config.gStatusTags:
+    return value
+  # Production sheets often leave the currency symbol off
+  if '$'+value in config.gStatusTags:
+    return '$'+value
+  return None
+
+class ImportReport(object):
+  """
+    The outcome of an import: how many rows were applied, and which were unmatched or invalid
+  """
+
+  def __init__(self):
+    self.rows = 0
+    self.applied = 0
+    self.unmatchedCount = 0
+    self.invalidCount = 0
+    self.unmatched = []
+    self.invalid = []
+
+  def addUnmatched(self, lineNumber, shot):
+    self.unmatchedCount+=1
+    if len(self.unmatched) < kMaxReportedRows:
+      self.unmatched.append((lineNumber, shot))
+
+  def addInvalid(self, lineNumber, reason):
+    self.invalidCount+=1
+    if len(self.invalid) < kMaxReportedRows:
+      self.invalid.append((lineNumber, reason))
+
+  def summary(self):
+    lines = ['%d rows read, %d applied, %d unmatched, %d invalid.' % (self.rows, self.applied, self.unmatchedCount, self.invalidCount)]
+    for lineNumber, shot in self.unmatched:
+      lines.append('Row %d: no shot named %s' % (lineNumber, shot))
+    for lineNumber, reason in self.invalid:
+      lines.append('Row %d: %s' % (lineNumber, reason))
+    if self.unmatchedCount+self.invalidCount > len(self.unmatched)+len(self.invalid):
+      lines.append('...')
+    return '\n'.join(lines)
+
+def importAssignments(path, sequence):
+  """
+    Apply the Bid and Artist of each row of a CSV/JSON file to the shots of a sequence
+    with the same name, in a single undo step and with a single sequence refresh.
+    Blank bid/artist values are left unchanged. Returns an ImportReport.
+  """
+  report = ImportReport()
+  shots = shotIndex(sequence)
+  with sequence.project().beginUndo("Import Bids"):
+    with EditBatch():
+      for lineNumber, row, error in readRows(path):
+        report.rows+=1
+        if error is not None:
+          report.addInvalid(lineNumber, error)
+          continue
+        shot = _value(row, kShotField)
+        items = shots.get(shot)
+        if not items:
+          report.addUnmatched(lineNumber, shot)
+          continue
+
+        bid = _value(row, kBidField)
+        status = None
+        if bid:
+          status = _status(bid)
+          if status is None:
+            report.addInvalid(lineNumber, '%s is not a valid Bid' % bid)
+            continue
+
+        artistValue = _value(row, kArtistField)
+        artist = None
+        if artistValue:
+          artist = config.gArtistList.fromName(artistValue) or config.gArtistList.fromID(artistValue)
+          if artist is None:
+            report.addInvalid(lineNumber, '%s is not in the gArtistList' % artistValue)
+            continue
+
+        for item in items:
+          if status:
+            item.setStatus(status)
+          if artist:
+            item.updateArtistTag(artist)
+        report.applied+=1
+  return report
+
+# 'Import Bids...' action for the Timeline and Spreadsheet right-click menus
+class ImportBidsAction(ContextMenuAction):
+
+  needsSequence = True
+
+  def __init__(self):
+      ContextMenuAction.__init__(self, "Import Bids...")
+
+  def run(self):
+    path, _ = QtWidgets.QFileDialog.getOpenFileName(None, "Import Bids", "", "Bids (*.csv *.json *.jsonl)")
+    if not path:
+      return
+    report = importAssignments(path, self.sequence())
+    headline, _, details = report.summary().partition('\n')
+    box = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Information, "Import Bids", headline)
+    if details:
+      box.setDetailedText(details)
+    box.exec_()
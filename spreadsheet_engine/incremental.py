@@ -0,0 +1,105 @@
+# Values derived from the shots of each sequence, such as the Bid totals and the shot
+# query indexes, kept up to date incrementally instead of re-reading every shot.
+from .rowcache import gRowCache
+
+def shots(sequence):
+  """
+    Yield the TrackItems of the video tracks of a sequence, the shots an index covers
+  """
+  for track in sequence.videoTracks():
+    for item in track.items():
+      yield item
+
+class IncrementalIndex(object):
+  """
+    Base for data derived from the shots of each sequence that has been asked for. A
+    sequence is scanned on its first lookup(). Tag changes reported by the row cache
+    only mark the shot dirty; the next lookup() re-derives just those shots, and checks
+    the guids of the sequence's shots for shots added or deleted since. Subclasses
+    implement newSequence(), derive(item), and apply(data, guid, item, value, sign),
+    which adds (sign 1) or takes away (sign -1) the value derived from a shot.
+  """
+
+  def __init__(self, rowCache=gRowCache):
+    self._sequences = {}
+    self._members = {}
+    self._values = {}
+    self._dirty = {}
+    rowCache.addListener(self._tagsChanged)
+
+  def newSequence(self):
+    """
+      Return the empty data of a sequence
+    """
+    raise NotImplementedError
+
+  def derive(self, item):
+    """
+      Return the value a TrackItem adds to the data of its sequence
+    """
+    raise NotImplementedError
+
+  def apply(self, data, guid, item, value, sign):
+    raise NotImplementedError
+
+  def lookup(self, sequence):
+    """
+      Return the up-to-date data of a sequence, scanning it the first time
+    """
+    self._reconcile()
+    sequenceGuid = sequence.guid()
+    data = self._sequences.get(sequenceGuid)
+    if data is None:
+      data = self._sequences[sequenceGuid] = self.newSequence()
+      self._members[sequenceGuid] = set()
+    self._sync(sequence)
+    return data
+
+  def clear(self, *args):
+    self._sequences.clear()
+    self._members.clear()
+    self._values.clear()
+    self._dirty.clear()
+
+  def _add(self, sequenceGuid, guid, item):
+    value = self.derive(item)
+    self._values[guid] = (sequenceGuid, value)
+    self._members[sequenceGuid].add(guid)
+    self.apply(self._sequences[sequenceGuid], guid, item, value, 1)
+
+  def _remove(self, guid, item):
+    previous = self._values.pop(guid, None)
+    if previous is not None:
+      sequenceGuid, value = previous
+      self._members[sequenceGuid].discard(guid)
+      self.apply(self._sequences[sequenceGuid], guid, item, value, -1)
+    return previous
+
+  def _sync(self, sequence):
+    # Shots deleted, added or cut in two on the timeline change no tags, so are only
+    # found by comparing the guids of the shots with those counted
+    sequenceGuid = sequence.guid()
+    members = self._members[sequenceGuid]
+    current = dict((item.guid(), item) for item in shots(sequence))
+    if len(current) == len(members) and all(guid in current for guid in members):
+      return
+    for guid in members.difference(current):
+      self._remove(guid, None)
+    for guid in set(current).difference(members):
+      self._add(sequenceGuid, guid, current[guid])
+
+  def _reconcile(self):
+    # Only shots already counted are re-derived; new shots are picked up by _sync()
+    dirty = self._dirty
+    self._dirty = {}
+    for guid, item in dirty.items():
+      previous = self._remove(guid, item)
+      if previous is not None and item.parent() is not None:
+        self._add(previous[0], guid, item)
+
+  def _tagsChanged(self, item):
+    if item is None:
+      # Anything may have changed, e.g. after an undo: rescan when next asked
+      self.clear()
+    else:
+      self._dirty[item.guid()] = item
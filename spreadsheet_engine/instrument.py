@@ -0,0 +1,150 @@
+# Opt-in instrumentation of the spreadsheet callbacks: call counts and latency histograms
+# per hook and per column. Set CUSTOM_SPREADSHEET_INSTRUMENT=1 before starting Nuke Studio,
+# or call enable() from the Script Editor. When it is off nothing is wrapped, so the
+# callbacks run with no added overhead.
+import atexit
+import json
+import os
+import timeit
+
+import hiero.core
+import hiero.ui
+
+# Set to a non-empty value (other than 0) to instrument the callbacks at install()
+kInstrumentEnvVar = 'CUSTOM_SPREADSHEET_INSTRUMENT'
+
+# Set to a file path to have the stats written there as JSON on exit
+kStatsFileEnvVar = 'CUSTOM_SPREADSHEET_STATS'
+
+# The CustomSpreadsheetColumns callbacks that take (row, column, item, ...)
+kCellHooks = ('getData', 'getTooltip', 'getBackground', 'getForeground', 'getFont', 'setData',
+              'getIcon', 'getSizeHint', 'paintCell', 'createEditor', 'setModelData', 'dropMimeData')
+
+# The injected TrackItem methods
+kTrackItemMethods = ('tagSummary', 'status', 'artist', 'setStatus', 'updateArtistTag')
+
+_timer = timeit.default_timer
+
+class Histogram(object):
+  """
+    Call count and latency histogram of one hook. Bucket n counts calls that took
+    less than 2**n microseconds (and at least 2**(n-1)).
+  """
+  __slots__ = ('count', 'total', 'minimum', 'maximum', 'buckets')
+
+  def __init__(self):
+    self.count = 0
+    self.total = 0.0
+    self.minimum = None
+    self.maximum = 0.0
+    self.buckets = {}
+
+  def add(self, seconds):
+    self.count+=1
+    self.total+=seconds
+    if self.minimum is None or seconds < self.minimum:
+      self.minimum = seconds
+    if seconds > self.maximum:
+      self.maximum = seconds
+    bucket = int(seconds*1e6).bit_length()
+    self.buckets[bucket] = self.buckets.get(bucket, 0)+1
+
+  def asDict(self):
+    return {'count' : self.count,
+            'totalSeconds' : self.total,
+            'meanMicroseconds' : self.total/self.count*1e6 if self.count else 0.0,
+            'minMicroseconds' : (self.minimum or 0.0)*1e6,
+            'maxMicroseconds' : self.maximum*1e6,
+            'histogramMicroseconds' : dict(('<%d' % (1 << bucket), count) for bucket, count in sorted(self.buckets.items()))}
+
+# Histograms by hook name, e.g. 'getData', and by hook and column, e.g. 'getData[Bid]'
+gStats = {}
+
+def record(name, seconds):
+  histogram = gStats.get(name)
+  if histogram is None:
+    histogram = gStats[name] = Histogram()
+  histogram.add(seconds)
+
+def enabled():
+  """
+    Return True if instrumentation was asked for through the environment
+  """
+  return os.environ.get(kInstrumentEnvVar, '') not in ('', '0')
+
+def _wrapCellHook(customColumns, name, method):
+  def instrumented(row, column, *args):
+    start = _timer()
+    try:
+      return method(row, column, *args)
+    finally:
+      elapsed = _timer()-start
+      record(name, elapsed)
+      record('%s[%s]' % (name, customColumns.columns.names[column]), elapsed)
+  instrumented.uninstrumented = method
+  return instrumented
+
+def instrumentColumns(customColumns):
+  """
+    Wrap the cell callbacks of a CustomSpreadsheetColumns instance
+  """
+  for name in kCellHooks:
+    method = getattr(customColumns, name)
+    if not hasattr(method, 'uninstrumented'):
+      setattr(customColumns, name, _wrapCellHook(customColumns, name, method))
+
+def _wrapTrackItemMethod(name, function):
+  def instrumented(self, *args):
+    start = _timer()
+    try:
+      return function(self, *args)
+    finally:
+      record('TrackItem.%s' % name, _timer()-start)
+  instrumented.uninstrumented = function
+  return instrumented
+
+def instrumentTrackItem():
+  """
+    Wrap the Status/Artist methods injected into hiero.core.TrackItem
+  """
+  for name in kTrackItemMethods:
+    function = getattr(hiero.core.TrackItem, name)
+    function = getattr(function, '__func__', function)
+    if not hasattr(function, 'uninstrumented'):
+      setattr(hiero.core.TrackItem, name, _wrapTrackItemMethod(name, function))
+
+def enable(customColumns=None):
+  """
+    Start instrumenting, e.g. from the Script Editor. Defaults to the installed columns.
+  """
+  if customColumns is None:
+    customColumns = hiero.ui.customColumn
+  instrumentColumns(customColumns)
+  instrumentTrackItem()
+
+def stats():
+  """
+    Return the collected stats as a dictionary
+  """
+  return dict((name, histogram.asDict()) for name, histogram in gStats.items())
+
+def dumpStats(path=None):
+  """
+    Return the collected stats, and write them to path as JSON if given
+  """
+  result = stats()
+  if path:
+    with open(path, 'w') as f:
+      json.dump(result, f, indent=2, sort_keys=True)
+  return result
+
+def resetStats():
+  gStats.clear()
+
+def _dumpOnExit(*args):
+  path = os.environ.get(kStatsFileEnvVar)
+  if path and gStats:
+    dumpStats(path)
+
+atexit.register(_dumpOnExit)
+hiero.core.events.registerInterest(hiero.core.events.EventType.kShutdown, _dumpOnExit)
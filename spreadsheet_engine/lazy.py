@@ -0,0 +1,171 @@
+# Viewport-aware evaluation of expensive columns. The rows Hiero asks about while painting
+# give the visible row range; expensive columns show a placeholder for other rows until
+# their value has been computed in the background, then just those cells are repainted.
+import time
+
+import hiero.ui
+from PySide2 import (QtCore, QtWidgets)
+
+from . import views
+from .rowcache import gRowCache
+
+# Rows either side of the visible range that are computed straight away, for smooth scrolling
+kVisibleRowMargin = 10
+
+# Cells of expensive columns computed per idle step
+kLazyBatchSize = 200
+
+# Seconds of painting between re-checks of the painted rows against their tags
+kRevalidateInterval = 2.0
+
+class VisibleRows(QtCore.QObject):
+  """
+    The range of Spreadsheet rows painted in the last frame. touch() is called from
+    the cell callbacks; at the end of a frame the range is published, and listeners
+    added with addListener() are called with (firstRow, lastRow) when it has moved.
+    frameEnded is emitted at the end of every frame.
+  """
+
+  frameEnded = QtCore.Signal()
+
+  def __init__(self):
+    QtCore.QObject.__init__(self)
+    self.firstRow = None
+    self.lastRow = None
+    self._frameFirst = None
+    self._frameLast = None
+    self._listeners = []
+
+  def addListener(self, listener):
+    if listener not in self._listeners:
+      self._listeners.append(listener)
+
+  def removeListener(self, listener):
+    if listener in self._listeners:
+      self._listeners.remove(listener)
+
+  def touch(self, row):
+    if self._frameFirst is None:
+      self._frameFirst = self._frameLast = row
+      QtCore.QTimer.singleShot(0, self._endFrame)
+    elif row < self._frameFirst:
+      self._frameFirst = row
+    elif row > self._frameLast:
+      self._frameLast = row
+
+  def contains(self, row, margin=kVisibleRowMargin):
+    """
+      Return True if a row is in, or within margin rows of, the visible range
+    """
+    if self.firstRow is None:
+      return False
+    return self.firstRow-margin <= row <= self.lastRow+margin
+
+  def _endFrame(self):
+    first, last = self._frameFirst, self._frameLast
+    self._frameFirst = self._frameLast = None
+    self.frameEnded.emit()
+    if first is None or (first, last) == (self.firstRow, self.lastRow):
+      return
+    self.firstRow, self.lastRow = first, last
+    for listener in self._listeners:
+      listener(first, last)
+
+class LazyValues(QtCore.QObject):
+  """
+    Computed values of the expensive columns, by TrackItem guid and Column. A value
+    asked for outside the visible range is queued, and its placeholder returned; the
+    queue is worked through in idle steps, nearest the visible range first, and each
+    finished cell is repainted on its own. Tag changes drop the values of that item.
+  """
+
+  def __init__(self, visibleRows, rowCache=gRowCache):
+    QtCore.QObject.__init__(self)
+    self._visibleRows = visibleRows
+    self._rowCache = rowCache
+    self._values = {}
+    self._queue = {}
+    self._scheduled = False
+    rowCache.addListener(self._tagsChanged)
+
+  def data(self, customColumns, row, column, item):
+    """
+      Return the value of an expensive column's cell, or its placeholder for now
+    """
+    guid = item.guid()
+    visible = self._visibleRows.contains(row)
+    if visible:
+      # Checks the row against its tags, dropping our values if they have changed
+      self._rowCache.row(item)
+    values = self._values.get(guid)
+    columnObject = customColumns.columns[column]
+    if values is not None and columnObject in values:
+      return values[columnObject]
+    if visible:
+      return self._compute(columnObject, item)
+    self._queue[(guid, columnObject)] = (customColumns, row, column, item)
+    if not self._scheduled:
+      self._scheduled = True
+      QtCore.QTimer.singleShot(0, self._step)
+    return columnObject.placeholder
+
+  def clear(self, *args):
+    self._values.clear()
+    self._queue.clear()
+
+  def _compute(self, columnObject, item):
+    value = columnObject.data(self._rowCache.row(item), item)
+    self._values.setdefault(item.guid(), {})[columnObject] = value
+    return value
+
+  def _step(self):
+    self._scheduled = False
+    if not self._queue:
+      return
+    visibleRows = self._visibleRows
+    centre = 0
+    if visibleRows.firstRow is not None:
+      centre = (visibleRows.firstRow+visibleRows.lastRow)/2
+    keys = sorted(self._queue, key=lambda key: abs(self._queue[key][1]-centre))[:kLazyBatchSize]
+    cells = []
+    for key in keys:
+      customColumns, row, column, item = self._queue.pop(key)
+      self._compute(key[1], item)
+      cells.append((row, column))
+    views.refreshCells(cells, customColumns.numColumns())
+    if self._queue:
+      self._scheduled = True
+      QtCore.QTimer.singleShot(0, self._step)
+
+  def _tagsChanged(self, item):
+    if item is None:
+      self.clear()
+    else:
+      self._values.pop(item.guid(), None)
+
+gVisibleRows = VisibleRows()
+gLazyValues = LazyValues(gVisibleRows)
+
+# Tag edits made in Hiero's UI raise no event. The painted rows are checked against their
+# tags when focus returns, e.g. from the Tag dialog, and at most every kRevalidateInterval
+# seconds while painting, rather than on every frame.
+def _frameEnded():
+  if time.time()-gRowCache.revalidatedAt >= kRevalidateInterval:
+    gRowCache.revalidate()
+
+def _connectRevalidation():
+  gVisibleRows.frameEnded.connect(_frameEnded)
+  application = QtWidgets.QApplication.instance()
+  if application is not None:
+    application.focusChanged.connect(gRowCache.revalidate)
+
+_connectRevalidation()
+
+# Undo and Redo can change tags behind our back, so drop the whole cache
+def _connectUndoRedo():
+  for actionName in ('Undo', 'Redo'):
+    action = hiero.ui.findMenuAction(actionName)
+    if action:
+      action.triggered.connect(gRowCache.clear)
+
+_connectUndoRedo()
@@ -0,0 +1,224 @@
+# Cached media-presence checks for the Spreadsheet cell backgrounds. The filesystem is
+# only ever touched from a background thread pool, so painting never blocks on I/O.
+import os
+import re
+import time
+
+import hiero.core
+from PySide2 import QtCore
+
+from . import views
+from .menus import ContextMenuAction
+
+# Seconds before a media-presence result is probed again. None keeps results until a rescan.
+kMediaProbeTTL = 300
+
+# Number of clips checked by each background job
+kMediaProbeBatchSize = 64
+
+# The background returned while a probe is still pending. None is the default (neutral)
+# cell background, set a QtGui.QColor to mark pending rows instead.
+kMediaPendingColour = None
+
+_kFramePadding = re.compile(r'#+')
+
+def frameFilename(filename, frame):
+  """
+    Return the filename of a single frame of a (possibly) sequenced filename,
+    e.g. shot.%04d.exr or shot.####.exr
+  """
+  if '%' in filename:
+    try:
+      return filename % frame
+    except (TypeError, ValueError):
+      return filename
+  padding = _kFramePadding.findall(filename)
+  if padding:
+    last = padding[-1]
+    head, _, tail = filename.rpartition(last)
+    return head+str(frame).zfill(len(last))+tail
+  return filename
+
+def probeMedia(filenames):
+  """
+    Return True if the first frame of every file exists. Runs on a worker thread.
+  """
+  for filename in filenames:
+    if not os.path.exists(filename):
+      return False
+  return True
+
+class ClipMedia(object):
+  """
+    The media-presence state of one source clip, shared by every TrackItem using it.
+    present is None until the first probe comes back.
+  """
+  __slots__ = ('filenames', 'present', 'probedAt', 'pending')
+
+  def __init__(self, filenames):
+    self.filenames = filenames
+    self.present = None
+    self.probedAt = None
+    self.pending = False
+
+# A batch of filesystem checks for the thread pool
+class _ProbeJob(QtCore.QRunnable):
+
+  def __init__(self, work, cache):
+    QtCore.QRunnable.__init__(self)
+    self._work = work
+    self._cache = cache
+
+  def run(self):
+    results = [(filenames, probeMedia(filenames)) for filenames in self._work]
+    # Signals emitted from the pool are queued to the cache's (UI) thread
+    self._cache.probed.emit(results)
+
+class MediaPresenceCache(QtCore.QObject):
+  """
+    Caches isMediaPresent results per source clip. Results are probed in a thread
+    pool the first time a sequence is seen, and again after kMediaProbeTTL seconds
+    or on rescan(). isMediaPresent() returns None while a probe is pending.
+  """
+  probed = QtCore.Signal(object)
+
+  def __init__(self, threadPool=None):
+    QtCore.QObject.__init__(self)
+    self._threadPool = threadPool or QtCore.QThreadPool.globalInstance()
+    self._clips = {}
+    self._items = {}
+    self._sequences = set()
+    self._refreshScheduled = False
+    self.probed.connect(self._onProbed)
+
+  def isMediaPresent(self, item):
+    """
+      Return True/False from the cache, or None if the media is still being probed
+    """
+    clip = self._items.get(item.guid())
+    if clip is None:
+      self.scanSequence(item.sequence())
+      clip = self._items.get(item.guid())
+      if clip is None:
+        clip = self._addItem(item)
+        self._probe([clip])
+    elif kMediaProbeTTL is not None and not clip.pending and clip.probedAt is not None:
+      if time.time()-clip.probedAt > kMediaProbeTTL:
+        self._probe([clip])
+    return clip.present
+
+  def scanSequence(self, sequence, items=None):
+    """
+      Queue a probe for every clip used on the video tracks of a sequence, once.
+      items, if given, are the TrackItems of the sequence in the order to probe them.
+    """
+    if sequence is None or sequence.guid() in self._sequences:
+      return
+    self._sequences.add(sequence.guid())
+    if items is None:
+      items = (item for track in sequence.videoTracks() for item in track.items())
+    clips = []
+    for item in items:
+      if item.guid() not in self._items:
+        clips.append(self._addItem(item))
+    self._probe(clips)
+
+  def rescan(self, *args):
+    """
+      Probe every known clip again. The previous results are shown until the new ones arrive.
+    """
+    for clip in self._clips.values():
+      clip.pending = False
+    self._probe(self._clips.values())
+
+  def results(self, guids=None):
+    """
+      Yield (filenames, present, probedAt) for every clip that has been probed, or
+      only for the clips used by the TrackItems with the given guids
+    """
+    if guids is None:
+      clips = self._clips.values()
+    else:
+      clips = set(self._items[guid] for guid in guids if guid in self._items)
+    for clip in clips:
+      if clip.probedAt is not None and clip.filenames:
+        yield clip.filenames, clip.present, clip.probedAt
+
+  def restore(self, results):
+    """
+      Load earlier (filenames, present, probedAt) results, e.g. from the sidecar cache.
+      They are shown straight away, and probed again when their sequence is scanned.
+    """
+    for filenames, present, probedAt in results:
+      clip = self._clips.get(filenames)
+      if clip is None:
+        clip = self._clips[filenames] = ClipMedia(filenames)
+      if clip.probedAt is None:
+        clip.present = present
+        clip.probedAt = probedAt
+
+  def clear(self, *args):
+    """
+      Forget all results, e.g. when a project is closed
+    """
+    self._clips.clear()
+    self._items.clear()
+    self._sequences.clear()
+
+  def _addItem(self, item):
+    # Only Hiero calls here: gathering the filenames does no filesystem I/O
+    mediaSource = item.source().mediaSource()
+    filenames = tuple(frameFilename(info.filename(), info.startFrame()) for info in mediaSource.fileinfos())
+    clip = self._clips.get(filenames)
+    if clip is None:
+      clip = self._clips[filenames] = ClipMedia(filenames)
+      if not filenames:
+        # Nothing on disk to look for, e.g. a generated clip
+        clip.present = True
+        clip.probedAt = time.time()
+    self._items[item.guid()] = clip
+    return clip
+
+  def _probe(self, clips):
+    work = []
+    for clip in clips:
+      if clip.pending or not clip.filenames:
+        continue
+      clip.pending = True
+      work.append(clip.filenames)
+      if len(work) == kMediaProbeBatchSize:
+        self._threadPool.start(_ProbeJob(work, self))
+        work = []
+    if work:
+      self._threadPool.start(_ProbeJob(work, self))
+
+  def _onProbed(self, results):
+    now = time.time()
+    for filenames, present in results:
+      clip = self._clips.get(filenames)
+      if clip is None:
+        continue
+      clip.present = present
+      clip.probedAt = now
+      clip.pending = False
+    # Coalesce the repaints of many finished jobs into one
+    if not self._refreshScheduled:
+      self._refreshScheduled = True
+      QtCore.QTimer.singleShot(100, self._refresh)
+
+  def _refresh(self):
+    self._refreshScheduled = False
+    views.refreshSpreadsheets()
+
+gMediaCache = MediaPresenceCache()
+hiero.core.events.registerInterest(hiero.core.events.EventType.kBeforeProjectClose, gMediaCache.clear)
+
+# 'Rescan Media' action for the Timeline and Spreadsheet right-click menus
+class RescanMediaAction(ContextMenuAction):
+
+  def __init__(self, mediaCache=gMediaCache):
+      ContextMenuAction.__init__(self, "Rescan Media")
+      self._mediaCache = mediaCache
+
+  def run(self):
+    self._mediaCache.rescan()
@@ -0,0 +1,249 @@
+# Right-click 'Set Bid' and 'Assign Artist' menus for the Timeline and Spreadsheet views.
+import hiero.core
+from PySide2 import (QtCore, QtWidgets)
+
+from . import config
+from .batch import (setStatusBulk, setArtistBulk)
+from .icons import gIconCache
+from .selection import (iterTrackItems, peekTrackItems)
+
+# The most Artists listed for a search in the Assign Artist menu
+kMaxArtistSearchResults = 50
+
+# This is a convenience method for returning QtGui.QActions with a triggered method based on the title string
+def titleStringTriggeredAction(title, method, icon = None):
+  action = QtWidgets.QAction(title,None)
+  if icon:
+    action.setIcon(gIconCache.icon(icon))
+  
+  # We do this magic, so that the title string from the action is used to set the status
+  def methodWrapper():
+    method(title)
+  
+  action.triggered.connect( methodWrapper )
+  return action
+
+# Base for menus that are added to the Timeline and Spreadsheet right-click menus
+class SelectionContextMenu(QtWidgets.QMenu):
+
+  def __init__(self, title):
+      QtWidgets.QMenu.__init__(self, title, None)
+      self._selection = []
+      hiero.core.events.registerInterest("kShowContextMenu/kTimeline", self.eventHandler)
+      hiero.core.events.registerInterest("kShowContextMenu/kSpreadsheet", self.eventHandler)      
+
+  def unregister(self):
+    """
+      Stop adding this menu to the context menus, e.g. when another column set is installed
+    """
+    hiero.core.events.unregisterInterest("kShowContextMenu/kTimeline", self.eventHandler)
+    hiero.core.events.unregisterInterest("kShowContextMenu/kSpreadsheet", self.eventHandler)
+
+  def selectedShots(self):
+    """
+      Return the TrackItems of the selection, each once, including those of selected Track Headers
+    """
+    return list(iterTrackItems(self._selection))
+
+  # This handles events from the Project Bin View
+  def eventHandler(self,event):
+    if not hasattr(event.sender, 'selection'):
+      # Something has gone wrong, we should only be here if raised
+      # by the Timeline/Spreadsheet view which gives a selection.
+      return
+    
+    # Set the current selection
+    self._selection = event.sender.selection()
+
+    # Return if there's no Selection. We won't add the Menu.
+    if len(self._selection) == 0:
+      return
+    
+    event.menu.addMenu(self)
+
+# Base for single actions that are added to the Timeline and Spreadsheet right-click menus
+class ContextMenuAction(QtWidgets.QAction):
+
+  # True for actions that work on the sequence of the view, and so are only offered when there is one
+  needsSequence = False
+
+  def __init__(self, title):
+      QtWidgets.QAction.__init__(self, title, None)
+      self._sequence = None
+      self.triggered.connect(self.run)
+      hiero.core.events.registerInterest("kShowContextMenu/kTimeline", self.eventHandler)
+      hiero.core.events.registerInterest("kShowContextMenu/kSpreadsheet", self.eventHandler)
+
+  def unregister(self):
+    hiero.core.events.unregisterInterest("kShowContextMenu/kTimeline", self.eventHandler)
+    hiero.core.events.unregisterInterest("kShowContextMenu/kSpreadsheet", self.eventHandler)
+
+  def sequence(self):
+    """
+      The sequence of the view the context menu was shown for
+    """
+    return self._sequence
+
+  def run(self):
+    """
+      Called when the action is triggered
+    """
+    pass
+
+  def eventHandler(self, event):
+    self._sequence = event.sender.sequence() if hasattr(event.sender, 'sequence') else None
+    if self.needsSequence and self._sequence is None:
+      return
+    event.menu.addAction(self)
+
+# Menu which adds a Set Status Menu to Timeline and Spreadsheet Views
+class SetStatusMenu(SelectionContextMenu):
+
+  def __init__(self):
+      SelectionContextMenu.__init__(self, "Set Bid")
+
+      self.statuses = config.gStatusTags
+      self._statusActions = self.createStatusMenuActions()      
+
+      # Add the Actions to the Menu.
+      for act in self.menuActions:
+        self.addAction(act)
+
+  def createStatusMenuActions(self):
+    self.menuActions = []
+    for status in self.statuses:
+      self.menuActions+=[titleStringTriggeredAction(status,self.setStatusFromMenuSelection, icon=config.statusIcon(status))]
+
+  def setStatusFromMenuSelection(self, menuSelectionStatus):
+    # The selected shots are expanded lazily, as they are edited
+    firstShot, selectedShots = peekTrackItems(self._selection)
+
+    # It's possible no shots exist on the Track, in which case nothing is required
+    if firstShot is None:
+      return
+
+    currentProject = firstShot.project()
+
+    with currentProject.beginUndo("Set Bid"):
+      # Shots selected, with one refresh per sequence at the end
+      setStatusBulk(selectedShots, menuSelectionStatus)
+
+# Menu which adds an Assign Artist Menu to Timeline and Spreadsheet Views.
+# Artists are grouped into department submenus, which are only filled when first shown,
+# and a search field at the top lists the Artists whose names match what is typed.
+class AssignArtistMenu(SelectionContextMenu):
+
+  def __init__(self):
+      SelectionContextMenu.__init__(self, "Assign Artist")
+
+      self.artists = None
+      self._builtVersion = None
+      self._artistActions = {}
+      self._departmentMenus = []
+      self._filledMenus = set()
+      self._resultActions = []
+
+      # Type-to-filter field at the top of the menu
+      self._searchField = QtWidgets.QLineEdit()
+      self._searchField.setPlaceholderText("Search Artists")
+      self._searchField.textChanged.connect(self.filterArtists)
+      searchAction = QtWidgets.QWidgetAction(self)
+      searchAction.setDefaultWidget(self._searchField)
+      self.addAction(searchAction)
+
+      self.aboutToShow.connect(self.updateDepartmentMenus)
+
+  def updateDepartmentMenus(self):
+    """
+      Called before the menu is shown. Clears the search and gives it the focus, and
+      regroups the department submenus only if the roster has changed since they were
+      built.
+    """
+    self._searchField.setText('')
+    # Once the menu is shown, so typing filters straight away
+    QtCore.QTimer.singleShot(0, self._searchField.setFocus)
+    artists = config.gArtistList
+    if artists is self.artists and artists.version == self._builtVersion:
+      return
+    self.artists = artists
+    self._builtVersion = artists.version
+
+    for menu in self._departmentMenus:
+      self.removeAction(menu.menuAction())
+      menu.deleteLater()
+    self._departmentMenus = []
+    self._filledMenus.clear()
+
+    departments = {}
+    for artist in artists:
+      departments.setdefault(artist['artistDepartment'], []).append(artist)
+    for department in sorted(departments):
+      menu = QtWidgets.QMenu(department, self)
+      menu.aboutToShow.connect(lambda menu=menu, departmentArtists=departments[department]: self.fillDepartmentMenu(menu, departmentArtists))
+      self.addMenu(menu)
+      self._departmentMenus.append(menu)
+
+    # Forget the actions of Artists who have left the roster, or whose record changed
+    for artistID, (artist, action) in self._artistActions.items():
+      if artists.fromID(artistID) is not artist:
+        del self._artistActions[artistID]
+        action.deleteLater()
+
+  def fillDepartmentMenu(self, menu, departmentArtists):
+    if menu in self._filledMenus:
+      return
+    self._filledMenus.add(menu)
+    for artist in departmentArtists:
+      menu.addAction(self.artistAction(artist))
+
+  def artistAction(self, artist):
+    """
+      Return the action assigning an Artist, creating it (and its icon) the first time
+    """
+    cached = self._artistActions.get(artist['artistID'])
+    if cached is not None:
+      if cached[0] is artist:
+        return cached[1]
+      cached[1].deleteLater()
+    action = QtWidgets.QAction(artist['artistName'], self)
+    if artist['artistIcon']:
+      action.setIcon(gIconCache.icon(artist['artistIcon']))
+    action.triggered.connect(lambda checked=False, artistID=artist['artistID']: self.setArtistFromMenuSelection(artistID))
+    self._artistActions[artist['artistID']] = (artist, action)
+    return action
+
+  def filterArtists(self, text):
+    """
+      Show the Artists whose names contain text in place of the department submenus
+    """
+    for action in self._resultActions:
+      self.removeAction(action)
+    self._resultActions = []
+
+    text = text.strip().lower()
+    for menu in self._departmentMenus:
+      menu.menuAction().setVisible(not text)
+    if not text or self.artists is None:
+      return
+
+    for artist in self.artists:
+      if text in artist['artistName'].lower():
+        action = self.artistAction(artist)
+        self.addAction(action)
+        self._resultActions.append(action)
+        if len(self._resultActions) == kMaxArtistSearchResults:
+          break
+
+  def setArtistFromMenuSelection(self, menuSelectionArtist):
+    # The selected shots are expanded lazily, as they are edited
+    firstShot, selectedShots = peekTrackItems(self._selection)
+
+    # It's possible no shots exist on the Track, in which case nothing is required
+    if firstShot is None:
+      return
+
+    currentProject = firstShot.project()
+
+    with currentProject.beginUndo("Assign Artist"):
+      # Shots selected, with one refresh per sequence at the end
+      setArtistBulk(selectedShots, menuSelectionArtist)
@@ -0,0 +1,259 @@
+# Full-text search over the tag notes and tag names of a project, and a panel to run it.
+# The index is built in short time slices while Nuke Studio is idle, then kept up to date
+# from the tag changes reported by the row cache, so a search never rescans the shots.
+import bisect
+import re
+import time
+
+import hiero.core
+import hiero.ui
+from PySide2 import (QtCore, QtWidgets)
+
+from . import views
+from .rowcache import gRowCache
+
+# Seconds of indexing done per idle step while a project is being indexed
+kIndexSliceSeconds = 0.005
+
+# The most matching shots listed in the Notes Search panel (all of them are selected)
+kMaxListedResults = 200
+
+_kWord = re.compile(r'[a-z0-9]+')
+
+def tokenize(text):
+  """
+    Return the lowercase words of a string
+  """
+  return _kWord.findall(text.lower())
+
+def itemTokens(item):
+  """
+    Return the set of words in the tag notes and tag names of a TrackItem
+  """
+  summary = item.tagSummary()
+  tokens = set()
+  for text in summary.tagNames:
+    tokens.update(tokenize(text))
+  for text in summary.notes:
+    tokens.update(tokenize(text))
+  return tokens
+
+class NotesIndex(QtCore.QObject):
+  """
+    Inverted index from words to the TrackItems whose tag notes or tag names contain
+    them. A search word also matches longer words it starts, e.g. 'roto' matches
+    'rotoscope'. Tag changes only mark the item dirty; the next search re-indexes just
+    those items. An undo/redo or a project load/close reindexes the project.
+  """
+
+  # Emitted when indexing finishes
+  built = QtCore.Signal()
+
+  def __init__(self, rowCache=gRowCache):
+    QtCore.QObject.__init__(self)
+    self._project = None
+    self._postings = {}
+    self._tokens = {}
+    self._items = {}
+    self._words = None
+    self._dirty = {}
+    self._pending = None
+    rowCache.addListener(self._tagsChanged)
+
+  def project(self):
+    return self._project
+
+  def setProject(self, project):
+    """
+      Index a project, in the background, unless it is the one already indexed
+    """
+    if project != self._project:
+      self._project = project
+      self.rebuild()
+
+  def rebuild(self, *args):
+    """
+      Throw the index away, and index the project again in the background
+    """
+    self._postings.clear()
+    self._tokens.clear()
+    self._items.clear()
+    self._dirty.clear()
+    self._words = None
+    if self._project is None:
+      self._pending = None
+      return
+    self._pending = self._iterProjectItems(self._project)
+    QtCore.QTimer.singleShot(0, self._indexStep)
+
+  def clear(self, *args):
+    self._project = None
+    self.rebuild()
+
+  def isBuilding(self):
+    return self._pending is not None
+
+  def search(self, text, sequence=None):
+    """
+      Return the TrackItems whose notes or tag names contain every word of text,
+      optionally only those in a sequence. Finishes indexing first if need be.
+    """
+    words = tokenize(text)
+    if not words:
+      return []
+    self._finishIndexing()
+    self._reconcile()
+
+    matches = None
+    for word in words:
+      guids = self._lookup(word)
+      matches = guids if matches is None else matches & guids
+      if not matches:
+        return []
+
+    items = [self._items[guid] for guid in matches]
+    if sequence is not None:
+      sequenceGuid = sequence.guid()
+      items = [item for item in items if _sequenceGuid(item) == sequenceGuid]
+    return items
+
+  def stats(self):
+    return {'items' : len(self._tokens),
+            'words' : len(self._postings),
+            'dirty' : len(self._dirty),
+            'building' : self.isBuilding()}
+
+  def _lookup(self, word):
+    guids = set(self._postings.get(word, ()))
+    if self._words is None:
+      self._words = sorted(self._postings)
+    index = bisect.bisect_right(self._words, word)
+    while index < len(self._words) and self._words[index].startswith(word):
+      guids.update(self._postings[self._words[index]])
+      index+=1
+    return guids
+
+  def _iterProjectItems(self, project):
+    for sequence in project.sequences():
+      for track in sequence.videoTracks():
+        for item in track.items():
+          yield item
+
+  def _indexStep(self):
+    if self._pending is None:
+      return
+    deadline = time.time()+kIndexSliceSeconds
+    for item in self._pending:
+      self._index(item)
+      if time.time() > deadline:
+        QtCore.QTimer.singleShot(0, self._indexStep)
+        return
+    self._pending = None
+    self.built.emit()
+
+  def _finishIndexing(self):
+    if self._pending is not None:
+      for item in self._pending:
+        self._index(item)
+      self._pending = None
+      self.built.emit()
+
+  def _index(self, item):
+    guid = item.guid()
+    self._unindex(guid)
+    tokens = itemTokens(item)
+    if not tokens:
+      return
+    self._tokens[guid] = tokens
+    self._items[guid] = item
+    for token in tokens:
+      guids = self._postings.get(token)
+      if guids is None:
+        guids = self._postings[token] = set()
+        self._words = None
+      guids.add(guid)
+
+  def _unindex(self, guid):
+    tokens = self._tokens.pop(guid, ())
+    self._items.pop(guid, None)
+    for token in tokens:
+      guids = self._postings[token]
+      guids.discard(guid)
+      if not guids:
+        del self._postings[token]
+        self._words = None
+
+  def _reconcile(self):
+    dirty = self._dirty
+    self._dirty = {}
+    for guid, item in dirty.items():
+      if item.parent() is None or item.project() != self._project:
+        self._unindex(guid)
+      else:
+        self._index(item)
+
+  def _tagsChanged(self, item):
+    if self._project is None:
+      return
+    if item is None:
+      # Anything may have changed, e.g. after an undo: index the project again
+      self.rebuild()
+    else:
+      self._dirty[item.guid()] = item
+
+def _sequenceGuid(item):
+  sequence = item.sequence()
+  if sequence is None:
+    return None
+  return sequence.guid()
+
+gNotesIndex = NotesIndex()
+hiero.core.events.registerInterest(hiero.core.events.EventType.kBeforeProjectClose, gNotesIndex.clear)
+
+# Dockable panel which searches the notes and tag names of the active sequence, and
+# selects the matching shots in the Timeline and Spreadsheet
+class NotesSearchPanel(QtWidgets.QWidget):
+
+  def __init__(self, notesIndex=gNotesIndex):
+    QtWidgets.QWidget.__init__(self)
+    self.setObjectName('customSpreadsheet.NotesSearch')
+    self.setWindowTitle('Notes Search')
+    self._notesIndex = notesIndex
+
+    layout = QtWidgets.QVBoxLayout(self)
+    self._searchField = QtWidgets.QLineEdit()
+    self._searchField.setPlaceholderText('Search notes and tags, e.g. roto retime')
+    self._searchField.textChanged.connect(self.search)
+    layout.addWidget(self._searchField)
+    self._summary = QtWidgets.QLabel()
+    layout.addWidget(self._summary)
+    self._results = QtWidgets.QTreeWidget()
+    self._results.setHeaderLabels(['Shot', 'Notes'])
+    layout.addWidget(self._results)
+
+    hiero.core.events.registerInterest(hiero.core.events.EventType.kContextChanged, self.updateProject)
+
+  def showEvent(self, event):
+    self.updateProject()
+
+  def updateProject(self, *args):
+    # Start indexing the project of the active sequence as soon as the panel is shown
+    if not self.isVisible():
+      return
+    sequence = hiero.ui.activeSequence()
+    if sequence is not None:
+      self._notesIndex.setProject(sequence.project())
+
+  def search(self, text):
+    self._results.clear()
+    sequence = hiero.ui.activeSequence()
+    if sequence is None:
+      self._summary.setText('No active sequence')
+      return
+    self._notesIndex.setProject(sequence.project())
+    items = self._notesIndex.search(text, sequence)
+    self._summary.setText('%d shots' % len(items))
+    for item in sorted(items, key=lambda item: item.name())[:kMaxListedResults]:
+      QtWidgets.QTreeWidgetItem(self._results, [item.name(), ', '.join(item.tagSummary().notes)])
+    if items:
+      views.selectItems(sequence, items)
@@ -0,0 +1,257 @@
+# Indexed queries over the custom column values of a sequence, e.g. all shots with a Bid
+# of at least $800 assigned to Comp, and a panel to run them and select the results.
+import bisect
+import shlex
+
+import hiero.core
+import hiero.ui
+from PySide2 import QtWidgets
+
+from . import config
+from . import views
+from .incremental import IncrementalIndex
+from .media import gMediaCache
+from .rowcache import gRowCache
+
+class QueryError(ValueError):
+  """
+    Raised for query text that cannot be parsed
+  """
+
+class ShotQuery(object):
+  """
+    The conditions of a query; a shot must meet all of them. Artist, department and
+    tag names match case-insensitively. mediaPresent is True or False to match shots
+    whose media is present or missing (shots still being probed match neither).
+  """
+
+  def __init__(self, minBid=None, maxBid=None, noBid=False, artist=None, department=None,
+               unassigned=False, tags=(), mediaPresent=None):
+    self.minBid = minBid
+    self.maxBid = maxBid
+    self.noBid = noBid
+    self.artist = artist
+    self.department = department
+    self.unassigned = unassigned
+    self.tags = list(tags)
+    self.mediaPresent = mediaPresent
+
+  @classmethod
+  def parse(cls, text):
+    """
+      Return the ShotQuery for text such as: bid>=800 department:Comp, unassigned
+      media:missing, tag:retime "artist:Claude Monet" or nobid. Raises QueryError.
+    """
+    query = cls()
+    try:
+      terms = shlex.split(text)
+    except ValueError as e:
+      raise QueryError(str(e))
+    for term in terms:
+      lowered = term.lower()
+      if lowered.startswith('bid'):
+        query._parseBid(term[3:])
+      elif lowered == 'nobid':
+        query.noBid = True
+      elif lowered == 'unassigned':
+        query.unassigned = True
+      elif ':' in term:
+        field, _, value = term.partition(':')
+        field = field.lower()
+        if not value:
+          raise QueryError('%s: needs a value' % field)
+        if field == 'artist':
+          query.artist = value
+        elif field in ('department', 'dept'):
+          query.department = value
+        elif field == 'tag':
+          query.tags.append(value)
+        elif field == 'media' and value.lower() in ('missing', 'present'):
+          query.mediaPresent = value.lower() == 'present'
+        else:
+          raise QueryError('Unknown condition: %s' % term)
+      else:
+        raise QueryError('Unknown condition: %s' % term)
+    return query
+
+  def _parseBid(self, condition):
+    for operator in ('>=', '<=', '>', '<', '='):
+      if condition.startswith(operator):
+        value = config.gStatusTags.value(condition[len(operator):].strip())
+        break
+    else:
+      value = None
+    if value is None:
+      raise QueryError('Expected a Bid condition such as bid>=800, not bid%s' % condition)
+    if operator in ('>=', '='):
+      self.minBid = value if self.minBid is None else max(self.minBid, value)
+    if operator in ('<=', '='):
+      self.maxBid = value if self.maxBid is None else min(self.maxBid, value)
+    if operator == '>':
+      self.minBid = value+1 if self.minBid is None else max(self.minBid, value+1)
+    if operator == '<':
+      self.maxBid = value-1 if self.maxBid is None else min(self.maxBid, value-1)
+
+def _fields(item):
+  """
+    Return the (bid, artist name, department, tag names) indexed for a TrackItem
+  """
+  rowData = gRowCache.row(item)
+  bid = config.gStatusTags.value(rowData.status)
+  tagNames = frozenset(name.lower() for name in rowData.tagNames)
+  artistName = rowData.artist['artistName'].lower() if rowData.artist is not None else None
+  department = rowData.department.lower() if rowData.department is not None else None
+  return (bid, artistName, department, tagNames)
+
+class SequenceIndex(object):
+  """
+    Per-field indexes of the shots of one sequence: guid sets by Bid value (with the
+    distinct values kept sorted for range queries), artist, department and tag name
+  """
+
+  def __init__(self):
+    self.items = {}
+    self.byBid = {}
+    self.byArtist = {}
+    self.byDepartment = {}
+    self.byTag = {}
+    self._bidValues = None
+
+  def add(self, guid, item, fields, sign):
+    bid, artist, department, tagNames = fields
+    if sign > 0:
+      self.items[guid] = item
+    else:
+      self.items.pop(guid, None)
+    knownBid = bid in self.byBid
+    self._update(self.byBid, bid, guid, sign)
+    self._update(self.byArtist, artist, guid, sign)
+    self._update(self.byDepartment, department, guid, sign)
+    for tagName in tagNames:
+      self._update(self.byTag, tagName, guid, sign)
+    # The sorted Bid values are rebuilt when a value gains its first shot or loses its last
+    if knownBid != (bid in self.byBid):
+      self._bidValues = None
+
+  def _update(self, index, key, guid, sign):
+    if sign > 0:
+      index.setdefault(key, set()).add(guid)
+    else:
+      guids = index.get(key)
+      if guids is not None:
+        guids.discard(guid)
+        if not guids:
+          del index[key]
+
+  def bidRange(self, minBid, maxBid):
+    """
+      Return the guids of the shots with a Bid between minBid and maxBid (either may be None)
+    """
+    if self._bidValues is None:
+      self._bidValues = sorted(value for value in self.byBid if value is not None)
+    start = 0 if minBid is None else bisect.bisect_left(self._bidValues, minBid)
+    end = len(self._bidValues) if maxBid is None else bisect.bisect_right(self._bidValues, maxBid)
+    guids = set()
+    for value in self._bidValues[start:end]:
+      guids.update(self.byBid[value])
+    return guids
+
+class ShotQueryEngine(IncrementalIndex):
+  """
+    Runs ShotQueries against per-field indexes of each sequence queried, kept up to
+    date as an IncrementalIndex: a sequence is indexed the first time it is queried,
+    then only changed, added and deleted shots are re-indexed.
+  """
+
+  def __init__(self, rowCache=gRowCache, mediaCache=gMediaCache):
+    IncrementalIndex.__init__(self, rowCache)
+    self._mediaCache = mediaCache
+
+  def run(self, query, sequence):
+    """
+      Return the TrackItems of a sequence that match a ShotQuery (or query text)
+    """
+    if isinstance(query, basestring):
+      query = ShotQuery.parse(query)
+    index = self.index(sequence)
+
+    # Each condition narrows the candidates, starting from the index lookups
+    candidates = []
+    if query.minBid is not None or query.maxBid is not None:
+      candidates.append(index.bidRange(query.minBid, query.maxBid))
+    if query.noBid:
+      candidates.append(index.byBid.get(None, set()))
+    if query.artist is not None:
+      candidates.append(index.byArtist.get(query.artist.lower(), set()))
+    if query.unassigned:
+      candidates.append(index.byArtist.get(None, set()))
+    if query.department is not None:
+      candidates.append(index.byDepartment.get(query.department.lower(), set()))
+    for tagName in query.tags:
+      candidates.append(index.byTag.get(tagName.lower(), set()))
+
+    if candidates:
+      candidates.sort(key=len)
+      guids = set(candidates[0])
+      for other in candidates[1:]:
+        guids.intersection_update(other)
+    else:
+      guids = index.items
+
+    items = [index.items[guid] for guid in guids]
+    if query.mediaPresent is not None:
+      # Media presence is not tag data, so it is read from the media cache per candidate
+      isMediaPresent = self._mediaCache.isMediaPresent
+      items = [item for item in items if isMediaPresent(item) is query.mediaPresent]
+    return items
+
+  def index(self, sequence):
+    """
+      Return the up-to-date SequenceIndex of a sequence, indexing it the first time
+    """
+    return self.lookup(sequence)
+
+  def newSequence(self):
+    return SequenceIndex()
+
+  def derive(self, item):
+    return _fields(item)
+
+  def apply(self, index, guid, item, fields, sign):
+    index.add(guid, item, fields, sign)
+
+gShotQueryEngine = ShotQueryEngine()
+
+# Dockable panel which runs a query over the active sequence and selects the matching
+# shots in the Timeline and Spreadsheet
+class ShotQueryPanel(QtWidgets.QWidget):
+
+  def __init__(self, engine=gShotQueryEngine):
+    QtWidgets.QWidget.__init__(self)
+    self.setObjectName('customSpreadsheet.ShotQuery')
+    self.setWindowTitle('Shot Query')
+    self._engine = engine
+
+    layout = QtWidgets.QVBoxLayout(self)
+    self._queryField = QtWidgets.QLineEdit()
+    self._queryField.setPlaceholderText('e.g. bid>=800 department:Comp media:missing')
+    self._queryField.textChanged.connect(self.runQuery)
+    layout.addWidget(self._queryField)
+    self._summary = QtWidgets.QLabel()
+    layout.addWidget(self._summary)
+
+  def runQuery(self, text):
+    sequence = hiero.ui.activeSequence()
+    if sequence is None:
+      self._summary.setText('No active sequence')
+      return
+    if not text.strip():
+      self._summary.setText('')
+      return
+    try:
+      items = self._engine.run(text, sequence)
+    except QueryError as e:
+      self._summary.setText(str(e))
+      return
+    self._summary.setText('%d shots' % len(items))
+    views.selectItems(sequence, items)
@@ -0,0 +1,123 @@
+# Headless Bid and Artist reports across many projects. Each project is opened in a
+# worker process, its shots are formatted as the Spreadsheet columns show them, and the
+# rows of all the projects are merged into one CSV, JSON Lines or SQLite report. Needs
+# only hiero.core, so it runs in Nuke Studio's terminal mode without building any UI.
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+
+import hiero.core
+
+from . import config
+from . import values
+from .artists import ArtistRegistry
+from .rowcache import (RowData, gRowCache)
+from .writers import (kRowWriters, SQLiteRowWriter, trackItems)
+
+# The fields of the per-project summary written alongside the shots
+kProjectFields = ('Project', 'Path', 'Shots', 'Seconds', 'Error')
+
+# The fields of each shot of a report
+kReportRowFields = ('Project',)+values.kShotFields+values.kReportFields
+
+def projectName(path):
+  return os.path.splitext(os.path.basename(path))[0]
+
+def shotRows(project, name):
+  """
+    Yield an OrderedDict of the kReportRowFields of each shot of a project
+  """
+  for sequence in project.sequences():
+    sequenceName = sequence.name()
+    for track, item in trackItems(sequence):
+      row = OrderedDict(zip(kReportRowFields, (name, sequenceName, track.name(), item.name())))
+      row.update(values.reportValues(gRowCache.cached(item) or RowData(item)))
+      yield row
+
+def projectRows(path):
+  """
+    Open a project and return (path, rows, seconds, error): a list of the shotRows()
+    of the project, the seconds taken to open and read it, and the error message if
+    it could not be read
+  """
+  start = time.time()
+  try:
+    project = hiero.core.openProject(path)
+    try:
+      rows = list(shotRows(project, projectName(path)))
+    finally:
+      project.close()
+  except Exception as e:
+    return path, [], time.time()-start, '%s: %s' % (type(e).__name__, e)
+  return path, rows, time.time()-start, None
+
+def workerConfig():
+  """
+    Return the Bid list and Artist roster set with config.configure() as plain lists,
+    to hand to worker processes
+  """
+  return ([(bid.status, bid.icon) for bid in config.gStatusTags.bids()],
+          [artist.asDict() for artist in config.gArtistList])
+
+def configureWorker(statusTags, artists):
+  """
+    Set the Bid list and Artist roster of a worker process from workerConfig()
+  """
+  config.configure(statusTags, ArtistRegistry(artists))
+
+def summaryPath(path):
+  """
+    Return where the per-project summary of a report goes: a 'projects' table of the
+    same SQLite file, or a .projects file beside a CSV or JSON Lines report
+  """
+  base, extension = os.path.splitext(path)
+  if kRowWriters.get(extension.lower()) is SQLiteRowWriter:
+    return path
+  return base+'.projects'+extension
+
+def reportProjects(paths, outputPath, processes=None, progress=None):
+  """
+    Write a report of the shots of every project in paths to outputPath, whose
+    extension picks the format as for exportProject(). The projects are read in a pool
+    of processes (the number of CPUs by default; 1 reads them in this process), each
+    given the Bids and Artist roster set with config.configure() as it starts, as
+    spawned processes (e.g. on Windows) inherit neither. Rows are written as each
+    project finishes. A summary of each project's shot count, time taken and any error
+    is written to summaryPath(outputPath). progress(projectsDone, projectCount, summary)
+    is called as each project finishes. Returns the summaries, in the order of paths.
+  """
+  writerClass = kRowWriters.get(os.path.splitext(outputPath)[1].lower())
+  if writerClass is None:
+    raise ValueError('Unsupported report format: %s' % outputPath)
+
+  pool = None
+  if processes == 1 or len(paths) <= 1:
+    results = (projectRows(path) for path in paths)
+  else:
+    pool = multiprocessing.Pool(processes, configureWorker, workerConfig())
+    results = pool.imap_unordered(projectRows, paths)
+
+  summaries = {}
+  writer = writerClass(outputPath, kReportRowFields)
+  try:
+    for path, rows, seconds, error in results:
+      for row in rows:
+        writer.write(row)
+      summary = summaries[path] = OrderedDict(zip(kProjectFields, (projectName(path), path, len(rows),
+                                                                    '%.3f' % seconds, error or '')))
+      if progress is not None:
+        progress(len(summaries), len(paths), summary)
+  finally:
+    writer.close()
+    if pool is not None:
+      pool.close()
+      pool.join()
+
+  summaryWriter = writerClass(summaryPath(outputPath), kProjectFields, table='projects')
+  try:
+    for path in paths:
+      summaryWriter.write(summaries[path])
+  finally:
+    summaryWriter.close()
+  return [summaries[path] for path in paths]
@@ -0,0 +1,234 @@
+# Per-TrackItem cache of the tag-derived values shown by the custom columns.
+import time
+
+from .tags import (TagSummary, kStatusKey, kArtistIDKey)
+from .values import notesText
+
+# Cached, tag-derived values for a single TrackItem row
+class RowData(object):
+  """
+    The values the custom columns show for one TrackItem, gathered from a single
+    walk over item.tags(). The TagSummary of that walk is kept too, and is what
+    item.tagSummary() returns while the row is cached, along with the tag guids, so
+    RowCache can check the row is still current, and the TrackItem itself.
+  """
+  __slots__ = ('item', 'summary', 'status', 'artist', 'artistID', 'department', 'tagNames', 'iconPaths', '_notes',
+               'tagGuids', 'checkedEpoch')
+
+  def __init__(self, item=None):
+    if item is None:
+      # Filled in by fromValues()
+      return
+    self.item = item
+    summary = self.summary = TagSummary(item.tags())
+    self.tagGuids = tuple(tag.guid() for tag in summary.tags)
+    self.checkedEpoch = None
+    self.status = summary.status
+    self.artistID = summary.artistID
+    self.tagNames = summary.tagNames
+    self._notes = None
+    self.iconPaths = [tag.icon() for tag in summary.plainTags]
+    self.artist = None
+    self.department = None
+    if self.artistID is not None:
+      self.artist = item.getArtistFromID(self.artistID)
+      # The department copied into the Artist tag; tags written without one fall back to the roster
+      self.department = summary.artistDepartment
+      if self.department is None and self.artist is not None:
+        self.department = self.artist['artistDepartment']
+
+  @classmethod
+  def fromValues(cls, status, artistID, artist, department, tagNames, notes, iconPaths):
+    """
+      Return a RowData restored from stored values, e.g. by the sidecar cache. It has
+      no TagSummary, so item.tagSummary() walks the tags for it.
+    """
+    rowData = cls()
+    # Set by RowCache.row() when the row is first asked for
+    rowData.item = None
+    rowData.summary = None
+    rowData.status = status
+    rowData.artistID = artistID
+    rowData.artist = artist
+    rowData.department = department
+    rowData.tagNames = tagNames
+    rowData._notes = notes
+    rowData.iconPaths = iconPaths
+    # Until attach(), the row is checked against the tags only by whoever restored it
+    rowData.tagGuids = None
+    rowData.checkedEpoch = None
+    return rowData
+
+  def attach(self, item, summary):
+    """
+      Give a restored row the TrackItem and the TagSummary it was checked against, so
+      from then on isCurrent() checks it like a built row
+    """
+    self.item = item
+    self.summary = summary
+    self.tagGuids = tuple(tag.guid() for tag in summary.tags)
+
+  @property
+  def notes(self):
+    # Reading the notes costs a call per tag, so it is left until a column asks for them
+    if self._notes is None:
+      self._notes = notesText(self.summary.notes)
+    return self._notes
+
+  def isCurrent(self, item):
+    """
+      Return False if the tags of item no longer match this row: tags were added or
+      removed, e.g. in Hiero's UI, or the Bid, Artist or shown notes were edited
+    """
+    if self.tagGuids is None:
+      return True
+    tags = item.tags()
+    if tuple(tag.guid() for tag in tags) != self.tagGuids:
+      return False
+    summary = self.summary
+    for tag, key, value in ((summary.statusTag, kStatusKey, self.status),
+                            (summary.artistTag, kArtistIDKey, self.artistID)):
+      if tag is not None:
+        M = tag.metadata()
+        if not M.hasKey(key) or M.value(key) != value:
+          return False
+    if self._notes is not None and notesText([note for note in (tag.note() for tag in tags) if len(note)>0]) != self._notes:
+      return False
+    return True
+
+# Per-TrackItem cache of RowData, so a repaint does not re-walk the tags for every cell
+class RowCache(object):
+  """
+    Caches RowData by TrackItem guid. An entry is dropped when the tags of that
+    TrackItem change, via invalidate(), or when everything is cleared after an
+    undo/redo or a project load/close. Tags can also change where no Python runs, e.g.
+    dropped on the timeline, so after revalidate() (called on selection, context and
+    focus changes, and at most every kRevalidateInterval seconds while painting, see
+    lazy.py) each row is checked against its tags the next time it is asked for, and
+    rebuilt if they differ. Those checks are counted apart from the hits. As every tag change passes through
+    here, listeners added with addListener() are told about each one: listener(item)
+    after invalidate(item) and for each row invalidateArtists() drops, and
+    listener(None) after clear(). Listeners added with
+    addBuildListener() are called with (item, rowData) each time a row is built.
+  """
+
+  def __init__(self):
+    self._rows = {}
+    self._epoch = 0
+    self.revalidatedAt = 0.0
+    self._listeners = []
+    self._buildListeners = []
+    self.hits = 0
+    self.checks = 0
+    self.misses = 0
+
+  def addListener(self, listener):
+    if listener not in self._listeners:
+      self._listeners.append(listener)
+
+  def removeListener(self, listener):
+    if listener in self._listeners:
+      self._listeners.remove(listener)
+
+  def addBuildListener(self, listener):
+    if listener not in self._buildListeners:
+      self._buildListeners.append(listener)
+
+  def removeBuildListener(self, listener):
+    if listener in self._buildListeners:
+      self._buildListeners.remove(listener)
+
+  def row(self, item):
+    """
+      Return the RowData for a TrackItem, building it on a miss
+    """
+    key = item.guid()
+    rowData = self._rows.get(key)
+    if rowData is not None:
+      if rowData.checkedEpoch == self._epoch:
+        self.hits+=1
+        return rowData
+      rowData.checkedEpoch = self._epoch
+      if rowData.item is None:
+        rowData.item = item
+      if rowData.isCurrent(item):
+        self.checks+=1
+        return rowData
+      self.invalidate(item)
+    self.misses+=1
+    rowData = RowData(item)
+    rowData.checkedEpoch = self._epoch
+    self._rows[key] = rowData
+    for listener in self._buildListeners:
+      listener(item, rowData)
+    return rowData
+
+  def revalidate(self, *args):
+    """
+      Have each row checked against its tags the next time it is asked for. Accepts
+      and ignores event/signal arguments.
+    """
+    self._epoch+=1
+    self.revalidatedAt = time.time()
+
+  def restore(self, rows):
+    """
+      Add (guid, RowData) pairs restored from elsewhere, e.g. the sidecar cache, without
+      replacing rows that are already cached
+    """
+    for key, rowData in rows:
+      self._rows.setdefault(key, rowData)
+
+  def cached(self, item):
+    """
+      Return the cached RowData of a TrackItem, or None. Does not build or count.
+    """
+    return self._rows.get(item.guid())
+
+  def invalidate(self, item):
+    """
+      Drop the cached row of a TrackItem whose tags have changed
+    """
+    self._rows.pop(item.guid(), None)
+    for listener in self._listeners:
+      listener(item)
+
+  def invalidateArtists(self, artistIDs):
+    """
+      Drop the cached rows of the TrackItems assigned to any of the given artistIDs,
+      e.g. after those Artists changed in a reloaded roster
+    """
+    artistIDs = set(str(artistID) for artistID in artistIDs)
+    stale = [(key, rowData) for key, rowData in self._rows.items() if rowData.artistID in artistIDs]
+    for key, rowData in stale:
+      del self._rows[key]
+      # A restored row that was never asked for has no TrackItem, and no listener has seen it
+      if rowData.item is not None:
+        for listener in self._listeners:
+          listener(rowData.item)
+
+  def clear(self, *args):
+    """
+      Drop every cached row. Accepts and ignores event/signal arguments.
+    """
+    self._rows.clear()
+    for listener in self._listeners:
+      listener(None)
+
+  def stats(self):
+    """
+      Return the hit/check/miss counters, e.g. for checking from the Script Editor
+    """
+    lookups = self.hits+self.checks+self.misses
+    return {'hits' : self.hits,
+            'checks' : self.checks,
+            'misses' : self.misses,
+            'size' : len(self._rows),
+            'hitRate' : float(self.hits)/lookups if lookups else 0.0}
+
+  def resetStats(self):
+    self.hits = 0
+    self.checks = 0
+    self.misses = 0
+
+gRowCache = RowCache()
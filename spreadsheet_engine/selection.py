@@ -0,0 +1,49 @@
+# Expansion of a Timeline/Spreadsheet selection into the TrackItems it covers.
+import itertools
+
+import hiero.core
+
+def iterTrackItems(selection):
+  """
+    Lazily yield each TrackItem covered by a selection once. A selection may mix
+    TrackItems, Tracks (all of their items) and Sequences (the items of all their
+    video tracks); a shot selected both directly and through its track is only
+    yielded once, and a track is only walked once. Items are matched by guid(),
+    as Hiero can hand out more than one Python wrapper for the same item.
+  """
+  seenItems = set()
+  seenTracks = set()
+  for target in selection:
+    if isinstance(target, hiero.core.TrackItem):
+      items = (target,)
+    elif isinstance(target, (hiero.core.VideoTrack, hiero.core.AudioTrack)):
+      items = _trackItems((target,), seenTracks)
+    elif isinstance(target, hiero.core.Sequence):
+      items = _trackItems(target.videoTracks(), seenTracks)
+    else:
+      continue
+    for item in items:
+      guid = item.guid()
+      if guid not in seenItems:
+        seenItems.add(guid)
+        yield item
+
+def _trackItems(tracks, seenTracks):
+  for track in tracks:
+    guid = track.guid()
+    if guid in seenTracks:
+      continue
+    seenTracks.add(guid)
+    for item in track.items():
+      if isinstance(item, hiero.core.TrackItem):
+        yield item
+
+def peekTrackItems(selection):
+  """
+    Return (first TrackItem, iterator over all of them) for a selection, or (None, None)
+    if it covers no TrackItems, without expanding the rest of the selection
+  """
+  items = iterTrackItems(selection)
+  for first in items:
+    return first, itertools.chain((first,), items)
+  return None, None
@@ -0,0 +1,237 @@
+# Optional on-disk cache of the derived column values and media-presence results of a
+# project, in a SQLite file next to the .hrox. Rows are keyed by TrackItem guid and a
+# fingerprint of the tags they were derived from, so a reopened project shows its
+# values straight away while they are checked against the tags in the background.
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import hiero.core
+from PySide2 import QtCore
+
+from . import config
+from . import views
+from .media import gMediaCache
+from .rowcache import (RowData, gRowCache)
+from .tags import TagSummary
+
+# Appended to the project path, minus its extension, to give the sidecar path
+kSidecarSuffix = '.spreadsheet-cache.sqlite'
+
+# Seconds between writes of new and changed rows to the sidecar
+kSidecarFlushInterval = 30.0
+
+# Seconds spent checking restored rows against their tags per idle step
+kVerifySliceSeconds = 0.005
+
+_kSchema = ('CREATE TABLE IF NOT EXISTS rows (guid TEXT PRIMARY KEY, fingerprint TEXT, status TEXT, artistID TEXT, '
+            'department TEXT, tagNames TEXT, notes TEXT, iconPaths TEXT)',
+            'CREATE TABLE IF NOT EXISTS media (filenames TEXT PRIMARY KEY, present INTEGER, probedAt REAL)')
+
+def sidecarPath(project):
+  """
+    Return the sidecar cache path of a project, or None if it has not been saved
+  """
+  path = project.path()
+  if not path:
+    return None
+  return os.path.splitext(path)[0]+kSidecarSuffix
+
+def fingerprint(summary):
+  """
+    Return a fingerprint of everything RowData derives from the tags of a TrackItem
+  """
+  digest = hashlib.sha1()
+  for tag in summary.tags:
+    digest.update(repr((tag.name(), tag.note(), tag.icon())))
+  digest.update(repr((summary.status, summary.artistID, summary.artistDepartment)))
+  return digest.hexdigest()[:16]
+
+class ProjectSidecar(object):
+  """
+    The sidecar of one project: the fingerprints of the rows and the probe times of the
+    media it holds, the rows built since the last write, and the restored shots still
+    to be checked
+  """
+  __slots__ = ('path', 'saved', 'savedMedia', 'dirty', 'pending')
+
+  def __init__(self, path):
+    self.path = path
+    self.saved = {}
+    self.savedMedia = {}
+    self.dirty = {}
+    self.pending = None
+
+class SidecarCache(QtCore.QObject):
+  """
+    Loads the sidecar of each project as it is opened: the stored rows go into the
+    row cache and the media results into the media cache, in bulk. The project's shots
+    are then fingerprinted in idle steps: rows whose tags have changed since are
+    dropped, to be rebuilt when next shown, and the others are attached to their
+    tags, so later edits made in Hiero's UI are caught like those of built rows. Rows are fingerprinted as they are built;
+    every kSidecarFlushInterval seconds, and when a project closes, the rows and media
+    results of each project that changed since are written to its own sidecar, in one
+    transaction.
+  """
+
+  def __init__(self, rowCache=gRowCache, mediaCache=gMediaCache):
+    QtCore.QObject.__init__(self)
+    self._rowCache = rowCache
+    self._mediaCache = mediaCache
+    self._projects = {}
+    self._flushTimer = None
+
+  def register(self):
+    hiero.core.events.registerInterest(hiero.core.events.EventType.kAfterProjectLoad, self.projectLoaded)
+    hiero.core.events.registerInterest(hiero.core.events.EventType.kBeforeProjectClose, self.projectClosing)
+    hiero.core.events.registerInterest(hiero.core.events.EventType.kShutdown, self.flush)
+    self._rowCache.addBuildListener(self._rowBuilt)
+    if self._flushTimer is None:
+      self._flushTimer = QtCore.QTimer()
+      self._flushTimer.setInterval(int(kSidecarFlushInterval*1000))
+      self._flushTimer.timeout.connect(self.flush)
+    self._flushTimer.start()
+
+  def unregister(self):
+    hiero.core.events.unregisterInterest(hiero.core.events.EventType.kAfterProjectLoad, self.projectLoaded)
+    hiero.core.events.unregisterInterest(hiero.core.events.EventType.kBeforeProjectClose, self.projectClosing)
+    hiero.core.events.unregisterInterest(hiero.core.events.EventType.kShutdown, self.flush)
+    self._rowCache.removeBuildListener(self._rowBuilt)
+    if self._flushTimer is not None:
+      self._flushTimer.stop()
+
+  def projectLoaded(self, event):
+    self.load(event.sender)
+
+  def projectClosing(self, event):
+    path = sidecarPath(event.sender)
+    sidecar = self._projects.pop(path, None)
+    if sidecar is not None:
+      sidecar.pending = None
+      self._write(sidecar)
+
+  def sidecar(self, project):
+    """
+      Return the ProjectSidecar of a project, or None if it has not been saved
+    """
+    path = sidecarPath(project)
+    if path is None:
+      return None
+    sidecar = self._projects.get(path)
+    if sidecar is None:
+      sidecar = self._projects[path] = ProjectSidecar(path)
+    return sidecar
+
+  def load(self, project):
+    """
+      Restore the rows and media results of a project's sidecar, if it has one, and
+      start checking the restored rows in the background
+    """
+    path = sidecarPath(project)
+    if path is None:
+      return
+    sidecar = self._projects[path] = ProjectSidecar(path)
+    if not os.path.exists(path):
+      return
+
+    connection = self._connect(sidecar)
+    try:
+      rows = connection.execute('SELECT guid, fingerprint, status, artistID, department, tagNames, notes, '
+                                'iconPaths FROM rows').fetchall()
+      media = connection.execute('SELECT filenames, present, probedAt FROM media').fetchall()
+    finally:
+      connection.close()
+
+    fromID = config.gArtistList.fromID
+    restored = []
+    for guid, rowFingerprint, status, artistID, department, tagNames, notes, iconPaths in rows:
+      artist = fromID(artistID) if artistID is not None else None
+      restored.append((guid, RowData.fromValues(status, artistID, artist, department, json.loads(tagNames), notes,
+                                                json.loads(iconPaths))))
+      sidecar.saved[guid] = rowFingerprint
+    self._rowCache.restore(restored)
+    results = [(tuple(json.loads(filenames)), bool(present), probedAt) for filenames, present, probedAt in media]
+    self._mediaCache.restore(results)
+    for filenames, present, probedAt in results:
+      sidecar.savedMedia[filenames] = probedAt
+
+    sidecar.pending = self._iterProjectItems(project)
+    QtCore.QTimer.singleShot(0, lambda: self._verifyStep(sidecar))
+
+  def flush(self, *args):
+    """
+      Write the rows and media results of each project that changed since the last flush
+    """
+    for sidecar in self._projects.values():
+      self._write(sidecar)
+
+  def _write(self, sidecar):
+    rows = []
+    for guid, (rowData, rowFingerprint) in sidecar.dirty.items():
+      if sidecar.saved.get(guid) == rowFingerprint:
+        continue
+      rows.append((guid, rowFingerprint, rowData.status, rowData.artistID, rowData.department,
+                   json.dumps(rowData.tagNames), rowData.notes, json.dumps(rowData.iconPaths)))
+      sidecar.saved[guid] = rowFingerprint
+    sidecar.dirty.clear()
+    media = []
+    for filenames, present, probedAt in self._mediaCache.results(sidecar.saved):
+      if sidecar.savedMedia.get(filenames) != probedAt:
+        media.append((json.dumps(filenames), int(bool(present)), probedAt))
+        sidecar.savedMedia[filenames] = probedAt
+    if not rows and not media:
+      return
+
+    connection = self._connect(sidecar)
+    try:
+      with connection:
+        connection.executemany('INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        connection.executemany('INSERT OR REPLACE INTO media VALUES (?, ?, ?)', media)
+    finally:
+      connection.close()
+
+  def _connect(self, sidecar):
+    connection = sqlite3.connect(sidecar.path)
+    for statement in _kSchema:
+      connection.execute(statement)
+    return connection
+
+  def _iterProjectItems(self, project):
+    for sequence in project.sequences():
+      for track in list(sequence.videoTracks())+list(sequence.audioTracks()):
+        for item in track.items():
+          yield item
+
+  def _verifyStep(self, sidecar):
+    if sidecar.pending is None:
+      return
+    stale = False
+    deadline = time.time()+kVerifySliceSeconds
+    for item in sidecar.pending:
+      rowData = self._rowCache.cached(item)
+      if rowData is not None and rowData.summary is None:
+        summary = TagSummary(item.tags())
+        if fingerprint(summary) == sidecar.saved.get(item.guid()):
+          rowData.attach(item, summary)
+        else:
+          self._rowCache.invalidate(item)
+          stale = True
+      if time.time() > deadline:
+        break
+    else:
+      sidecar.pending = None
+    if stale:
+      views.refreshSpreadsheets()
+    if sidecar.pending is not None:
+      QtCore.QTimer.singleShot(0, lambda: self._verifyStep(sidecar))
+
+  def _rowBuilt(self, item, rowData):
+    # Fingerprinted now, while the tags are those the row was built from
+    project = item.project()
+    sidecar = self.sidecar(project) if project is not None else None
+    if sidecar is not None:
+      sidecar.dirty[item.guid()] = (rowData, fingerprint(rowData.summary))
+
+gSidecarCache = SidecarCache()
@@ -0,0 +1,133 @@
+# Installs a column set, its Bid list and Artist roster into Hiero.
+import hiero.core
+import hiero.ui
+from PySide2 import QtCore
+
+from . import artisttags
+from . import bidtotals
+from . import config
+from . import exporter
+from . import importer
+from . import instrument
+from . import media
+from . import menus
+from . import notesindex
+from . import query
+from . import sidecar
+from . import trackitem
+from . import views
+from . import warmup
+from .artists import kRosterCheckInterval
+from .columns import CustomSpreadsheetColumns
+from .rowcache import gRowCache
+
+# The right-click menus and actions of the currently installed column set
+gSetStatusMenu = None
+gAssignArtistMenu = None
+gContextMenuActions = []
+
+# The Bid Totals, Notes Search and Shot Query panels are created once, and kept across installs
+gBidTotalsPanel = None
+gNotesSearchPanel = None
+gShotQueryPanel = None
+
+# Polls the roster file of the installed ArtistRegistry, when it has one
+gRosterTimer = None
+
+def _rosterChanged(artistIDs):
+  # The department, name and icon copied into the Artist tags of the Artists that changed
+  # are brought up to date in each open project, then only the rows of those Artists are rebuilt
+  for project in hiero.core.projects():
+    artisttags.propagateRoster(project, artistIDs=artistIDs)
+  gRowCache.invalidateArtists(artistIDs)
+  views.refreshSpreadsheets()
+
+def _watchRoster(artistList):
+  global gRosterTimer
+  if gRosterTimer is None:
+    gRosterTimer = QtCore.QTimer()
+    gRosterTimer.setInterval(int(kRosterCheckInterval*1000))
+    gRosterTimer.timeout.connect(lambda: config.gArtistList.checkForChanges())
+  if artistList.path:
+    gRosterTimer.start()
+  else:
+    gRosterTimer.stop()
+
+def install(columns, statusTags, artistList, addStatusMenu=True, assignArtistMenu=True, rescanMediaAction=True,
+            importBidsAction=True, exportColumnsAction=True, updateArtistTagsAction=True, bidTotalsPanel=True,
+            notesSearchPanel=True, shotQueryPanel=True, warmCaches=True, sidecarCache=False):
+  """
+    Make columns the custom Spreadsheet columns, working from the given Bid list
+    (gStatusTags: a BidRegistry, dictionary or list) and ArtistRegistry. Optionally
+    adds the 'Set Bid' and 'Assign Artist' right-click menus, the 'Rescan Media',
+    'Import Bids...', 'Export Custom Columns...' and 'Update Artist Tags' actions, the
+    'Bid Totals', 'Notes Search' and 'Shot Query' panels, the warming of the row and
+    media caches of each sequence opened, and a SQLite sidecar cache of the column
+    values of each saved project, kept next to its .hrox. Installing a column set
+    replaces the one installed before it. Returns the CustomSpreadsheetColumns
+    instance registered with Hiero.
+  """
+  global gSetStatusMenu
+  global gAssignArtistMenu
+  global gBidTotalsPanel
+  global gNotesSearchPanel
+  global gShotQueryPanel
+
+  config.gArtistList.removeListener(_rosterChanged)
+  config.configure(statusTags, artistList)
+  artistList.addListener(_rosterChanged)
+  _watchRoster(artistList)
+  gRowCache.clear()
+
+  for menu in [gSetStatusMenu, gAssignArtistMenu]+gContextMenuActions:
+    if menu is not None:
+      menu.unregister()
+  gSetStatusMenu = None
+  gAssignArtistMenu = None
+  del gContextMenuActions[:]
+
+  # Optionally add the 'Set Status' and Artist menus to Timeline and Spreadsheet
+  if addStatusMenu:
+    gSetStatusMenu = menus.SetStatusMenu()
+
+  if assignArtistMenu:
+    gAssignArtistMenu = menus.AssignArtistMenu()
+
+  if rescanMediaAction:
+    gContextMenuActions.append(media.RescanMediaAction())
+
+  if importBidsAction:
+    gContextMenuActions.append(importer.ImportBidsAction())
+
+  if exportColumnsAction:
+    gContextMenuActions.append(exporter.ExportColumnsAction())
+
+  if updateArtistTagsAction:
+    gContextMenuActions.append(artisttags.UpdateArtistTagsAction())
+
+  if bidTotalsPanel and gBidTotalsPanel is None:
+    gBidTotalsPanel = bidtotals.BidTotalsPanel()
+    hiero.ui.windowManager().addWindow(gBidTotalsPanel)
+
+  if notesSearchPanel and gNotesSearchPanel is None:
+    gNotesSearchPanel = notesindex.NotesSearchPanel()
+    hiero.ui.windowManager().addWindow(gNotesSearchPanel)
+
+  if shotQueryPanel and gShotQueryPanel is None:
+    gShotQueryPanel = query.ShotQueryPanel()
+    hiero.ui.windowManager().addWindow(gShotQueryPanel)
+
+  warmup.gCacheWarmer.unregister()
+  if warmCaches:
+    warmup.gCacheWarmer.register()
+
+  sidecar.gSidecarCache.unregister()
+  if sidecarCache:
+    sidecar.gSidecarCache.register()
+
+  # Register our custom columns
+  customColumns = CustomSpreadsheetColumns(columns)
+  if instrument.enabled():
+    instrument.enable(customColumns)
+  hiero.ui.customColumn = customColumns
+  return customColumns
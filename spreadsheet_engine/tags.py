@@ -0,0 +1,71 @@
+# Single-pass classification of the Tags of a TrackItem into Status, Artist and plain Tags.
+
+# Tag metadata keys of the Status (Bid) and Artist tags
+kStatusKey = 'tag.status'
+kArtistIDKey = 'tag.artistID'
+
+# Tag metadata keys of the Artist record fields copied into an Artist tag when it is assigned
+kArtistNameKey = 'tag.artistName'
+kArtistDepartmentKey = 'tag.artistDepartment'
+
+def artistTagValues(artist):
+  """
+    Return the (key, value) metadata pairs an Artist tag carries for an Artist record
+  """
+  return ((kArtistIDKey, str(artist['artistID'])),
+          (kArtistNameKey, str(artist['artistName'])),
+          (kArtistDepartmentKey, str(artist['artistDepartment'])))
+
+class TagSummary(object):
+  """
+    The Tags of a TrackItem, classified in one walk over item.tags(): the Status and
+    Artist tags (the last of each, if a shot has more than one) and their values, and
+    the remaining plain Tags. The names and non-empty notes of all the Tags, in order,
+    are gathered from the same list when first asked for, as the setters never need them.
+    So is the department copied into the Artist tag.
+  """
+  __slots__ = ('tags', 'statusTag', 'status', 'artistTag', 'artistID', 'plainTags', '_tagNames', '_notes',
+               '_artistDepartment')
+
+  def __init__(self, tags):
+    self.tags = tags
+    self.statusTag = None
+    self.status = None
+    self.artistTag = None
+    self.artistID = None
+    self.plainTags = []
+    self._tagNames = None
+    self._notes = None
+    self._artistDepartment = False
+    for tag in tags:
+      M = tag.metadata()
+      if M.hasKey(kStatusKey):
+        self.statusTag = tag
+        self.status = M.value(kStatusKey)
+      elif M.hasKey(kArtistIDKey):
+        self.artistTag = tag
+        self.artistID = M.value(kArtistIDKey)
+      else:
+        self.plainTags.append(tag)
+
+  @property
+  def tagNames(self):
+    if self._tagNames is None:
+      self._tagNames = [tag.name() for tag in self.tags]
+    return self._tagNames
+
+  @property
+  def notes(self):
+    if self._notes is None:
+      self._notes = [note for note in (tag.note() for tag in self.tags) if len(note)>0]
+    return self._notes
+
+  @property
+  def artistDepartment(self):
+    if self._artistDepartment is False:
+      self._artistDepartment = None
+      if self.artistTag is not None:
+        M = self.artistTag.metadata()
+        if M.hasKey(kArtistDepartmentKey):
+          self._artistDepartment = M.value(kArtistDepartmentKey)
+    return self._artistDepartment
@@ -0,0 +1,150 @@
+# Status and Artist getter/setter methods, injected into hiero.core.TrackItem.
+import hiero.core
+
+from . import config
+from .batch import sequenceEdited
+from .rowcache import gRowCache
+from .tags import (TagSummary, kStatusKey, artistTagValues)
+
+def _tagSummary(self, cached=True):
+  """ tagSummary(cached=True) -> returns the TagSummary of this shot: its Status tag, Artist tag, plain tags and notes.
+  Taken from the row cache when the row is cached, otherwise from one walk over the tags.
+  Code that edits the tags passes cached=False: a tag removed in Hiero's UI may still be in the cached summary."""
+  if cached:
+    rowData = gRowCache.cached(self)
+    if rowData is not None and rowData.summary is not None:
+      return rowData.summary
+  return TagSummary(self.tags())
+
+hiero.core.TrackItem.tagSummary = _tagSummary
+
+def _getArtistFromID(self,artistID):
+  """ getArtistFromID -> returns an artist record, by their given ID"""
+  return config.gArtistList.fromID(artistID)
+
+def _getArtistFromName(self,artistName):
+  """ getArtistFromName -> returns an artist record, by their given name """
+  return config.gArtistList.fromName(artistName)
+
+def _artist(self):
+  """_artist -> Returns the artist dictionary assigned to this shot"""
+  artistID = self.tagSummary().artistID
+  if artistID is None:
+    return None
+  return self.getArtistFromID(artistID)
+
+def _updateArtistTag(self,artistDict):
+  # A shot will only have one artist assigned. Check if one exists and set accordingly
+  artistTag = self.tagSummary(cached=False).artistTag
+
+  if not artistTag:
+    artistTag = hiero.core.Tag('Artist')
+    artistTag.setIcon(artistDict['artistIcon'])
+    for key, value in artistTagValues(artistDict):
+      artistTag.metadata().setValue(key, value)
+    self.addTag(artistTag)
+    sequenceEdited(self.sequence())
+    return
+
+  artistTag.setIcon(artistDict['artistIcon'])
+  for key, value in artistTagValues(artistDict):
+    artistTag.metadata().setValue(key, value)
+  gRowCache.invalidate(self)
+  sequenceEdited(self.sequence())
+  return
+
+def _setArtistByName(self,artistName):
+  """ setArtistByName(artistName) -> sets the artist tag on a TrackItem by a given artistName string"""
+  artist = self.getArtistFromName(artistName)
+  if not artist:
+    print 'Artist name: %s was not found in the gArtistList.' % str(artistName)
+    return
+
+  # Do the update.
+  self.updateArtistTag(artist)
+
+def _setArtistByID(self,artistID):
+  """ setArtistByID(artistID) -> sets the artist tag on a TrackItem by a given artistID integer"""
+  artist = self.getArtistFromID(artistID)
+  if not artist:
+    print 'Artist name: %s was not found in the gArtistList.' % str(artistID)
+    return
+
+  # Do the update.
+  self.updateArtistTag(artist)
+
+# Inject status getter and setter methods into hiero.core.TrackItem
+hiero.core.TrackItem.artist = _artist
+hiero.core.TrackItem.setArtistByName = _setArtistByName
+hiero.core.TrackItem.setArtistByID = _setArtistByID  
+hiero.core.TrackItem.getArtistFromName = _getArtistFromName
+hiero.core.TrackItem.getArtistFromID = _getArtistFromID
+hiero.core.TrackItem.updateArtistTag = _updateArtistTag
+  
+def _status(self):
+  """status -> Returns the Shot status. None if no Status is set."""
+  return self.tagSummary().status
+
+def _setStatus(self, status):
+  """setShotStatus(status) -> Method to set the Status of a Shot. 
+  Adds a special kind of status Tag to a TrackItem
+  Example: myTrackItem.setStatus('Final')
+
+  @param status - a string, corresponding to the Status name
+  """
+  # Get a valid Tag object from the Global list of statuses
+  if not status in config.gStatusTags:
+    print 'Status requested was not a valid Status string.'
+    return 
+
+  # A shot should only have one status. Check if one exists and set accordingly 
+  statusTag = self.tagSummary(cached=False).statusTag
+
+  if not statusTag:
+    statusTag = hiero.core.Tag('Status')
+    statusTag.setIcon(config.statusIcon(status))
+    statusTag.metadata().setValue(kStatusKey, status) 
+    self.addTag(statusTag)
+
+  statusTag.setIcon(config.statusIcon(status))
+  statusTag.metadata().setValue(kStatusKey, status)
+  gRowCache.invalidate(self)
+  
+  sequenceEdited(self.sequence())
+  return
+
+# Inject status getter and setter methods into hiero.core.TrackItem
+hiero.core.TrackItem.setStatus = _setStatus
+hiero.core.TrackItem.status = _status
+
+# Wrap addTag/removeTag so that any script adding or removing a Tag drops the cached row.
+# The originals are kept on the class, so re-running this script does not wrap twice.
+if not hasattr(hiero.core.TrackItem, '_rowCacheAddTag'):
+  hiero.core.TrackItem._rowCacheAddTag = hiero.core.TrackItem.addTag
+  hiero.core.TrackItem._rowCacheRemoveTag = hiero.core.TrackItem.removeTag
+
+def _addTag(self, tag):
+  result = self._rowCacheAddTag(tag)
+  gRowCache.invalidate(self)
+  return result
+
+def _removeTag(self, tag):
+  result = self._rowCacheRemoveTag(tag)
+  gRowCache.invalidate(self)
+  return result
+
+hiero.core.TrackItem.addTag = _addTag
+hiero.core.TrackItem.removeTag = _removeTag
+
+# Project load/close can change tags behind our back, so drop the whole cache; so can
+# Undo/Redo, which is hooked up with the Spreadsheet UI (see lazy.py). Tags dropped on or
+# removed from the timeline, or edited in the Tag dialog, raise no event of their own:
+# rows are re-checked against their tags after selection and context changes, and on
+# focus changes and while painting (see lazy.py).
+def _connectRowCacheInvalidation():
+  hiero.core.events.registerInterest(hiero.core.events.EventType.kAfterProjectLoad, gRowCache.clear)
+  hiero.core.events.registerInterest(hiero.core.events.EventType.kBeforeProjectClose, gRowCache.clear)
+  hiero.core.events.registerInterest(hiero.core.events.EventType.kSelectionChanged, gRowCache.revalidate)
+  hiero.core.events.registerInterest(hiero.core.events.EventType.kContextChanged, gRowCache.revalidate)
+
+_connectRowCacheInvalidation()
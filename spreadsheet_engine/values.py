@@ -0,0 +1,47 @@
+# The text of the custom column cells, from the values of a RowData. Kept free of Hiero
+# and Qt, so readers that run outside Nuke Studio format values exactly as the columns do.
+from collections import OrderedDict
+
+# Shown for an empty Bid, Artist or Department
+kEmptyValue = '--'
+
+# The fields that identify a shot in exports and reports, before the column values
+kShotFields = ('Sequence', 'Track', 'Shot')
+
+# The value fields of a report, as written by reportValues()
+kReportFields = ('Bid', 'Artist ID', 'Artist', 'Department', 'Notes')
+
+def tagsText(tagNames):
+  return ','.join(tagNames)
+
+def notesText(notes):
+  return ', '.join(notes)
+
+def bidText(status):
+  if not status:
+    return kEmptyValue
+  return str(status)
+
+def artistIDText(artistID):
+  if artistID is None:
+    return kEmptyValue
+  return str(artistID)
+
+def artistText(artist):
+  if artist:
+    return artist['artistName']
+  return kEmptyValue
+
+def departmentText(department):
+  if department is not None:
+    return department
+  return kEmptyValue
+
+def reportValues(rowData):
+  """
+    Return an OrderedDict of the kReportFields of a RowData, as the Bid, Artist ID,
+    Artist, Department and Notes columns show them
+  """
+  return OrderedDict(zip(kReportFields, (bidText(rowData.status), artistIDText(rowData.artistID),
+                                         artistText(rowData.artist), departmentText(rowData.department),
+                                         rowData.notes)))
@@ -0,0 +1,53 @@
+# Helpers for finding and refreshing the Qt item views of the open Spreadsheets.
+import hiero.ui
+from PySide2 import QtWidgets
+
+def itemViews():
+  """
+    Yield the QAbstractItemViews of every open Hiero window, i.e. the Spreadsheet tables
+  """
+  for window in hiero.ui.windowManager().windows():
+    for view in window.findChildren(QtWidgets.QAbstractItemView):
+      yield view
+
+def refreshSpreadsheets():
+  """
+    Repaint the visible cells of every Spreadsheet, e.g. after background results arrive
+  """
+  for view in itemViews():
+    view.viewport().update()
+
+def refreshCells(cells, numCustomColumns):
+  """
+    Repaint just the given (row, custom column) cells of every Spreadsheet. Hiero adds
+    the custom columns after its own, so they are the last numCustomColumns columns.
+  """
+  for view in itemViews():
+    model = view.model()
+    if model is None:
+      continue
+    offset = model.columnCount()-numCustomColumns
+    if offset < 0:
+      continue
+    for row, column in cells:
+      view.update(model.index(row, offset+column))
+
+def spreadsheetItems(sequence):
+  """
+    Return the TrackItems of a sequence in the order the Spreadsheet lists them: by
+    timeline position, then track
+  """
+  items = []
+  for trackIndex, track in enumerate(list(sequence.videoTracks())+list(sequence.audioTracks())):
+    for item in track.items():
+      items.append((item.timelineIn(), trackIndex, item))
+  items.sort(key=lambda entry: entry[:2])
+  return [item for timelineIn, trackIndex, item in items]
+
+def selectItems(sequence, items):
+  """
+    Select TrackItems of a sequence in its Timeline, which the Spreadsheet follows
+  """
+  editor = hiero.ui.getTimelineEditor(sequence)
+  if editor is not None:
+    editor.setSelection(list(items))
@@ -0,0 +1,147 @@
+# Background warming of the row and media caches, so the first scroll through a large
+# sequence does not pay for the tag walks and media checks of every row it passes.
+import time
+
+import hiero.core
+import hiero.ui
+from PySide2 import QtCore
+
+from . import views
+from .lazy import gVisibleRows
+from .media import gMediaCache
+from .rowcache import gRowCache
+
+# Rows assumed visible when a sequence is first opened, until setVisibleRows() says otherwise
+kDefaultVisibleRows = 50
+
+# Seconds of row warming done per idle step, so the UI stays responsive
+kWarmSliceSeconds = 0.005
+
+def distanceOrder(count, firstRow, lastRow):
+  """
+    Return the row numbers 0..count-1 with the rows firstRow..lastRow first, then the
+    rest in order of distance from them, alternating below and above. A range past
+    the last row, e.g. one left from a longer sequence, is clamped to it.
+  """
+  if count == 0:
+    return []
+  firstRow = max(0, min(firstRow, count-1))
+  lastRow = max(firstRow, min(lastRow, count-1))
+  rows = list(range(firstRow, lastRow+1))
+  below = lastRow+1
+  above = firstRow-1
+  while below < count or above >= 0:
+    if below < count:
+      rows.append(below)
+      below+=1
+    if above >= 0:
+      rows.append(above)
+      above-=1
+  return rows
+
+class CacheWarmer(QtCore.QObject):
+  """
+    Warms the caches for the sequence in the Spreadsheet: its media is probed in the
+    media cache's thread pool, and its rows are built in short idle steps on the UI
+    thread (the Hiero API is not thread-safe, so tags are only read there). Visible
+    rows go first, then the rest by distance from them. Starting another sequence, or
+    cancel(), stops the current warm-up.
+  """
+
+  # Emitted with the sequence when all of its rows are warm
+  finished = QtCore.Signal(object)
+
+  def __init__(self, rowCache=gRowCache, mediaCache=gMediaCache):
+    QtCore.QObject.__init__(self)
+    self._rowCache = rowCache
+    self._mediaCache = mediaCache
+    self._sequence = None
+    self._items = []
+    self._order = []
+    self._position = 0
+    self._generation = 0
+
+  def sequence(self):
+    return self._sequence
+
+  def start(self, sequence, firstRow=0, lastRow=kDefaultVisibleRows-1):
+    """
+      Start warming a sequence, cancelling any warm-up in progress
+    """
+    self.cancel()
+    self._sequence = sequence
+    self._items = views.spreadsheetItems(sequence)
+    self._order = distanceOrder(len(self._items), firstRow, lastRow)
+    self._position = 0
+    self._mediaCache.scanSequence(sequence, [self._items[row] for row in self._order])
+    self._schedule()
+
+  def setVisibleRows(self, firstRow, lastRow):
+    """
+      Warm the rows around firstRow..lastRow next, e.g. after the Spreadsheet scrolled
+    """
+    if self._sequence is None or not self.isRunning():
+      return
+    self._order = distanceOrder(len(self._items), firstRow, lastRow)
+    self._position = 0
+
+  def cancel(self, *args):
+    """
+      Stop warming. Accepts and ignores event arguments.
+    """
+    self._generation+=1
+    self._sequence = None
+    self._items = []
+    self._order = []
+    self._position = 0
+
+  def isRunning(self):
+    return self._position < len(self._order)
+
+  def _schedule(self):
+    generation = self._generation
+    QtCore.QTimer.singleShot(0, lambda: self._step(generation))
+
+  def _step(self, generation):
+    if generation != self._generation:
+      return
+    deadline = time.time()+kWarmSliceSeconds
+    row = self._rowCache.row
+    cached = self._rowCache.cached
+    items = self._items
+    order = self._order
+    while self._position < len(order):
+      item = items[order[self._position]]
+      self._position+=1
+      # Rows already warm (e.g. painted, or warmed before a re-prioritise) are skipped cheaply
+      if cached(item) is None:
+        row(item)
+        if time.time() > deadline:
+          self._schedule()
+          return
+    sequence = self._sequence
+    self._order = []
+    self._position = 0
+    self.finished.emit(sequence)
+
+  def register(self):
+    """
+      Start warming each sequence as it becomes the active one
+    """
+    hiero.core.events.registerInterest(hiero.core.events.EventType.kContextChanged, self.eventHandler)
+
+  def unregister(self):
+    hiero.core.events.unregisterInterest(hiero.core.events.EventType.kContextChanged, self.eventHandler)
+    self.cancel()
+
+  def eventHandler(self, event):
+    sequence = hiero.ui.activeSequence()
+    if sequence is None:
+      return
+    if self._sequence is not None and sequence.guid() == self._sequence.guid():
+      return
+    self.start(sequence)
+
+gCacheWarmer = CacheWarmer()
+gVisibleRows.addListener(gCacheWarmer.setVisibleRows)
+hiero.core.events.registerInterest(hiero.core.events.EventType.kBeforeProjectClose, gCacheWarmer.cancel)
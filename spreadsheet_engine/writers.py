@@ -0,0 +1,84 @@
+# The shots of a sequence, and the CSV, JSON Lines and SQLite writers that rows of their
+# values are streamed to. Kept free of Qt and hiero.ui, so the headless reports write
+# exactly what the Spreadsheet export does.
+import csv
+import json
+import sqlite3
+
+# Rows written per SQLite transaction
+kSQLiteBatchSize = 1000
+
+def trackItems(sequence):
+  """
+    Yield (track, TrackItem) for the video and audio tracks of a sequence
+  """
+  for track in list(sequence.videoTracks())+list(sequence.audioTracks()):
+    for item in track.items():
+      yield track, item
+
+def utf8(value):
+  """
+    Return a unicode value encoded as UTF-8, for the csv module, and other values as they are
+  """
+  if isinstance(value, unicode):
+    return value.encode('utf-8')
+  return value
+
+class CSVRowWriter(object):
+
+  def __init__(self, path, fieldNames, table=None):
+    self._file = open(path, 'wb')
+    self._writer = csv.writer(self._file)
+    self._writer.writerow([utf8(name) for name in fieldNames])
+
+  def write(self, row):
+    self._writer.writerow([utf8(value) for value in row.values()])
+
+  def close(self):
+    self._file.close()
+
+class JSONLinesRowWriter(object):
+
+  def __init__(self, path, fieldNames, table=None):
+    self._file = open(path, 'wb')
+
+  def write(self, row):
+    self._file.write(json.dumps(row)+'\n')
+
+  def close(self):
+    self._file.close()
+
+class SQLiteRowWriter(object):
+  """
+    Writes rows into a table, 'shots' by default, kSQLiteBatchSize rows per transaction
+  """
+
+  def __init__(self, path, fieldNames, table='shots'):
+    self._connection = sqlite3.connect(path)
+    self._connection.text_factory = str
+    columns = ', '.join('"%s" TEXT' % name.replace('"', '""') for name in fieldNames)
+    self._connection.execute('DROP TABLE IF EXISTS %s' % table)
+    self._connection.execute('CREATE TABLE %s (%s)' % (table, columns))
+    self._insert = 'INSERT INTO %s VALUES (%s)' % (table, ', '.join('?'*len(fieldNames)))
+    self._pending = []
+
+  def write(self, row):
+    self._pending.append([utf8(value) for value in row.values()])
+    if len(self._pending) >= kSQLiteBatchSize:
+      self._flush()
+
+  def _flush(self):
+    with self._connection:
+      self._connection.executemany(self._insert, self._pending)
+    self._pending = []
+
+  def close(self):
+    if self._pending:
+      self._flush()
+    self._connection.close()
+
+kRowWriters = {'.csv' : CSVRowWriter,
+               '.jsonl' : JSONLinesRowWriter,
+               '.json' : JSONLinesRowWriter,
+               '.db' : SQLiteRowWriter,
+               '.sqlite' : SQLiteRowWriter}